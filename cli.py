@@ -0,0 +1,225 @@
+# iLogger/cli.py
+
+"""
+Processamento em lote sem interface gráfica (não importa Qt).
+
+Uso:
+    python cli.py batch <diretório> [--recursivo] [--filtro butterworth] [--saida <dir>]
+                                    [--formatos stats,excel,pdf] [--processos N]
+    python cli.py servidor <arquivos ou diretórios...> [--recursivo] [--filtro butterworth]
+                                    [--host 127.0.0.1] [--porta 8765]
+    python cli.py replay <csv> [--host 127.0.0.1] [--porta 5005] [--velocidade 1] [--repetir]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from config import *
+from services import processing_service, excel_export_service, figure_service, report_service, columnar_service, analysis_server, telemetry_service
+
+OUTPUT_FORMATS = ('stats', 'excel', 'pdf', 'npz')
+DEFAULT_OUTPUT_FORMATS = 'stats,excel,pdf'
+
+
+@contextmanager
+def _stage(name: str, timings: list):
+    """Mede e imprime a duração de uma etapa do lote."""
+    print(f"[{name}] ...", flush=True)
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    timings.append((name, elapsed))
+    print(f"[{name}] {elapsed:.2f} s", flush=True)
+
+def _find_run_files(directory: str, recursive: bool) -> list[str]:
+    pattern = os.path.join(directory, '**', '*.csv') if recursive else os.path.join(directory, '*.csv')
+    return sorted(glob.glob(pattern, recursive=recursive))
+
+def _parse_filter(value: str) -> dict:
+    """Nome de um preset de FILTER_PRESETS, JSON literal ou caminho de um arquivo JSON."""
+    if value in FILTER_PRESETS:
+        return dict(FILTER_PRESETS[value])
+    if os.path.isfile(value):
+        with open(value, encoding='utf-8') as f:
+            return json.load(f)
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        raise argparse.ArgumentTypeError(
+            f"Filtro inválido: '{value}'. Use um preset ({', '.join(FILTER_PRESETS)}), JSON ou um arquivo JSON."
+        )
+
+def _parse_formats(value: str) -> list[str]:
+    formats = [fmt.strip() for fmt in value.split(',') if fmt.strip()]
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Formatos desconhecidos: {', '.join(sorted(unknown))}")
+    return formats
+
+def _parse_setup(items: list) -> dict:
+    setup = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        setup[key.strip()] = value.strip()
+    return setup
+
+def run_batch(args) -> int:
+    file_paths = _find_run_files(args.directory, args.recursive)
+    if not file_paths:
+        print(f"Nenhum CSV encontrado em {args.directory}", file=sys.stderr)
+        return 1
+    output_dir = args.output or os.path.join(args.directory, 'ilogger_saida')
+    os.makedirs(output_dir, exist_ok=True)
+    filter_settings = args.filter
+    setup_info = _parse_setup(args.setup)
+    timings = []
+    print(f"{len(file_paths)} arquivos, filtro {json.dumps(filter_settings)}, saída em {output_dir}")
+
+    with _stage("Carregamento e filtragem", timings):
+        runs, errors = processing_service.process_run_files_multiprocess(file_paths, filter_settings, args.processes)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if args.recursive:
+        # Numa temporada, RUNs de dias diferentes podem ter o mesmo nome de arquivo
+        for run in runs:
+            run.file_name = os.path.relpath(run.file_path, args.directory)
+    if not runs:
+        print("Nenhum arquivo pôde ser processado.", file=sys.stderr)
+        return 1
+
+    with _stage("Estatísticas", timings):
+        metrics_df, variations_df = processing_service.generate_statistics(runs, filter_settings)
+        if 'stats' in args.formats:
+            metrics_df.to_csv(os.path.join(output_dir, 'metricas.csv'))
+            variations_df.to_csv(os.path.join(output_dir, 'variacoes.csv'))
+            with open(os.path.join(output_dir, 'estatisticas.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'filtro': filter_settings,
+                    'metricas': json.loads(metrics_df.to_json(orient='index')),
+                    'variacoes': json.loads(variations_df.to_json(orient='index')) if not variations_df.empty else {},
+                }, f, ensure_ascii=False, indent=2)
+
+    if 'excel' in args.formats:
+        with _stage("Excel", timings):
+            excel_export_service.write_dashboard_workbook(
+                runs, os.path.join(output_dir, 'dashboard.xlsx'), metrics_df, variations_df, filter_settings, setup_info
+            )
+
+    if 'pdf' in args.formats:
+        with _stage("Figuras", timings):
+            figures = figure_service.render_report_figures(runs, filter_settings, metrics_df,
+                                                           max_workers=args.processes or os.cpu_count() or 1)
+        with _stage("PDF", timings):
+            report_service.generate_pdf_report(os.path.join(output_dir, 'relatorio.pdf'), setup_info,
+                                               args.observations, filter_settings, metrics_df, variations_df, figures)
+
+    if 'npz' in args.formats:
+        with _stage("Dados colunares", timings):
+            columnar_service.export_runs(runs, os.path.join(output_dir, 'dados.npz'), filter_settings, setup_info)
+
+    total = sum(elapsed for _, elapsed in timings)
+    print(f"Concluído: {len(runs)} runs em {total:.2f} s ({len(errors)} com erro)")
+    return 0 if not errors else 2
+
+def run_server(args) -> int:
+    file_paths = []
+    for path in args.paths:
+        file_paths.extend(_find_run_files(path, args.recursive) if os.path.isdir(path) else [path])
+    csv_paths = [path for path in file_paths if not columnar_service.is_columnar_file(path)]
+    columnar_paths = [path for path in file_paths if columnar_service.is_columnar_file(path)]
+    with _stage("Carregamento e filtragem", []):
+        runs, errors = processing_service.process_run_files_multiprocess(csv_paths, args.filter, args.processes) if csv_paths else ([], [])
+        # Exportações colunares já trazem os canais filtrados
+        columnar_runs, columnar_errors = processing_service.process_run_files(columnar_paths)
+        runs += columnar_runs
+        errors += columnar_errors
+    for error in errors:
+        print(error, file=sys.stderr)
+
+    session = analysis_server.AnalysisSession(runs, args.filter)
+    server = analysis_server.create_server(session, args.host, args.port, verbose=args.verbose)
+    print(f"Servidor de análise em http://{args.host}:{args.port} com {len(runs)} runs (Ctrl+C para encerrar)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def run_replay(args) -> int:
+    if not os.path.isfile(args.csv):
+        print(f"Arquivo não encontrado: {args.csv}", file=sys.stderr)
+        return 1
+    pace = "o mais rápido possível" if args.speed <= 0 else f"{args.speed:g}x o tempo real"
+    print(f"Transmitindo {args.csv} para udp://{args.host}:{args.port} ({pace}; Ctrl+C para encerrar)", flush=True)
+
+    def progress(sent: int, total: int):
+        print(f"  {sent % total or total}/{total} linhas", flush=True)
+
+    started = time.perf_counter()
+    try:
+        sent = telemetry_service.replay_csv(args.csv, args.host, args.port, args.speed, args.rows_per_packet,
+                                            loop=args.loop, progress=progress)
+    except KeyboardInterrupt:
+        return 0
+    print(f"Concluído: {sent} linhas em {time.perf_counter() - started:.2f} s")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ilogger', description=f"{APP_NAME} - processamento em lote sem interface")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('batch', help="Processa todos os CSVs de um diretório")
+    batch.add_argument('directory', help="Diretório com os CSVs das RUNs")
+    batch.add_argument('--recursivo', dest='recursive', action='store_true', help="Inclui subdiretórios (ex: uma temporada)")
+    batch.add_argument('--filtro', dest='filter', type=_parse_filter, default=dict(FILTER_PRESETS[DEFAULT_FILTER_PRESET]),
+                       help=f"Preset ({', '.join(FILTER_PRESETS)}), JSON ou arquivo JSON (padrão: {DEFAULT_FILTER_PRESET})")
+    batch.add_argument('--saida', dest='output', help="Diretório de saída (padrão: <diretório>/ilogger_saida)")
+    batch.add_argument('--formatos', dest='formats', type=_parse_formats, default=_parse_formats(DEFAULT_OUTPUT_FORMATS),
+                       help=f"Saídas separadas por vírgula: {', '.join(OUTPUT_FORMATS)} (padrão: {DEFAULT_OUTPUT_FORMATS})")
+    batch.add_argument('--processos', dest='processes', type=int, default=None,
+                       help="Processos de trabalho (padrão: todos os núcleos)")
+    batch.add_argument('--setup', action='append', metavar='CHAVE=VALOR', help="Informação de setup do relatório (repetível)")
+    batch.add_argument('--observacoes', dest='observations', default='', help="Observações do relatório PDF")
+    batch.set_defaults(handler=run_batch)
+
+    server = subparsers.add_parser('servidor', help="Mantém as runs carregadas e as serve a vários clientes (HTTP)")
+    server.add_argument('paths', nargs='*', help="CSVs, exportações colunares ou diretórios a carregar")
+    server.add_argument('--recursivo', dest='recursive', action='store_true', help="Inclui subdiretórios")
+    server.add_argument('--filtro', dest='filter', type=_parse_filter, default=dict(FILTER_PRESETS[DEFAULT_FILTER_PRESET]),
+                        help=f"Filtro padrão da sessão: preset, JSON ou arquivo JSON (padrão: {DEFAULT_FILTER_PRESET})")
+    server.add_argument('--host', default=ANALYSIS_SERVER_HOST,
+                        help=f"Endereço de escuta (padrão: {ANALYSIS_SERVER_HOST}; 0.0.0.0 para a rede local)")
+    server.add_argument('--porta', dest='port', type=int, default=ANALYSIS_SERVER_PORT,
+                        help=f"Porta (padrão: {ANALYSIS_SERVER_PORT})")
+    server.add_argument('--processos', dest='processes', type=int, default=None,
+                        help="Processos usados no carregamento inicial (padrão: todos os núcleos)")
+    server.add_argument('--verboso', dest='verbose', action='store_true', help="Registra cada requisição")
+    server.set_defaults(handler=run_server)
+
+    replay = subparsers.add_parser('replay', help="Transmite um CSV por UDP como a telemetria do carro (teste sem o carro)")
+    replay.add_argument('csv', help="CSV de uma RUN")
+    replay.add_argument('--host', default='127.0.0.1', help="Destino (padrão: 127.0.0.1)")
+    replay.add_argument('--porta', dest='port', type=int, default=TELEMETRY_UDP_PORT,
+                        help=f"Porta UDP de destino (padrão: {TELEMETRY_UDP_PORT})")
+    replay.add_argument('--velocidade', dest='speed', type=float, default=1.0,
+                        help="Multiplicador do tempo real (padrão: 1; 0 = o mais rápido possível)")
+    replay.add_argument('--linhas-por-pacote', dest='rows_per_packet', type=int, default=TELEMETRY_ROWS_PER_PACKET,
+                        help=f"Linhas f1/f2 por pacote (padrão: {TELEMETRY_ROWS_PER_PACKET})")
+    replay.add_argument('--repetir', dest='loop', action='store_true', help="Recomeça o arquivo ao terminar")
+    replay.set_defaults(handler=run_replay)
+    return parser
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,10 @@ RAIO_PNEU_M = 0.29  # Raio do pneu em metros (9 polegadas)
 PI = 3.1415926535
 FUROS_DISCO_FREIO = 12
 
+# --- Amostragem do Datalogger ---
+RAW_SAMPLE_PERIOD_S = 0.005  # Intervalo entre linhas do CSV
+RAW_SAMPLES_PER_GROUP = 10   # Linhas agrupadas em cada amostra da base de tempo `time_s`
+
 # --- Padrões de Filtro ---
 # Valores padrão para os filtros, usados na inicialização dos controles
 BUTTERWORTH_ORDER = 4
@@ -27,6 +31,95 @@ BESSEL_CUTOFF = 0.1
 MEDIAN_KERNEL_SIZE = 5
 MOVING_AVG_WINDOW = 5
 
+# Configurações de filtro prontas, usadas pelo processamento em lote (cli.py)
+FILTER_PRESETS = {
+    'butterworth': {'type': 'butterworth', 'butter_order': BUTTERWORTH_ORDER, 'butter_cutoff': BUTTERWORTH_CUTOFF},
+    'savitzky_golay': {'type': 'savitzky_golay', 'savgol_window': SAVGOL_WINDOW, 'savgol_polyorder': SAVGOL_POLYORDER},
+    'chebyshev': {'type': 'chebyshev_type_i', 'cheby1_order': CHEBY1_ORDER, 'cheby1_rp': CHEBY1_RP, 'cheby1_cutoff': CHEBY1_CUTOFF},
+    'bessel': {'type': 'bessel', 'bessel_order': BESSEL_ORDER, 'bessel_cutoff': BESSEL_CUTOFF},
+    'mediana': {'type': 'median', 'median_kernel': MEDIAN_KERNEL_SIZE},
+    'media_movel': {'type': 'moving_average', 'moving_avg_window': MOVING_AVG_WINDOW},
+}
+DEFAULT_FILTER_PRESET = 'butterworth'
+
+# --- Alinhamento entre RUNs ---
+LAUNCH_THRESHOLD_KMH = 3.0   # Velocidade que caracteriza a largada
+LAUNCH_SMOOTHING_WINDOW = 5  # Janela (amostras agrupadas) da média móvel usada na detecção
+
+# --- Reamostragem em Grade Comum ---
+RESAMPLE_DISTANCE_POINTS = 1000  # Pontos da grade de distância
+RESAMPLE_CACHE_MAX_ENTRIES = 32  # Resultados de reamostragem mantidos em cache (LRU)
+ENVELOPE_PERCENTILES = (10, 50, 90)  # Banda inferior, mediana e banda superior do modo envelope
+
+# --- Modo Densidade (Relação RPM x Velocidade) ---
+DENSITY_BINS = (200, 200)        # Células da grade (velocidade, RPM)
+DENSITY_CACHE_MAX_ENTRIES = 8    # Grades de densidade mantidas em cache (LRU)
+
+# --- Renderização (Pirâmide de Nível de Detalhe) ---
+LOD_POINTS_PER_PIXEL = 2   # Pontos servidos por pixel de largura do gráfico (um mín e um máx)
+LOD_UPDATE_DELAY_MS = 30   # Agrupa eventos de pan/zoom antes de trocar o nível servido
+
+# --- Cache e Pré-cálculo de Filtros ---
+FILTER_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Orçamento de memória do cache de filtro de cada run
+PREFETCH_STEPS = 2            # Passos de slider (±) pré-calculados em torno do valor atual
+PREFETCH_IDLE_DELAY_MS = 400  # Ociosidade após a última mudança de filtro antes do pré-cálculo
+PREFETCH_MAX_THREADS = 1      # Threads (de baixa prioridade) dedicadas ao pré-cálculo
+
+# --- Cursor Sincronizado ---
+CROSSHAIR_RATE_LIMIT_HZ = 60  # Atualizações máximas por segundo (taxa de atualização da tela)
+
+# --- Atualização Sob Demanda das Abas ---
+VIEW_PREWARM_ENABLED = False   # Renderiza as abas ocultas pendentes quando a interface fica ociosa
+VIEW_PREWARM_DELAY_MS = 1500   # Ociosidade antes de pré-renderizar a próxima aba pendente
+
+# --- Exportação para Excel ---
+EXCEL_CHART_MAX_POINTS_PER_RUN = 2000  # Pontos por run na aba decimada usada pelos gráficos nativos
+
+# --- Figuras do Relatório PDF (renderização fora da tela) ---
+REPORT_FIGURE_SIZE_IN = (10, 6)       # Tamanho de cada figura em polegadas
+REPORT_FIGURE_DPI = 150
+REPORT_MAX_POINTS_PER_SERIES = 4000   # Pontos por curva (nível da pirâmide LOD que preserva os picos)
+REPORT_RENDER_MAX_WORKERS = 4         # Processos que renderizam as figuras em paralelo (0 = no próprio processo)
+REPORT_RENDER_MIN_POOL_WORKERS = 3    # Abaixo disso renderiza no próprio processo (iniciar cada processo custa ~0,8 s)
+
+# --- Exportação Colunar (npz / HDF5 / Arrow) ---
+COLUMNAR_CHUNK_ROWS = 65536        # Linhas por bloco dos datasets HDF5
+COLUMNAR_HDF5_COMPRESSION = 'gzip'
+COLUMNAR_HDF5_COMPRESSION_LEVEL = 4
+COLUMNAR_ARROW_COMPRESSION = 'zstd'
+
+# --- Sessão Salva ---
+SESSION_FILE_EXTENSION = '.ilsession'
+SESSION_DATA_ALIGNMENT = 64   # Alinhamento (bytes) de cada array no arquivo, para mapeamento em memória
+
+# --- Catálogo de RUNs (SQLite) ---
+CATALOG_DB_FILENAME = 'ilogger_catalogo.sqlite'  # Criado na pasta do usuário, se outro não for escolhido
+CATALOG_SETUP_FILENAME = 'setup.json'            # Setup do dia de testes, na pasta dos CSVs
+CATALOG_SETUP_SUFFIX = '.setup.json'             # Setup de uma RUN específica (ex: RUN3.setup.json)
+CATALOG_SPEED_TARGETS_KMH = (30, 50)             # Tempos 0–X km/h pré-calculados a partir da largada
+CATALOG_QUERY_LIMIT = 5000
+
+# --- Acompanhamento ao Vivo (CSV sendo gravado) ---
+LIVE_REFRESH_HZ = 4            # Atualizações por segundo da aba "Ao Vivo"
+LIVE_PLOT_WINDOW_S = 60        # Janela de tempo exibida (últimos N segundos)
+LIVE_REFINE_WINDOW = 256       # Grupos refiltrados com fase zero a cada atualização (fim da run)
+LIVE_REFINE_GUARD = 64         # Grupos iniciais da janela descartados (transiente da borda)
+
+# --- Telemetria (UDP / Serial) ---
+TELEMETRY_UDP_HOST = '0.0.0.0'        # Escuta em todas as interfaces (rádio do box)
+TELEMETRY_UDP_PORT = 5005
+TELEMETRY_SERIAL_BAUDRATE = 115200
+TELEMETRY_ROWS_PER_PACKET = 10        # Linhas f1/f2 por pacote enviado pelo replay
+TELEMETRY_REORDER_WINDOW_PACKETS = 4   # Recuo maior que isto (em pacotes) na numeração é reinício do envio
+TELEMETRY_RING_ROWS = 1 << 16         # Anel de linhas recebidas (~5 min a 200 Hz) entre a recepção e a tela
+TELEMETRY_HISTORY_S = 600             # Histórico guardado na aba "Ao Vivo" durante a telemetria
+
+# --- Servidor de Análise Local ---
+ANALYSIS_SERVER_HOST = '127.0.0.1'    # Use '0.0.0.0' para aceitar os notebooks da rede do box
+ANALYSIS_SERVER_PORT = 8765
+ANALYSIS_SERVER_MAX_POINTS = 4000     # Pontos por canal decimado servido (padrão por requisição)
+ANALYSIS_CLIENT_TIMEOUT_S = 30
+
 # --- Chaves de Dados (para acesso consistente em dicionários e DataFrames) ---
 KEY_TEMPO_S = 'Tempo (s)'
 KEY_RPM_RAW = 'RPM (Bruto)'
@@ -36,6 +129,7 @@ KEY_VEL_KMH_FILT = 'Velocidade (Km/h - Filtrado)'
 KEY_ACEL_MS2_FILT = 'Aceleração (m/s² - Filtrado)'
 KEY_JERK_MS3 = 'Jerk (m/s³)' # Mantido para cálculo interno, mas removido da UI
 KEY_DIST_M = 'Distância (m)'
+KEY_DELTA_T = 'Delta-T vs Referência (s)' # Canal derivado entre runs, função da distância
 
 # --- Opções para Gráfico Personalizado ---
 # Removido Jerk e adicionada Distância
@@ -47,4 +141,5 @@ CUSTOM_PLOT_AXES_OPTIONS = [
     KEY_DIST_M,
     KEY_RPM_RAW,
     KEY_VEL_KMH_RAW,
+    KEY_DELTA_T,
 ]
\ No newline at end of file
@@ -0,0 +1,81 @@
+# iLogger/data/channel_index.py
+
+import numpy as np
+
+
+class ChannelIndex:
+    """
+    Índices pré-computados de um canal para consultas de janela em tempo constante.
+
+    - Somas prefixadas fornecem média e integral (regra do trapézio) com duas leituras.
+    - Mín/máx usam uma sparse table sobre blocos de tamanho fixo: a parte central da
+      janela é respondida pela tabela e as bordas varrem no máximo dois blocos, de modo
+      que o custo por consulta é limitado por `BLOCK_SIZE` e não pelo tamanho da janela.
+    """
+    BLOCK_SIZE = 32
+
+    def __init__(self, values: np.ndarray, time_s: np.ndarray):
+        self.values = np.ascontiguousarray(values, dtype=float)
+        n = self.values.size
+
+        # Soma prefixada com zero inicial: sum(v[i0:i1+1]) = prefix[i1+1] - prefix[i0]
+        self.prefix_sum = np.concatenate(([0.0], np.cumsum(self.values)))
+
+        # Integral acumulada (trapézio): integral[i] = ∫ v dt de t[0] até t[i]
+        if n > 1:
+            areas = 0.5 * (self.values[1:] + self.values[:-1]) * np.diff(time_s[:n])
+            self.cumulative_integral = np.concatenate(([0.0], np.cumsum(areas)))
+        else:
+            self.cumulative_integral = np.zeros(n)
+
+        # Mínimos e máximos por bloco (último bloco completado com o valor de borda)
+        num_blocks = -(-n // self.BLOCK_SIZE) if n > 0 else 0
+        padded = np.pad(self.values, (0, num_blocks * self.BLOCK_SIZE - n), mode='edge') if n > 0 else self.values
+        blocks = padded.reshape(num_blocks, self.BLOCK_SIZE) if n > 0 else padded.reshape(0, self.BLOCK_SIZE)
+        self._min_table = self._build_sparse_table(blocks.min(axis=1), np.minimum)
+        self._max_table = self._build_sparse_table(blocks.max(axis=1), np.maximum)
+
+    @staticmethod
+    def _build_sparse_table(level0: np.ndarray, op) -> list:
+        """Constrói os níveis da sparse table: tabela[j][i] = op(bloco[i : i + 2**j])."""
+        table = [level0]
+        span = 1
+        while 2 * span <= level0.size:
+            prev = table[-1]
+            table.append(op(prev[:-span], prev[span:]))
+            span *= 2
+        return table
+
+    @staticmethod
+    def _query_table(table: list, b0: int, b1: int, op):
+        level = (b1 - b0 + 1).bit_length() - 1
+        return op(table[level][b0], table[level][b1 - (1 << level) + 1])
+
+    def _range_extreme(self, i0: int, i1: int, table: list, op, reduce):
+        bs = self.BLOCK_SIZE
+        b0, b1 = i0 // bs, i1 // bs
+        if b1 - b0 <= 1:
+            return reduce(self.values[i0:i1 + 1])
+        # Bordas parciais varridas diretamente, blocos internos pela tabela
+        edge = op(reduce(self.values[i0:(b0 + 1) * bs]), reduce(self.values[b1 * bs:i1 + 1]))
+        return op(edge, self._query_table(table, b0 + 1, b1 - 1, op))
+
+    def __len__(self):
+        return self.values.size
+
+    @property
+    def nbytes(self) -> int:
+        """Memória dos índices (sem os valores do canal, que pertencem à run)."""
+        tables = self._min_table + self._max_table
+        return self.prefix_sum.nbytes + self.cumulative_integral.nbytes + sum(level.nbytes for level in tables)
+
+    def query(self, i0: int, i1: int) -> dict:
+        """Estatísticas da janela de índices [i0, i1] (inclusiva)."""
+        i0, i1 = int(i0), int(i1)
+        count = i1 - i0 + 1
+        return {
+            'Mín': float(self._range_extreme(i0, i1, self._min_table, np.minimum, np.min)),
+            'Máx': float(self._range_extreme(i0, i1, self._max_table, np.maximum, np.max)),
+            'Média': float((self.prefix_sum[i1 + 1] - self.prefix_sum[i0]) / count),
+            'Integral': float(self.cumulative_integral[i1] - self.cumulative_integral[i0]),
+        }
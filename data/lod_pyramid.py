@@ -0,0 +1,83 @@
+# iLogger/data/lod_pyramid.py
+
+import numpy as np
+
+
+class LODPyramid:
+    """
+    Pirâmide de nível de detalhe (LOD) mín/máx de um canal.
+
+    Cada nível k agrupa 2**k amostras por bloco e guarda dois pontos por bloco (o mínimo
+    e o máximo de y, na ordem em que ocorrem), preservando os picos como o modo 'peak'
+    do pyqtgraph. Os níveis são construídos uma única vez, cada um a partir do anterior
+    (custo total O(n)), e servidos conforme o intervalo visível e a largura em pixels.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, monotonic_x: bool = True):
+        self.x = np.ascontiguousarray(x, dtype=float)
+        self.y = np.ascontiguousarray(y, dtype=float)
+        self.monotonic_x = monotonic_x
+        # levels[k] = (xs, ys) com formato (n_blocos, 2); o nível 0 são os dados brutos
+        self.levels = []
+
+        n = min(self.x.size, self.y.size)
+        self.x, self.y = self.x[:n], self.y[:n]
+        # Permite ao gráfico pular a verificação de valores finitos a cada setData
+        self.is_finite = bool(np.isfinite(self.x).all() and np.isfinite(self.y).all())
+        if n < 4:
+            return
+
+        # Nível 1: pares de amostras consecutivas (completa com a última amostra se ímpar)
+        pad = n % 2
+        xs = np.concatenate((self.x, self.x[-1:])) if pad else self.x
+        ys = np.concatenate((self.y, self.y[-1:])) if pad else self.y
+        level = (xs.reshape(-1, 2), ys.reshape(-1, 2))
+        self.levels.append(level)
+        while level[0].shape[0] >= 4:
+            level = self._merge(*level)
+            self.levels.append(level)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória própria dos níveis (o nível 1 costuma ser uma vista dos dados de origem)."""
+        return sum(array.nbytes for level in self.levels for array in level if array.base is None)
+
+    @staticmethod
+    def _merge(xs: np.ndarray, ys: np.ndarray):
+        """Funde blocos vizinhos: de 4 candidatos por bloco mantém o mín e o máx em ordem."""
+        if xs.shape[0] % 2:
+            xs = np.concatenate((xs, xs[-1:]))
+            ys = np.concatenate((ys, ys[-1:]))
+        xs4 = xs.reshape(-1, 4)
+        ys4 = ys.reshape(-1, 4)
+        i_min = np.argmin(ys4, axis=1)
+        i_max = np.argmax(ys4, axis=1)
+        first = np.minimum(i_min, i_max)
+        second = np.maximum(i_min, i_max)
+        rows = np.arange(xs4.shape[0])
+        new_xs = np.stack((xs4[rows, first], xs4[rows, second]), axis=1)
+        new_ys = np.stack((ys4[rows, first], ys4[rows, second]), axis=1)
+        return new_xs, new_ys
+
+    def serve(self, x_min: float = None, x_max: float = None, max_points: int = 2000):
+        """
+        Retorna (x, y) com no máximo ~max_points pontos cobrindo [x_min, x_max].
+        Sem intervalo (ou com x não monotônico) serve o canal inteiro.
+        """
+        n = self.x.size
+        clip = self.monotonic_x and x_min is not None and x_max is not None
+        if clip:
+            i0 = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+            i1 = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, n)
+        else:
+            i0, i1 = 0, n
+
+        count = i1 - i0
+        if count <= max_points or not self.levels:
+            return self.x[i0:i1], self.y[i0:i1]
+
+        # Cada bloco do nível k (índice k-1 na lista) cobre 2**k amostras e gera 2 pontos
+        level_idx = min(max(int(np.ceil(np.log2(2 * count / max_points))) - 1, 0), len(self.levels) - 1)
+        block = 2 ** (level_idx + 1)
+        xs, ys = self.levels[level_idx]
+        b0, b1 = i0 // block, min(-(-i1 // block), xs.shape[0])
+        return xs[b0:b1].ravel(), ys[b0:b1].ravel()
@@ -1,12 +1,162 @@
 # iLogger/data/run_data.py
 
 import os
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 from scipy import signal
 from config import *
+from .channel_index import ChannelIndex
+from .lod_pyramid import LODPyramid
 import json
 
+# Mapeia as chaves de canais filtrados para os campos armazenados no cache de filtro
+_FILTERED_CHANNEL_FIELDS = {
+    KEY_RPM_FILT: 'rpm_filtered',
+    KEY_VEL_KMH_FILT: 'velocity_filtered_kmh',
+    KEY_ACEL_MS2_FILT: 'acceleration_filtered_ms2',
+    KEY_DIST_M: 'distance_m',
+}
+
+# Contadores globais de acesso ao cache de filtro (instrumentação do pré-cálculo)
+_cache_counters = {'hits': 0, 'misses': 0, 'prefetched': 0, 'prefetch_hits': 0}
+_counters_lock = threading.Lock()
+
+def _record_cache_access(hit: bool, prefetched: bool = False):
+    with _counters_lock:
+        _cache_counters['hits' if hit else 'misses'] += 1
+        if prefetched:
+            _cache_counters['prefetch_hits'] += 1
+
+def _record_prefetch():
+    with _counters_lock:
+        _cache_counters['prefetched'] += 1
+
+def filter_cache_stats() -> dict:
+    """
+    Retorna os contadores do cache de filtro de todas as runs: acertos, faltas, entradas
+    pré-calculadas, acertos em entradas pré-calculadas e a taxa de acerto. Acertos e faltas
+    são contados nas trocas do filtro aplicado a cada run, não em cada leitura do cache.
+    """
+    with _counters_lock:
+        stats = dict(_cache_counters)
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else 0.0
+    return stats
+
+def reset_filter_cache_stats():
+    with _counters_lock:
+        for key in _cache_counters:
+            _cache_counters[key] = 0
+
+def _nbytes(value) -> int:
+    """Memória aproximada de arrays, dicts/listas deles e estruturas com `nbytes` (pirâmides, índices)."""
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    return getattr(value, 'nbytes', 0)
+
+def _entry_nbytes(entry: dict) -> int:
+    """
+    Memória aproximada de uma entrada do cache: canais filtrados e estruturas derivadas
+    (pirâmides LOD, índices de região e resultados de canais calculados).
+    """
+    return _nbytes(entry)
+
+def _filter_cache_key(filter_settings: dict) -> str:
+    """Chave imutável do cache de filtro a partir das configurações."""
+    return json.dumps(filter_settings, sort_keys=True)
+
+def compute_filtered_channels(time_s: np.ndarray, rpm_raw: np.ndarray, velocity_raw_kmh: np.ndarray, filter_settings: dict):
+    """
+    Aplica o filtro configurado aos canais brutos e deriva aceleração, jerk e distância.
+    Função pura (sem estado), segura para uso em threads de segundo plano.
+    Retorna o dict de canais filtrados ou None se o filtro não puder ser aplicado.
+    """
+    vel_ms = velocity_raw_kmh * (5 / 18)
+    filter_type = filter_settings.get('type', 'butterworth')
+
+    savgol_window = filter_settings.get('savgol_window', SAVGOL_WINDOW)
+    if filter_type == 'savitzky_golay' and len(rpm_raw) <= savgol_window:
+        return None
+
+    b, a = None, None
+    
+    if filter_type == 'savitzky_golay':
+        poly = filter_settings.get('savgol_polyorder', SAVGOL_POLYORDER)
+        rpm_filtered = signal.savgol_filter(rpm_raw, savgol_window, poly)
+        velocity_filtered_ms = signal.savgol_filter(vel_ms, savgol_window, poly)
+    elif filter_type == 'median':
+        kernel = filter_settings.get('median_kernel', MEDIAN_KERNEL_SIZE)
+        rpm_filtered = signal.medfilt(rpm_raw, kernel_size=kernel)
+        velocity_filtered_ms = signal.medfilt(vel_ms, kernel_size=kernel)
+    elif filter_type == 'moving_average':
+        window = filter_settings.get('moving_avg_window', MOVING_AVG_WINDOW)
+        rpm_filtered = np.convolve(rpm_raw, np.ones(window)/window, mode='same')
+        velocity_filtered_ms = np.convolve(vel_ms, np.ones(window)/window, mode='same')
+    else:
+        if filter_type == 'chebyshev_type_i':
+            order = filter_settings.get('cheby1_order', CHEBY1_ORDER)
+            rp = filter_settings.get('cheby1_rp', CHEBY1_RP)
+            cutoff = filter_settings.get('cheby1_cutoff', CHEBY1_CUTOFF)
+            b, a = signal.cheby1(order, rp, cutoff, btype='low', analog=False)
+        elif filter_type == 'bessel':
+            order = filter_settings.get('bessel_order', BESSEL_ORDER)
+            cutoff = filter_settings.get('bessel_cutoff', BESSEL_CUTOFF)
+            b, a = signal.bessel(order, cutoff, btype='low', analog=False, norm='phase')
+        else: # Butterworth (padrão)
+            order = filter_settings.get('butter_order', BUTTERWORTH_ORDER)
+            cutoff = filter_settings.get('butter_cutoff', BUTTERWORTH_CUTOFF)
+            b, a = signal.butter(order, cutoff, analog=False)
+        
+        rpm_filtered = signal.filtfilt(b, a, rpm_raw)
+        velocity_filtered_ms = signal.filtfilt(b, a, vel_ms)
+
+    velocity_filtered_kmh = velocity_filtered_ms * (18 / 5)
+    
+    acceleration_ms2 = np.gradient(velocity_filtered_ms, time_s, edge_order=2)
+    b_accel, a_accel = signal.butter(4, 0.1, analog=False)
+    acceleration_filtered_ms2 = signal.filtfilt(b_accel, a_accel, acceleration_ms2)
+
+    jerk_ms3 = np.gradient(acceleration_filtered_ms2, time_s, edge_order=2)
+    
+    dt = np.diff(time_s, prepend=0)
+    distance_m = np.cumsum(velocity_filtered_ms * dt)
+
+    return {
+        'rpm_filtered': rpm_filtered,
+        'velocity_filtered_ms': velocity_filtered_ms,
+        'velocity_filtered_kmh': velocity_filtered_kmh,
+        'acceleration_filtered_ms2': acceleration_filtered_ms2,
+        'jerk_ms3': jerk_ms3,
+        'distance_m': distance_m
+    }
+
+def group_raw_samples(f1: np.ndarray, f2: np.ndarray):
+    """
+    Converte as contagens do CSV (f1: furos do disco de freio, f2: pulsos do motor) em
+    (rpm_raw, velocity_raw_kmh), somando cada bloco completo de RAW_SAMPLES_PER_GROUP
+    linhas; linhas de um bloco incompleto no final são ignoradas.
+    """
+    num_points = (min(len(f1), len(f2)) // RAW_SAMPLES_PER_GROUP) * RAW_SAMPLES_PER_GROUP
+    f1_sum_grouped = np.sum(np.asarray(f1[:num_points], dtype=float).reshape(-1, RAW_SAMPLES_PER_GROUP), axis=1)
+    f2_sum_grouped = np.sum(np.asarray(f2[:num_points], dtype=float).reshape(-1, RAW_SAMPLES_PER_GROUP), axis=1)
+    vel_factor = (2 * RAIO_PNEU_M * PI * 20 * 3.6) / FUROS_DISCO_FREIO
+    return f2_sum_grouped * 1200, f1_sum_grouped * vel_factor
+
+# Campos de cada entrada do cache de filtro (resultado de compute_filtered_channels)
+FILTER_ENTRY_FIELDS = ('rpm_filtered', 'velocity_filtered_ms', 'velocity_filtered_kmh',
+                       'acceleration_filtered_ms2', 'jerk_ms3', 'distance_m')
+
+# Agregações disponíveis para as colunas do CSV na base de tempo `time_s`
+GROUP_MEAN = 'media'
+GROUP_SUM = 'soma'
+
+# Chaves dos canais calculados (têm prioridade sobre colunas do CSV de mesmo nome)
+_DERIVED_KEYS = {KEY_TEMPO_S, KEY_RPM_RAW, KEY_VEL_KMH_RAW, *_FILTERED_CHANNEL_FIELDS}
+
 class RunData:
     """
     Encapsula os dados de uma única RUN. Agora separa o cálculo dos dados brutos
@@ -16,13 +166,20 @@ class RunData:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
+        self._init_state(file_path)
+        self.df_raw = self._load_data(file_path)
+        self._calculate_raw_data()
+
+    def _init_state(self, file_path: str):
+        """Inicializa os canais vazios e os caches; comum ao construtor e a `from_arrays`."""
         self.file_path = file_path # Armazena o path original
         self.file_name = os.path.basename(file_path)
-        
-        self.df_raw = self._load_data(file_path)
+
         self.time_s = np.array([])
         self.rpm_raw = np.array([])
         self.velocity_raw_kmh = np.array([])
+        # Deslocamento temporal em relação à run de referência (definido pelo alinhamento)
+        self.time_offset_s = 0.0
         
         self.rpm_filtered = np.array([])
         self.velocity_filtered_ms = np.array([])
@@ -32,10 +189,85 @@ class RunData:
         self.distance_m = np.array([])
         self.stats = {}
         
-        # Cache para armazenar os resultados dos cálculos de filtro
-        self._filter_cache = {}
-        
-        self._calculate_raw_data()
+        # Cache LRU para armazenar os resultados dos cálculos de filtro (limitado por memória)
+        self._filter_cache = OrderedDict()
+        # Chave do filtro aplicado por último (acertos/faltas só contam quando ela muda)
+        self._applied_filter_key = None
+        # Protege o cache, que também é preenchido pelo pré-cálculo em segundo plano
+        self._cache_lock = threading.Lock()
+        # Estruturas derivadas dos canais brutos (índices de região, pirâmides LOD)
+        self._raw_derived_cache = {}
+        # Colunas do CSV convertidas para float: nome -> array, e (nome, agregação) -> array agrupado
+        self._raw_columns = {}
+        self._grouped_columns = {}
+
+    @classmethod
+    def from_arrays(cls, file_name: str, time_s: np.ndarray, rpm_raw: np.ndarray, velocity_raw_kmh: np.ndarray,
+                    filtered: dict = None, filter_settings: dict = None, file_path: str = None,
+                    time_offset_s: float = 0.0, cached_filters: list = None, raw_columns: dict = None) -> 'RunData':
+        """
+        Cria uma run a partir de canais já calculados (ex: uma exportação colunar), sem CSV.
+        Se `filtered` (campos de FILTER_ENTRY_FIELDS) e `filter_settings` forem dados, eles
+        entram no cache de filtro e são aplicados sem refiltrar. `cached_filters` (pares
+        (configurações, campos), como em `filter_cache_snapshot`) pré-carrega outras entradas.
+        `raw_columns` (nome -> array float na taxa completa) restaura as colunas do CSV sem
+        reler o arquivo; sem ele as colunas brutas não ficam disponíveis.
+        """
+        run = cls.__new__(cls)
+        run._init_state(file_path or file_name)
+        run.file_name = file_name
+        if raw_columns:
+            # Sem cópia: as colunas podem ser visões de um arquivo mapeado em memória
+            run.df_raw = pd.DataFrame(raw_columns, copy=False)
+            run._raw_columns = dict(raw_columns)
+        else:
+            run.df_raw = pd.DataFrame()
+        run.time_s = np.asarray(time_s, dtype=float)
+        run.rpm_raw = np.asarray(rpm_raw, dtype=float)
+        run.velocity_raw_kmh = np.asarray(velocity_raw_kmh, dtype=float)
+        run.time_offset_s = float(time_offset_s)
+        for settings, fields in cached_filters or []:
+            run._filter_cache[_filter_cache_key(settings)] = {
+                **{field: np.asarray(fields[field], dtype=float) for field in FILTER_ENTRY_FIELDS},
+                'derived': {},
+            }
+        if filtered is not None and filter_settings is not None:
+            entry = {field: np.asarray(filtered[field], dtype=float) for field in FILTER_ENTRY_FIELDS}
+            entry['derived'] = {}
+            run._filter_cache[_filter_cache_key(filter_settings)] = entry
+            run.apply_filters_and_recalculate(filter_settings)
+        return run
+
+    def copy_arrays(self):
+        """
+        Troca os arrays que não pertencem à run (ex: visões de uma sessão mapeada em memória)
+        por cópias próprias e descarta as pirâmides e índices construídos sobre eles, para
+        que o arquivo de origem possa ser liberado.
+        """
+        def own(values):
+            if values.flags.owndata:
+                return values
+            copy = np.array(values)
+            copy.flags.writeable = values.flags.writeable
+            return copy
+
+        self.time_s, self.rpm_raw, self.velocity_raw_kmh = own(self.time_s), own(self.rpm_raw), own(self.velocity_raw_kmh)
+        columns = {name: own(values) for name, values in self._raw_columns.items()}
+        if any(columns[name] is not values for name, values in self._raw_columns.items()):
+            self.df_raw = pd.DataFrame(columns, copy=False)
+        self._raw_columns = columns
+        self._raw_derived_cache = {}
+        with self._cache_lock:
+            for entry in self._filter_cache.values():
+                for field in FILTER_ENTRY_FIELDS:
+                    entry[field] = own(entry[field])
+                derived = entry['derived']
+                derived.pop('lods', None)
+                derived.pop('indexes', None)
+            applied = self._filter_cache.get(self._applied_filter_key)
+        if applied is not None:
+            for field in FILTER_ENTRY_FIELDS:
+                setattr(self, field, applied[field])
 
     def _load_data(self, file_path: str) -> pd.DataFrame:
         # ... (código existente sem alterações)
@@ -50,118 +282,250 @@ class RunData:
         return df
 
     def _calculate_raw_data(self):
-        # ... (código existente sem alterações)
         f1 = self.df_raw['f1'].values.astype(float)
         f2 = self.df_raw['f2'].values.astype(float)
 
-        num_points = (len(f1) // 10) * 10
-        if num_points < 10: return
-
-        f1 = f1[:num_points]
-        f2 = f2[:num_points]
+        rpm_raw, velocity_raw_kmh = group_raw_samples(f1, f2)
+        if rpm_raw.size == 0: return
 
-        grouped_len = num_points // 10
-        
-        f1_sum_grouped = np.sum(f1.reshape(-1, 10), axis=1)
-        f2_sum_grouped = np.sum(f2.reshape(-1, 10), axis=1)
+        group_period_s = RAW_SAMPLE_PERIOD_S * RAW_SAMPLES_PER_GROUP
+        self.time_s = np.linspace(0, group_period_s * rpm_raw.size, rpm_raw.size, endpoint=False)
+        self.rpm_raw = rpm_raw
+        self.velocity_raw_kmh = velocity_raw_kmh
 
-        self.time_s = np.linspace(0, 0.05 * grouped_len, grouped_len, endpoint=False)
-        self.rpm_raw = f2_sum_grouped * 1200
-        vel_factor = (2 * RAIO_PNEU_M * PI * 20 * 3.6) / FUROS_DISCO_FREIO
-        self.velocity_raw_kmh = f1_sum_grouped * vel_factor
 
+    @property
+    def aligned_time_s(self) -> np.ndarray:
+        """Eixo de tempo já deslocado pelo alinhamento entre runs."""
+        if self.time_offset_s == 0.0:
+            return self.time_s
+        return self.time_s - self.time_offset_s
 
     def apply_filters_and_recalculate(self, filter_settings: dict):
         if self.time_s.size == 0: return
 
-        # Cria uma chave de cache imutável a partir das configurações do filtro
-        cache_key = json.dumps(filter_settings, sort_keys=True)
-
-        # Se o resultado para esta configuração de filtro já estiver no cache, use-o
-        if cache_key in self._filter_cache:
-            cached_data = self._filter_cache[cache_key]
-            self.rpm_filtered = cached_data['rpm_filtered']
-            self.velocity_filtered_ms = cached_data['velocity_filtered_ms']
-            self.velocity_filtered_kmh = cached_data['velocity_filtered_kmh']
-            self.acceleration_filtered_ms2 = cached_data['acceleration_filtered_ms2']
-            self.jerk_ms3 = cached_data['jerk_ms3']
-            self.distance_m = cached_data['distance_m']
-            self._calculate_statistics()
+        cache_key = _filter_cache_key(filter_settings)
+        entry = self._get_filter_entry(filter_settings, count_access=cache_key != self._applied_filter_key)
+        if entry is None:
             return
+        self._applied_filter_key = cache_key
+        self.rpm_filtered = entry['rpm_filtered']
+        self.velocity_filtered_ms = entry['velocity_filtered_ms']
+        self.velocity_filtered_kmh = entry['velocity_filtered_kmh']
+        self.acceleration_filtered_ms2 = entry['acceleration_filtered_ms2']
+        self.jerk_ms3 = entry['jerk_ms3']
+        self.distance_m = entry['distance_m']
+        self._calculate_statistics()
 
-        # --- Se não estiver no cache, realize os cálculos ---
-        vel_ms = self.velocity_raw_kmh * (5 / 18)
-        filter_type = filter_settings.get('type', 'butterworth')
+    # --- Cache de Filtro ---
+    def _get_filter_entry(self, filter_settings: dict, count_access: bool = False):
+        """
+        Retorna a entrada do cache para `filter_settings`, calculando-a se necessário.
+        Não altera os canais filtrados atuais da run. Com `count_access`, o acesso entra nos
+        contadores de acerto (apenas nas trocas do filtro aplicado, não em cada leitura).
+        """
+        cache_key = _filter_cache_key(filter_settings)
+        with self._cache_lock:
+            entry = self._filter_cache.get(cache_key)
+            if entry is not None:
+                self._filter_cache.move_to_end(cache_key)
+                if count_access:
+                    _record_cache_access(hit=True, prefetched=entry.pop('prefetched', False))
+                return entry
+        if count_access:
+            _record_cache_access(hit=False)
 
-        # ... (lógica de filtragem existente, sem alterações)
-        savgol_window = filter_settings.get('savgol_window', SAVGOL_WINDOW)
-        if filter_type == 'savitzky_golay' and len(self.rpm_raw) <= savgol_window:
-            return
+        # O cálculo é feito fora do lock para não bloquear o pré-cálculo em segundo plano
+        entry = compute_filtered_channels(self.time_s, self.rpm_raw, self.velocity_raw_kmh, filter_settings)
+        if entry is None:
+            return None
+        entry['derived'] = {}
+        with self._cache_lock:
+            # Outra thread pode ter inserido a mesma entrada enquanto calculávamos
+            entry = self._filter_cache.setdefault(cache_key, entry)
+            entry.pop('prefetched', None)
+            self._filter_cache.move_to_end(cache_key)
+            self._evict_over_budget(keep=cache_key)
+        return entry
 
-        b, a = None, None
-        
-        if filter_type == 'savitzky_golay':
-            poly = filter_settings.get('savgol_polyorder', SAVGOL_POLYORDER)
-            self.rpm_filtered = signal.savgol_filter(self.rpm_raw, savgol_window, poly)
-            self.velocity_filtered_ms = signal.savgol_filter(vel_ms, savgol_window, poly)
-        elif filter_type == 'median':
-            kernel = filter_settings.get('median_kernel', MEDIAN_KERNEL_SIZE)
-            self.rpm_filtered = signal.medfilt(self.rpm_raw, kernel_size=kernel)
-            self.velocity_filtered_ms = signal.medfilt(vel_ms, kernel_size=kernel)
-        elif filter_type == 'moving_average':
-            window = filter_settings.get('moving_avg_window', MOVING_AVG_WINDOW)
-            self.rpm_filtered = np.convolve(self.rpm_raw, np.ones(window)/window, mode='same')
-            self.velocity_filtered_ms = np.convolve(vel_ms, np.ones(window)/window, mode='same')
+    def prefetch_filters(self, filter_settings: dict) -> bool:
+        """
+        Calcula e guarda no cache o resultado de `filter_settings` sem alterar o estado da run.
+        Pensado para threads de segundo plano: a entrada só é guardada se couber no orçamento
+        de memória sem descartar outras, e entra como a primeira candidata a descarte.
+        Retorna True se uma nova entrada foi adicionada.
+        """
+        if self.time_s.size == 0:
+            return False
+        cache_key = _filter_cache_key(filter_settings)
+        with self._cache_lock:
+            if cache_key in self._filter_cache:
+                return False
+        entry = compute_filtered_channels(self.time_s, self.rpm_raw, self.velocity_raw_kmh, filter_settings)
+        if entry is None:
+            return False
+        entry['derived'] = {}
+        with self._cache_lock:
+            if cache_key in self._filter_cache or self._cache_bytes() + _entry_nbytes(entry) > FILTER_CACHE_MAX_BYTES:
+                return False
+            entry['prefetched'] = True
+            self._filter_cache[cache_key] = entry
+            self._filter_cache.move_to_end(cache_key, last=False)
+        _record_prefetch()
+        return True
+
+    def filter_cache_snapshot(self) -> list:
+        """Pares (configurações, campos de FILTER_ENTRY_FIELDS) do cache de filtro, do menos ao mais usado."""
+        with self._cache_lock:
+            return [(json.loads(key), {field: entry[field] for field in FILTER_ENTRY_FIELDS})
+                    for key, entry in self._filter_cache.items()]
+
+    def _cache_bytes(self) -> int:
+        return sum(_entry_nbytes(entry) for entry in self._filter_cache.values())
+
+    def _evict_over_budget(self, keep: str):
+        """
+        Descarta as entradas menos usadas, exceto `keep`, só até o cache caber no orçamento
+        (deve ser chamado com o lock).
+        """
+        total = self._cache_bytes()
+        for key in list(self._filter_cache):
+            if total <= FILTER_CACHE_MAX_BYTES:
+                break
+            if key != keep:
+                total -= _entry_nbytes(self._filter_cache.pop(key))
+
+    def _trim_filter_cache(self, derived: dict):
+        """
+        Reaplica o orçamento depois que uma entrada ganhou estruturas derivadas (`derived`),
+        sem descartar essa entrada (deve ser chamado com o lock).
+        """
+        keep = next((key for key, entry in self._filter_cache.items() if entry['derived'] is derived), None)
+        if keep is not None:
+            self._evict_over_budget(keep)
+
+    def _store_derived(self, derived: dict, group: str, key, value):
+        """
+        Guarda `value` em derived[group][key] sob o lock: o cálculo do tamanho do cache percorre
+        esses dicts. Se outra thread guardou antes, vale o valor dela. Retorna o valor guardado.
+        """
+        with self._cache_lock:
+            stored = derived.setdefault(group, {}).setdefault(key, value)
+            if stored is value and derived is not self._raw_derived_cache:
+                self._trim_filter_cache(derived)
+        return stored
+
+    def _get_channel_and_derived_cache(self, key: str, filter_settings: dict):
+        """
+        Retorna (valores do canal, dict de estruturas derivadas). Para canais filtrados o dict
+        fica dentro da entrada do cache de filtro, de modo que é descartado junto com ela.
+        """
+        if key in (KEY_RPM_RAW, KEY_VEL_KMH_RAW):
+            values = self.rpm_raw if key == KEY_RPM_RAW else self.velocity_raw_kmh
+            return values, self._raw_derived_cache
+        if key in _FILTERED_CHANNEL_FIELDS:
+            entry = self._get_filter_entry(filter_settings) if self.time_s.size > 0 else None
+            if entry is not None:
+                return entry[_FILTERED_CHANNEL_FIELDS[key]], entry['derived']
+        return None, None
+
+    def get_channel(self, key: str, filter_settings: dict) -> np.ndarray:
+        """Valores do canal `key` sob `filter_settings`, sem alterar os canais filtrados atuais da run."""
+        values, _ = self._get_channel_and_derived_cache(key, filter_settings)
+        return values if values is not None else np.array([])
+
+    def get_filtered_fields(self, filter_settings: dict):
+        """Canais filtrados (campos de FILTER_ENTRY_FIELDS) sob `filter_settings`, ou None; não altera a run."""
+        entry = self._get_filter_entry(filter_settings) if self.time_s.size > 0 else None
+        return {field: entry[field] for field in FILTER_ENTRY_FIELDS} if entry is not None else None
+
+    def get_derived(self, filter_settings: dict, group: str, key):
+        """
+        Estrutura derivada guardada em `group` (ex: 'expressions') junto à entrada do cache de
+        filtro de `filter_settings`, ou None se ainda não foi guardada.
+        """
+        entry = self._get_filter_entry(filter_settings) if self.time_s.size > 0 else None
+        return entry['derived'].get(group, {}).get(key) if entry is not None else None
+
+    def store_derived(self, filter_settings: dict, group: str, key, value):
+        """
+        Guarda `value` junto à entrada do cache de filtro (descartado com ela e contado no
+        orçamento de memória). Retorna o valor guardado (o de outra thread, se ela chegou antes).
+        """
+        entry = self._get_filter_entry(filter_settings) if self.time_s.size > 0 else None
+        return self._store_derived(entry['derived'], group, key, value) if entry is not None else value
+
+    def get_channel_index(self, key: str, filter_settings: dict):
+        """
+        Retorna o ChannelIndex do canal `key` sob `filter_settings`. O índice é
+        construído uma única vez e guardado junto à entrada do cache de filtro.
+        """
+        values, derived = self._get_channel_and_derived_cache(key, filter_settings)
+        if values is None or values.size == 0:
+            return None
+        index = derived.get('indexes', {}).get(key)
+        if index is None:
+            # Construído fora do lock; a inserção é que é protegida
+            index = self._store_derived(derived, 'indexes', key, ChannelIndex(values, self.time_s))
+        return index
+
+    def get_lod_pyramid(self, y_key: str, filter_settings: dict, x_key: str = KEY_TEMPO_S):
+        """
+        Retorna a pirâmide LOD mín/máx de `y_key` em função de `x_key` (tempo original da run,
+        sem o deslocamento de alinhamento). Construída uma vez e guardada junto ao cache de filtro.
+        """
+        y_values, derived = self._get_channel_and_derived_cache(y_key, filter_settings)
+        if y_values is None or y_values.size == 0:
+            return None
+        if x_key == KEY_TEMPO_S:
+            x_values, monotonic = self.time_s, True
         else:
-            if filter_type == 'chebyshev_type_i':
-                order = filter_settings.get('cheby1_order', CHEBY1_ORDER)
-                rp = filter_settings.get('cheby1_rp', CHEBY1_RP)
-                cutoff = filter_settings.get('cheby1_cutoff', CHEBY1_CUTOFF)
-                b, a = signal.cheby1(order, rp, cutoff, btype='low', analog=False)
-            elif filter_type == 'bessel':
-                order = filter_settings.get('bessel_order', BESSEL_ORDER)
-                cutoff = filter_settings.get('bessel_cutoff', BESSEL_CUTOFF)
-                b, a = signal.bessel(order, cutoff, btype='low', analog=False, norm='phase')
-            else: # Butterworth (padrão)
-                order = filter_settings.get('butter_order', BUTTERWORTH_ORDER)
-                cutoff = filter_settings.get('butter_cutoff', BUTTERWORTH_CUTOFF)
-                b, a = signal.butter(order, cutoff, analog=False)
-            
-            self.rpm_filtered = signal.filtfilt(b, a, self.rpm_raw)
-            self.velocity_filtered_ms = signal.filtfilt(b, a, vel_ms)
-
-        self.velocity_filtered_kmh = self.velocity_filtered_ms * (18 / 5)
-        
-        acceleration_ms2 = np.gradient(self.velocity_filtered_ms, self.time_s, edge_order=2)
-        b_accel, a_accel = signal.butter(4, 0.1, analog=False)
-        self.acceleration_filtered_ms2 = signal.filtfilt(b_accel, a_accel, acceleration_ms2)
+            x_values, x_derived = self._get_channel_and_derived_cache(x_key, filter_settings)
+            if x_values is None:
+                return None
+            # A pirâmide depende dos dois canais: fica no cache do canal filtrado, se houver
+            if derived is self._raw_derived_cache:
+                derived = x_derived
+            monotonic = False
+        pyramid = derived.get('lods', {}).get((x_key, y_key))
+        if pyramid is None:
+            pyramid = self._store_derived(derived, 'lods', (x_key, y_key),
+                                          LODPyramid(x_values, y_values, monotonic_x=monotonic))
+        return pyramid
+
+    def get_region_stats(self, key: str, filter_settings: dict, t_start: float, t_end: float):
+        """Mín/máx/média/integral do canal na janela de tempo [t_start, t_end], ou None se vazia."""
+        index = self.get_channel_index(key, filter_settings)
+        if index is None:
+            return None
+        # A janela é informada no tempo alinhado; converte para o eixo original da run
+        t_start, t_end = t_start + self.time_offset_s, t_end + self.time_offset_s
+        i0 = int(np.searchsorted(self.time_s, t_start, side='left'))
+        i1 = min(int(np.searchsorted(self.time_s, t_end, side='right')) - 1, len(index) - 1)
+        if i1 < i0:
+            return None
+        return index.query(i0, i1)
 
-        self.jerk_ms3 = np.gradient(self.acceleration_filtered_ms2, self.time_s, edge_order=2)
-        
-        dt = np.diff(self.time_s, prepend=0)
-        self.distance_m = np.cumsum(self.velocity_filtered_ms * dt)
-        
-        # Armazena os novos resultados no cache
-        self._filter_cache[cache_key] = {
-            'rpm_filtered': self.rpm_filtered,
-            'velocity_filtered_ms': self.velocity_filtered_ms,
-            'velocity_filtered_kmh': self.velocity_filtered_kmh,
-            'acceleration_filtered_ms2': self.acceleration_filtered_ms2,
-            'jerk_ms3': self.jerk_ms3,
-            'distance_m': self.distance_m
-        }
-        
-        self._calculate_statistics()
-    
     # ... (resto do arquivo sem alterações)
     def _calculate_statistics(self):
         """Recalcula as estatísticas com base nos dados filtrados mais recentes."""
-        vel_kmh = self.velocity_filtered_kmh
-        rpm = self.rpm_filtered
-        acel = self.acceleration_filtered_ms2
-        dist = self.distance_m
-        
-        self.stats = {
+        self.stats = self._summarize(self.velocity_filtered_kmh, self.rpm_filtered,
+                                     self.acceleration_filtered_ms2, self.distance_m)
+
+    def compute_stats(self, filter_settings: dict) -> dict:
+        """
+        Estatísticas sob `filter_settings` sem alterar os canais filtrados atuais da run
+        (seguro para tarefas em segundo plano enquanto a interface usa outros filtros).
+        """
+        entry = self._get_filter_entry(filter_settings) if self.time_s.size > 0 else None
+        if entry is None:
+            empty = np.array([])
+            return self._summarize(empty, empty, empty, empty)
+        return self._summarize(entry['velocity_filtered_kmh'], entry['rpm_filtered'],
+                               entry['acceleration_filtered_ms2'], entry['distance_m'])
+
+    def _summarize(self, vel_kmh, rpm, acel, dist) -> dict:
+        return {
             'Arquivo': self.file_name,
             'Vel. Máx (Km/h)': np.max(vel_kmh) if vel_kmh.size > 0 else 0,
             'Vel. Média (Km/h)': np.mean(vel_kmh) if vel_kmh.size > 0 else 0,
@@ -173,7 +537,7 @@ class RunData:
 
     def get_data_for_custom_plot(self, key: str):
         data_map = {
-            KEY_TEMPO_S: self.time_s, KEY_RPM_FILT: self.rpm_filtered, KEY_VEL_KMH_FILT: self.velocity_filtered_kmh,
+            KEY_TEMPO_S: self.aligned_time_s, KEY_RPM_FILT: self.rpm_filtered, KEY_VEL_KMH_FILT: self.velocity_filtered_kmh,
             KEY_ACEL_MS2_FILT: self.acceleration_filtered_ms2, KEY_DIST_M: self.distance_m,
             KEY_RPM_RAW: self.rpm_raw, KEY_VEL_KMH_RAW: self.velocity_raw_kmh
         }
@@ -181,18 +545,54 @@ class RunData:
         if key in data_map:
             return data_map.get(key, np.array([]))
 
-        # Se não for uma chave pré-definida, tenta buscar como nome de coluna do CSV
-        if key in self.df_raw.columns:
-            # Converte para numérico, substitui NaNs por 0 e retorna como numpy array
-            series = pd.to_numeric(self.df_raw[key], errors='coerce').fillna(0)
-            return series.values.astype(float)
+        # Se não for uma chave pré-definida, tenta buscar como nome de coluna do CSV (taxa completa)
+        return self.get_raw_column(key)
+
+    # --- Colunas Brutas do CSV ---
+    def is_raw_column(self, key: str) -> bool:
+        """Indica se `key` é uma coluna do CSV (e não um canal calculado)."""
+        return key not in _DERIVED_KEYS and key in self.df_raw.columns
+
+    def get_raw_column(self, name: str) -> np.ndarray:
+        """
+        Coluna do CSV na taxa completa, convertida para float uma única vez
+        (valores inválidos viram 0). O array em cache é somente-leitura.
+        """
+        column = self._raw_columns.get(name)
+        if column is None:
+            if name not in self.df_raw.columns:
+                return np.array([])
+            column = pd.to_numeric(self.df_raw[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+            column.flags.writeable = False
+            self._raw_columns[name] = column
+        return column
+
+    @property
+    def raw_time_s(self) -> np.ndarray:
+        """Eixo de tempo (alinhado) das linhas do CSV, na taxa completa."""
+        return np.arange(len(self.df_raw)) * RAW_SAMPLE_PERIOD_S - self.time_offset_s
 
-        # Caso contrário, retorna array vazio
-        return np.array([])
+    def get_grouped_column(self, name: str, how: str = GROUP_MEAN) -> np.ndarray:
+        """
+        Coluna do CSV agregada na base de tempo `time_s`: cada bloco de RAW_SAMPLES_PER_GROUP
+        linhas vira uma amostra (soma ou média), como em `_calculate_raw_data`.
+        """
+        cache_key = (name, how)
+        grouped = self._grouped_columns.get(cache_key)
+        if grouped is None:
+            column = self.get_raw_column(name)
+            num_points = self.time_s.size * RAW_SAMPLES_PER_GROUP
+            if num_points == 0 or column.size < num_points:
+                return np.array([])
+            blocks = column[:num_points].reshape(-1, RAW_SAMPLES_PER_GROUP)
+            grouped = blocks.sum(axis=1) if how == GROUP_SUM else blocks.mean(axis=1)
+            grouped.flags.writeable = False
+            self._grouped_columns[cache_key] = grouped
+        return grouped
 
     def get_processed_data_as_dataframe(self) -> pd.DataFrame:
         data = {
-            KEY_TEMPO_S: self.time_s,
+            KEY_TEMPO_S: self.aligned_time_s,
             KEY_RPM_RAW: self.rpm_raw,
             KEY_VEL_KMH_RAW: self.velocity_raw_kmh,
             KEY_RPM_FILT: self.rpm_filtered,
@@ -0,0 +1,67 @@
+# iLogger/services/alignment_service.py
+
+import numpy as np
+from scipy import signal
+from data.run_data import RunData
+from config import *
+
+ALIGN_NONE = 'nenhum'
+ALIGN_LAUNCH = 'largada'
+ALIGN_XCORR = 'correlacao'
+
+ALIGNMENT_METHODS = {
+    ALIGN_NONE: "Nenhum",
+    ALIGN_LAUNCH: "Detecção de Largada",
+    ALIGN_XCORR: "Correlação Cruzada (FFT)",
+}
+
+def detect_launch_time(run: RunData, threshold_kmh: float = LAUNCH_THRESHOLD_KMH):
+    """
+    Retorna o instante (s) em que a velocidade bruta, suavizada por uma média móvel curta,
+    ultrapassa `threshold_kmh` pela primeira vez. Retorna None se a largada não for detectada.
+    """
+    vel = run.velocity_raw_kmh
+    if vel.size == 0:
+        return None
+    window = min(LAUNCH_SMOOTHING_WINDOW, vel.size)
+    smoothed = np.convolve(vel, np.ones(window) / window, mode='same')
+    above = np.flatnonzero(smoothed > threshold_kmh)
+    return float(run.time_s[above[0]]) if above.size > 0 else None
+
+def estimate_offset_xcorr(reference: RunData, run: RunData) -> float:
+    """
+    Estima o atraso (s) de `run` em relação a `reference` pelo pico da correlação
+    cruzada das velocidades brutas, calculada via FFT em O(n log n).
+    """
+    ref_vel, run_vel = reference.velocity_raw_kmh, run.velocity_raw_kmh
+    if ref_vel.size < 2 or run_vel.size < 2:
+        return 0.0
+    corr = signal.correlate(run_vel - run_vel.mean(), ref_vel - ref_vel.mean(), mode='full', method='fft')
+    lag = int(np.argmax(corr)) - (ref_vel.size - 1)
+    dt = reference.time_s[1] - reference.time_s[0]
+    return float(lag * dt)
+
+def compute_offsets(runs: list[RunData], reference_index: int, method: str) -> dict:
+    """
+    Calcula o deslocamento temporal de cada run em relação à run de referência.
+    Retorna {file_path: offset_s}; o tempo alinhado de cada run é `time_s - offset_s`.
+    """
+    offsets = {run.file_path: 0.0 for run in runs}
+    if method == ALIGN_NONE or not runs or not 0 <= reference_index < len(runs):
+        return offsets
+
+    reference = runs[reference_index]
+    if method == ALIGN_LAUNCH:
+        ref_launch = detect_launch_time(reference)
+        if ref_launch is None:
+            return offsets
+        for run in runs:
+            launch = detect_launch_time(run)
+            if launch is not None:
+                offsets[run.file_path] = launch - ref_launch
+    elif method == ALIGN_XCORR:
+        for run in runs:
+            if run is not reference:
+                offsets[run.file_path] = estimate_offset_xcorr(reference, run)
+
+    return offsets
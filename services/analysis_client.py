@@ -0,0 +1,122 @@
+# iLogger/services/analysis_client.py
+
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+import pandas as pd
+from data.run_data import RunData
+from services.analysis_server import CONTENT_TYPE_FRAME, decode_frame, dataframe_from_payload
+from config import *
+
+
+class AnalysisServerError(Exception):
+    """Erro informado pelo servidor de análise (requisição inválida, run ou canal inexistente)."""
+
+
+class AnalysisClient:
+    """
+    Cliente do servidor de análise (services/analysis_server.py). Mantém uma conexão
+    persistente e recebe as respostas no quadro binário, com os arrays sem cópia.
+    Pode ser usado por várias threads (as requisições são serializadas).
+    """
+    def __init__(self, url: str = f"http://{ANALYSIS_SERVER_HOST}:{ANALYSIS_SERVER_PORT}",
+                 timeout: float = ANALYSIS_CLIENT_TIMEOUT_S):
+        parts = urlsplit(url if '://' in url else f"http://{url}")
+        self.host = parts.hostname or ANALYSIS_SERVER_HOST
+        self.port = parts.port or ANALYSIS_SERVER_PORT
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _post(self, payload: dict) -> dict:
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json', 'Accept': CONTENT_TYPE_FRAME}
+        with self._lock:
+            # Uma nova tentativa cobre a conexão persistente fechada pelo servidor
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self._conn.request('POST', '/api', body, headers)
+                    response = self._conn.getresponse()
+                    data = response.read()
+                    break
+                except (ConnectionError, http.client.HTTPException):
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+        if response.getheader('Content-Type') == CONTENT_TYPE_FRAME:
+            return decode_frame(data)
+        result = json.loads(data.decode('utf-8'))
+        if response.status != 200:
+            raise AnalysisServerError(result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def request(self, op: str, **params):
+        """Executa uma operação e retorna seu resultado."""
+        return self._post({'op': op, **params})['result']
+
+    def batch(self, requests: list) -> list:
+        """
+        Executa várias operações numa única ida e volta. Cada item do retorno é o resultado
+        da requisição correspondente ou um dict {'error': ...}.
+        """
+        return self._post({'batch': requests})['results']
+
+    # --- Operações ---
+
+    def status(self) -> dict:
+        return self.request('status')
+
+    def runs(self) -> list:
+        return self.request('runs')
+
+    def channel(self, run: int, key: str, filter_settings: dict = None, x_min: float = None, x_max: float = None,
+                max_points: int = ANALYSIS_SERVER_MAX_POINTS, x_key: str = KEY_TEMPO_S):
+        """(x, y) decimados do canal, no tempo alinhado, cobrindo [x_min, x_max] (ou a run inteira)."""
+        result = self.request('channel', run=run, key=key, filter=filter_settings, x_min=x_min, x_max=x_max,
+                              max_points=max_points, x_key=x_key)
+        return result['x'], result['y']
+
+    def stats(self, filter_settings: dict = None) -> (pd.DataFrame, pd.DataFrame):
+        result = self.request('stats', filter=filter_settings)
+        return dataframe_from_payload(result['metrics']), dataframe_from_payload(result['variations'])
+
+    def alignment(self, reference: int, method: str, apply: bool = False) -> list:
+        """Deslocamento (s) de cada run; com `apply` o alinhamento vale para todos os clientes."""
+        return self.request('alignment', reference=reference, method=method, apply=apply)['offsets']
+
+    def load(self, paths: list) -> dict:
+        return self.request('load', paths=paths)
+
+    def fetch_runs(self, filter_settings: dict = None) -> list[RunData]:
+        """
+        Recria localmente as runs do servidor, com os canais filtrados de `filter_settings`
+        já no cache de filtro e o alinhamento do servidor (um único lote de requisições).
+        """
+        count = len(self.runs())
+        results = self.batch([{'op': 'run_data', 'run': i, 'filter': filter_settings} for i in range(count)])
+        runs = []
+        for result in results:
+            if 'error' in result:
+                raise AnalysisServerError(result['error'])
+            runs.append(RunData.from_arrays(
+                result['file_name'], result['time_s'], result['rpm_raw'], result['velocity_raw_kmh'],
+                filtered=result['filtered'], filter_settings=result['filter'],
+                file_path=f"{self.host}:{self.port}::{result['file_path']}", time_offset_s=result['time_offset_s'],
+            ))
+        return runs
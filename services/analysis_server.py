@@ -0,0 +1,299 @@
+# iLogger/services/analysis_server.py
+
+"""
+Servidor de análise local (sem Qt): mantém as runs carregadas, seus caches de filtro e as
+estatísticas num único processo e atende vários clientes (ex: notebooks no box) por HTTP.
+
+Protocolo: POST /api com um JSON {"op": ..., ...} ou {"batch": [{"op": ...}, ...]}.
+A resposta é um quadro binário (CONTENT_TYPE_FRAME: cabeçalho JSON seguido dos arrays
+crus, alinhados a 8 bytes) ou JSON puro, conforme o cabeçalho Accept. GET /status e
+GET /runs são atalhos para as operações de mesmo nome.
+"""
+
+import json
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from data.run_data import RunData
+from services import processing_service, alignment_service
+from config import *
+
+CONTENT_TYPE_FRAME = 'application/x-ilogger-frame'
+CONTENT_TYPE_JSON = 'application/json'
+FRAME_MAGIC = b'ILG1'
+_ALIGN = 8
+
+
+# --- Quadro Binário ---
+
+def _padded(size: int) -> int:
+    return -(-size // _ALIGN) * _ALIGN
+
+def encode_frame(payload) -> bytes:
+    """Serializa `payload` (dicts, listas, escalares e arrays numpy) num quadro binário."""
+    arrays = []
+
+    def pack(obj):
+        if isinstance(obj, np.ndarray):
+            arrays.append(np.ascontiguousarray(obj))
+            return {'__array__': len(arrays) - 1}
+        if isinstance(obj, dict):
+            return {str(k): pack(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [pack(v) for v in obj]
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return obj
+
+    body = pack(payload)
+    layout, offset = [], 0
+    for array in arrays:
+        layout.append({'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+        offset = _padded(offset + array.nbytes)
+    header = json.dumps({'body': body, 'arrays': layout}).encode('utf-8')
+
+    data_start = _padded(len(FRAME_MAGIC) + 4 + len(header))
+    frame = bytearray(data_start + offset)
+    frame[:4] = FRAME_MAGIC
+    frame[4:8] = struct.pack('<I', len(header))
+    frame[8:8 + len(header)] = header
+    for array, info in zip(arrays, layout):
+        start = data_start + info['offset']
+        frame[start:start + array.nbytes] = array.tobytes()
+    return bytes(frame)
+
+def decode_frame(data: bytes):
+    """Inverso de encode_frame; os arrays são visões somente leitura sobre `data` (sem cópia)."""
+    if data[:4] != FRAME_MAGIC:
+        raise ValueError("Quadro inválido: assinatura desconhecida.")
+    (header_len,) = struct.unpack('<I', data[4:8])
+    header = json.loads(data[8:8 + header_len].decode('utf-8'))
+    data_start = _padded(8 + header_len)
+    arrays = [
+        np.frombuffer(data, dtype=np.dtype(info['dtype']), count=int(np.prod(info['shape'])),
+                      offset=data_start + info['offset']).reshape(info['shape'])
+        for info in header['arrays']
+    ]
+
+    def unpack(obj):
+        if isinstance(obj, dict):
+            if set(obj) == {'__array__'}:
+                return arrays[obj['__array__']]
+            return {k: unpack(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [unpack(v) for v in obj]
+        return obj
+
+    return unpack(header['body'])
+
+def encode_json(payload) -> bytes:
+    """Alternativa em JSON puro (arrays viram listas), para clientes simples."""
+    return json.dumps(payload, default=lambda obj: obj.tolist() if isinstance(obj, (np.ndarray, np.generic)) else str(obj)).encode('utf-8')
+
+def dataframe_to_payload(df: pd.DataFrame) -> dict:
+    return {'index': [str(i) for i in df.index], 'index_name': df.index.name,
+            'columns': [str(c) for c in df.columns], 'data': df.to_numpy(dtype=float) if not df.empty else []}
+
+def dataframe_from_payload(payload: dict) -> pd.DataFrame:
+    if not payload['index']:
+        return pd.DataFrame()
+    df = pd.DataFrame(np.asarray(payload['data'], dtype=float), index=payload['index'], columns=payload['columns'])
+    df.index.name = payload.get('index_name')
+    return df
+
+
+# --- Sessão Compartilhada ---
+
+class AnalysisSession:
+    """
+    Estado compartilhado pelos clientes: runs carregadas (com seus caches de filtro, LOD e
+    índices), estatísticas por configuração de filtro e o alinhamento atual. Os caches das
+    runs (filtro e estruturas derivadas) têm o lock de cada run; a lista de runs, o
+    alinhamento e as estatísticas usam o lock da sessão, que nunca é mantido durante cálculos.
+    """
+    def __init__(self, runs: list[RunData] = None, filter_settings: dict = None):
+        self.runs = list(runs or [])
+        self.filter_settings = filter_settings or dict(FILTER_PRESETS[DEFAULT_FILTER_PRESET])
+        self.alignment = {'reference': None, 'method': alignment_service.ALIGN_NONE}
+        self._stats_cache = {}
+        self._lock = threading.RLock()
+        self._ops = {
+            'status': self._op_status,
+            'runs': self._op_runs,
+            'channel': self._op_channel,
+            'run_data': self._op_run_data,
+            'stats': self._op_stats,
+            'alignment': self._op_alignment,
+            'load': self._op_load,
+        }
+
+    def handle(self, request: dict):
+        op = request.get('op')
+        if op not in self._ops:
+            raise ValueError(f"Operação desconhecida: {op}")
+        return self._ops[op](request)
+
+    def handle_batch(self, requests: list) -> list:
+        """Atende um lote de requisições; um erro fica no item correspondente sem derrubar o lote."""
+        results = []
+        for request in requests:
+            try:
+                results.append(self.handle(request))
+            except Exception as e:
+                results.append({'error': str(e)})
+        return results
+
+    def _settings(self, request: dict) -> dict:
+        return request.get('filter') or self.filter_settings
+
+    def _run(self, request: dict) -> RunData:
+        with self._lock:
+            index = int(request.get('run', -1))
+            if not 0 <= index < len(self.runs):
+                raise ValueError(f"Run inexistente: {index}")
+            return self.runs[index]
+
+    # --- Operações ---
+
+    def _op_status(self, request: dict) -> dict:
+        with self._lock:
+            return {'app': APP_NAME, 'version': APP_VERSION, 'runs': len(self.runs),
+                    'filter': self.filter_settings, 'alignment': self.alignment}
+
+    def _op_runs(self, request: dict) -> list:
+        with self._lock:
+            runs = list(self.runs)
+        return [{'index': i, 'file_name': run.file_name, 'samples': int(run.time_s.size),
+                 'duration_s': float(run.time_s[-1]) if run.time_s.size else 0.0,
+                 'time_offset_s': run.time_offset_s} for i, run in enumerate(runs)]
+
+    def _op_channel(self, request: dict) -> dict:
+        """Canal decimado pela pirâmide LOD (picos preservados), no tempo alinhado e em float32."""
+        run = self._run(request)
+        key = request['key']
+        x_key = request.get('x_key', KEY_TEMPO_S)
+        pyramid = run.get_lod_pyramid(key, self._settings(request), x_key=x_key)
+        if pyramid is None:
+            raise ValueError(f"Canal indisponível: {key}")
+        offset = run.time_offset_s if x_key == KEY_TEMPO_S else 0.0
+        x_min, x_max = request.get('x_min'), request.get('x_max')
+        x, y = pyramid.serve(None if x_min is None else x_min + offset, None if x_max is None else x_max + offset,
+                             max_points=int(request.get('max_points', ANALYSIS_SERVER_MAX_POINTS)))
+        return {'run': request['run'], 'key': key, 'x': (x - offset).astype(np.float32), 'y': y.astype(np.float32)}
+
+    def _op_run_data(self, request: dict) -> dict:
+        """Canais completos da run (brutos e filtrados), para o cliente recriá-la sem refiltrar."""
+        run = self._run(request)
+        settings = self._settings(request)
+        return {'file_name': run.file_name, 'file_path': run.file_path, 'time_offset_s': run.time_offset_s,
+                'time_s': run.time_s, 'rpm_raw': run.rpm_raw, 'velocity_raw_kmh': run.velocity_raw_kmh,
+                'filter': settings, 'filtered': run.get_filtered_fields(settings)}
+
+    def _op_stats(self, request: dict) -> dict:
+        settings = self._settings(request)
+        cache_key = json.dumps(settings, sort_keys=True)
+        with self._lock:
+            cached = self._stats_cache.get(cache_key)
+            runs = list(self.runs)
+        if cached is None:
+            # Calculadas fora do lock para não bloquear as demais operações
+            cached = processing_service.generate_statistics(runs, settings)
+            with self._lock:
+                # Um "load" no meio do cálculo muda as runs: o resultado não vai para o cache
+                if self.runs == runs:
+                    cached = self._stats_cache.setdefault(cache_key, cached)
+        metrics_df, variations_df = cached
+        return {'metrics': dataframe_to_payload(metrics_df), 'variations': dataframe_to_payload(variations_df)}
+
+    def _op_alignment(self, request: dict) -> dict:
+        """Deslocamentos por run; com "apply" o alinhamento passa a valer para todos os clientes."""
+        reference = int(request.get('reference', 0))
+        method = request.get('method', alignment_service.ALIGN_NONE)
+        with self._lock:
+            offsets = alignment_service.compute_offsets(self.runs, reference, method)
+            by_index = [offsets.get(run.file_path, 0.0) for run in self.runs]
+            if request.get('apply'):
+                for run, offset in zip(self.runs, by_index):
+                    run.time_offset_s = offset
+                self.alignment = {'reference': reference, 'method': method}
+        return {'reference': reference, 'method': method, 'offsets': by_index}
+
+    def _op_load(self, request: dict) -> dict:
+        """Carrega mais arquivos (caminhos no disco do servidor) e os acrescenta à sessão."""
+        runs, errors = processing_service.process_run_files(request.get('paths', []))
+        for run in runs:
+            run.prefetch_filters(self.filter_settings)
+        with self._lock:
+            self.runs.extend(runs)
+            self._stats_cache.clear()
+        return {'loaded': len(runs), 'errors': errors}
+
+
+# --- HTTP ---
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Conexões persistentes: o cliente reaproveita o socket
+
+    def do_GET(self):
+        op = self.path.strip('/').split('?')[0]
+        if op not in ('status', 'runs'):
+            self._send_error(404, f"Recurso inexistente: {self.path}")
+            return
+        self._respond(self.server.session.handle({'op': op}))
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/api':
+            self._send_error(404, f"Recurso inexistente: {self.path}")
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_error(400, f"Requisição inválida: {e}")
+            return
+
+        session = self.server.session
+        if isinstance(request, dict) and isinstance(request.get('batch'), list):
+            self._respond({'results': session.handle_batch(request['batch'])})
+        elif isinstance(request, dict):
+            try:
+                self._respond({'result': session.handle(request)})
+            except Exception as e:
+                self._send_error(400, str(e))
+        else:
+            self._send_error(400, "Requisição inválida: esperado um objeto JSON.")
+
+    def _respond(self, payload, status: int = 200):
+        if CONTENT_TYPE_FRAME in self.headers.get('Accept', ''):
+            body, content_type = encode_frame(payload), CONTENT_TYPE_FRAME
+        else:
+            body, content_type = encode_json(payload), CONTENT_TYPE_JSON
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        body = encode_json({'error': message})
+        self.send_response(status)
+        self.send_header('Content-Type', CONTENT_TYPE_JSON)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(session: AnalysisSession, host: str = ANALYSIS_SERVER_HOST, port: int = ANALYSIS_SERVER_PORT,
+                  verbose: bool = False) -> ThreadingHTTPServer:
+    """Cria o servidor (uma thread por conexão); chame `serve_forever()` para atender."""
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.session = session
+    server.verbose = verbose
+    return server
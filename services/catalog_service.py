@@ -0,0 +1,314 @@
+# iLogger/services/catalog_service.py
+
+"""
+Catálogo de RUNs em SQLite: indexa diretórios de CSVs (de várias temporadas) com os
+metadados de cada arquivo, o setup do veículo (quando houver um setup.json) e as
+estatísticas sob o filtro padrão, para buscar runs sem carregá-las uma a uma.
+
+A indexação é incremental: arquivos com o mesmo tamanho e data de modificação (e indexados
+com o mesmo filtro) não são reprocessados; os novos são decodificados em paralelo.
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from data.run_data import RunData
+from services.alignment_service import detect_launch_time
+from config import *
+
+# Colunas de métricas: nome no catálogo -> chave das estatísticas da run
+STATS_COLUMNS = {
+    'vel_max_kmh': 'Vel. Máx (Km/h)',
+    'vel_media_kmh': 'Vel. Média (Km/h)',
+    'rpm_max': 'RPM Máx',
+    'rpm_medio': 'RPM Médio',
+    'acel_max_ms2': 'Acel. Máx (m/s²)',
+    'distancia_m': 'Distância Total (m)',
+}
+SPEED_COLUMNS = {f"t_0_{int(target)}_s": target for target in CATALOG_SPEED_TARGETS_KMH}
+METRIC_COLUMNS = ('duracao_s', 'amostras', *STATS_COLUMNS, *SPEED_COLUMNS)
+TEXT_COLUMNS = {'arquivo': 'file_name', 'diretorio': 'directory'}
+QUERY_OPERATORS = ('<=', '>=', '!=', '=', '<', '>', '~')
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    directory TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    filter_json TEXT NOT NULL,
+    indexed_at TEXT NOT NULL,
+    error TEXT,
+    {', '.join(f'{column} REAL' for column in METRIC_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS setup (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    num_value REAL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_directory ON runs(directory);
+CREATE INDEX IF NOT EXISTS idx_setup_text ON setup(key, value);
+CREATE INDEX IF NOT EXISTS idx_setup_num ON setup(key, num_value);
+{''.join(f'CREATE INDEX IF NOT EXISTS idx_runs_{column} ON runs({column});' for column in (*STATS_COLUMNS, *SPEED_COLUMNS))}
+"""
+
+
+def default_db_path() -> str:
+    return os.path.join(os.path.expanduser("~"), CATALOG_DB_FILENAME)
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Abre (criando se preciso) o catálogo; acrescenta colunas de novos alvos de velocidade."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+    if existing:
+        for column in METRIC_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE runs ADD COLUMN {column} REAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# --- Resumo de uma RUN (processos de trabalho) ---
+
+def time_to_speed(run: RunData, target_kmh: float, filter_settings: dict):
+    """Tempo (s) da largada até a velocidade filtrada atingir `target_kmh`, ou None."""
+    velocity = run.get_channel(KEY_VEL_KMH_FILT, filter_settings)
+    reached = np.flatnonzero(velocity >= target_kmh)
+    if reached.size == 0:
+        return None
+    launch = detect_launch_time(run) or 0.0
+    return max(float(run.time_s[reached[0]]) - launch, 0.0)
+
+def summarize_run_file(path: str, filter_settings: dict) -> dict:
+    """Carrega, filtra e resume um CSV; só o resumo volta ao processo principal."""
+    run = RunData(path)
+    stats = run.compute_stats(filter_settings)
+    summary = {
+        'duracao_s': float(run.time_s[-1]) if run.time_s.size else 0.0,
+        'amostras': float(run.time_s.size),
+    }
+    summary.update({column: float(stats[key]) for column, key in STATS_COLUMNS.items()})
+    summary.update({column: time_to_speed(run, target, filter_settings) for column, target in SPEED_COLUMNS.items()})
+    return summary
+
+
+# --- Setup ---
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+def read_setup(csv_path: str, directory_cache: dict = None) -> dict:
+    """Setup da RUN: setup.json do diretório, sobreposto pelo <RUN>.setup.json, se existirem."""
+    directory = os.path.dirname(csv_path)
+    if directory_cache is not None and directory in directory_cache:
+        setup = dict(directory_cache[directory])
+    else:
+        day_setup = _read_json(os.path.join(directory, CATALOG_SETUP_FILENAME))
+        if directory_cache is not None:
+            directory_cache[directory] = day_setup
+        setup = dict(day_setup)
+    setup.update(_read_json(os.path.splitext(csv_path)[0] + CATALOG_SETUP_SUFFIX))
+    return setup
+
+def _number(value: str):
+    try:
+        return float(value.replace(',', '.'))
+    except ValueError:
+        return None
+
+def _store_setup(conn: sqlite3.Connection, run_id: int, setup: dict):
+    conn.execute("DELETE FROM setup WHERE run_id = ?", (run_id,))
+    conn.executemany("INSERT INTO setup (run_id, key, value, num_value) VALUES (?, ?, ?, ?)",
+                     [(run_id, key, value, _number(value)) for key, value in setup.items()])
+
+
+# --- Indexação ---
+
+def _find_csv_files(directory: str, recursive: bool) -> list[str]:
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        paths.extend(os.path.abspath(os.path.join(root, name)) for name in files if name.lower().endswith('.csv'))
+        if not recursive:
+            break
+    return sorted(paths)
+
+def index_directories(db_path: str, directories: list, filter_settings: dict = None, recursive: bool = True,
+                      max_workers: int = None, progress=None) -> dict:
+    """
+    Atualiza o catálogo com os CSVs dos diretórios. Arquivos novos ou alterados (ou
+    indexados com outro filtro) são resumidos em paralelo; os removidos saem do catálogo.
+    O setup é relido a cada varredura (só JSON). `progress(concluídos, total)` acompanha
+    os arquivos resumidos. Retorna as contagens e os erros da varredura.
+    """
+    filter_settings = filter_settings or dict(FILTER_PRESETS[DEFAULT_FILTER_PRESET])
+    filter_json = json.dumps(filter_settings, sort_keys=True)
+    conn = connect(db_path)
+    report = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'errors': []}
+    try:
+        paths = []
+        for directory in directories:
+            paths.extend(_find_csv_files(os.path.abspath(directory), recursive))
+
+        # Runs do catálogo, dentro dos diretórios varridos, cujos arquivos não existem mais
+        roots = [os.path.abspath(directory) for directory in directories]
+        for run_id, path in conn.execute("SELECT id, path FROM runs").fetchall():
+            inside = any(path.startswith(root + os.sep) if recursive else os.path.dirname(path) == root for root in roots)
+            if inside and not os.path.exists(path):
+                conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+                report['removed'] += 1
+
+        known = {path: (run_id, size, mtime_ns, stored_filter)
+                 for run_id, path, size, mtime_ns, stored_filter
+                 in conn.execute("SELECT id, path, size, mtime_ns, filter_json FROM runs")}
+        pending, setup_cache = [], {}
+        for path in paths:
+            stat = os.stat(path)
+            entry = known.get(path)
+            if entry is not None and entry[1:] == (stat.st_size, stat.st_mtime_ns, filter_json):
+                _store_setup(conn, entry[0], read_setup(path, setup_cache))
+                report['unchanged'] += 1
+            else:
+                pending.append((path, stat))
+        conn.commit()
+
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        # 'spawn' em todas as plataformas: o fork do processo da interface (com threads do Qt) não é seguro
+        executor = (ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+                    if workers > 1 else None)
+        try:
+            results = (executor.map(_summarize_safe, [path for path, _ in pending], [filter_settings] * len(pending),
+                                    chunksize=max(1, len(pending) // (workers * 4)))
+                       if executor else (_summarize_safe(path, filter_settings) for path, _ in pending))
+            for done, ((path, stat), (summary, error)) in enumerate(zip(pending, results), start=1):
+                if error:
+                    report['errors'].append(f"Erro ao indexar {path}: {error}")
+                row = {'path': path, 'directory': os.path.dirname(path), 'file_name': os.path.basename(path),
+                       'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'filter_json': filter_json,
+                       'indexed_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'error': error,
+                       **{column: (summary or {}).get(column) for column in METRIC_COLUMNS}}
+                columns = list(row)
+                conn.execute(
+                    f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT(path) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}",
+                    [row[c] for c in columns],
+                )
+                run_id = conn.execute("SELECT id FROM runs WHERE path = ?", (path,)).fetchone()[0]
+                _store_setup(conn, run_id, read_setup(path, setup_cache))
+                report['updated' if path in known else 'added'] += 1
+                if done % 200 == 0:
+                    conn.commit()
+                if progress is not None:
+                    progress(done, len(pending))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        conn.commit()
+    finally:
+        conn.close()
+    return report
+
+def _summarize_safe(path: str, filter_settings: dict):
+    """(resumo, None) ou (None, mensagem): um CSV inválido não interrompe a indexação."""
+    try:
+        return summarize_run_file(path, filter_settings), None
+    except Exception as e:
+        return None, str(e)
+
+
+# --- Consulta ---
+
+def parse_query(text: str) -> list:
+    """
+    Converte "peso_cvt = 180 e t_0_30_s < 4" em [(campo, operador, valor), ...].
+    Condições separadas por "e"/"and"; operadores: =, !=, <, <=, >, >= e ~ (contém).
+    """
+    conditions = []
+    for part in re.split(r'\s+(?:e|and)\s+|;', text.strip(), flags=re.IGNORECASE):
+        if not part.strip():
+            continue
+        match = re.match(r'^\s*([\w.\-]+)\s*(<=|>=|!=|=|<|>|~)\s*(.+?)\s*$', part)
+        if not match:
+            raise ValueError(f"Condição inválida: '{part.strip()}' (use: campo operador valor)")
+        field, op, value = match.groups()
+        conditions.append((field, op, value.strip('\'"')))
+    return conditions
+
+def _condition_sql(field: str, op: str, value: str) -> (str, list):
+    number = _number(value)
+    if field in METRIC_COLUMNS:
+        if number is None or op == '~':
+            raise ValueError(f"'{field}' é numérico: use =, !=, <, <=, > ou >= com um número.")
+        return f"runs.{field} {op} ?", [number]
+    if field in TEXT_COLUMNS:
+        column = f"runs.{TEXT_COLUMNS[field]}"
+        if op == '~':
+            return f"{column} LIKE ?", [f"%{value}%"]
+        return f"{column} {op} ?", [value]
+    # Qualquer outro campo é uma chave do setup
+    if op == '~':
+        clause, params = "s.value LIKE ?", [f"%{value}%"]
+    elif number is not None:
+        clause, params = f"s.num_value {op} ?", [number]
+    else:
+        clause, params = f"s.value {op} ?", [value]
+    return f"EXISTS (SELECT 1 FROM setup s WHERE s.run_id = runs.id AND s.key = ? AND {clause})", [field, *params]
+
+def query_runs(db_path: str, conditions: list, limit: int = CATALOG_QUERY_LIMIT) -> list[dict]:
+    """
+    Runs do catálogo que satisfazem todas as condições (de parse_query), com métricas e
+    setup. Arquivos que falharam na indexação ficam de fora.
+    """
+    clauses, params = ["runs.error IS NULL"], []
+    for field, op, value in conditions:
+        if op not in QUERY_OPERATORS:
+            raise ValueError(f"Operador inválido: {op}")
+        clause, clause_params = _condition_sql(field, op, value)
+        clauses.append(clause)
+        params.extend(clause_params)
+
+    conn = connect(db_path)
+    try:
+        columns = ['id', 'path', 'file_name', 'directory', *METRIC_COLUMNS]
+        rows = conn.execute(
+            f"SELECT {', '.join(f'runs.{c}' for c in columns)} FROM runs WHERE {' AND '.join(clauses)} "
+            f"ORDER BY runs.directory, runs.file_name LIMIT ?", [*params, limit],
+        ).fetchall()
+        results = [dict(zip(columns, row)) for row in rows]
+        setups = {}
+        ids = [r['id'] for r in results]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for run_id, key, value in conn.execute(
+                f"SELECT run_id, key, value FROM setup WHERE run_id IN ({', '.join('?' * len(chunk))})", chunk
+            ):
+                setups.setdefault(run_id, {})[key] = value
+        for result in results:
+            result['setup'] = setups.get(result['id'], {})
+        return results
+    finally:
+        conn.close()
+
+def catalog_summary(db_path: str) -> dict:
+    conn = connect(db_path)
+    try:
+        total, errors = conn.execute("SELECT COUNT(*), COUNT(error) FROM runs").fetchone()
+        setup_keys = [row[0] for row in conn.execute("SELECT DISTINCT key FROM setup ORDER BY key")]
+        return {'runs': total, 'errors': errors, 'setup_keys': setup_keys}
+    finally:
+        conn.close()
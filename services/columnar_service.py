@@ -0,0 +1,210 @@
+# iLogger/services/columnar_service.py
+
+import json
+import os
+import zipfile
+import numpy as np
+from data.run_data import RunData, FILTER_ENTRY_FIELDS
+from config import *
+
+# Dependências opcionais: cada formato só fica disponível se a biblioteca estiver instalada
+try:
+    import h5py
+except ImportError:
+    h5py = None
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+FORMAT_NPZ = 'npz'
+FORMAT_HDF5 = 'hdf5'
+FORMAT_ARROW = 'arrow'
+
+FORMAT_EXTENSIONS = {
+    '.npz': FORMAT_NPZ,
+    '.h5': FORMAT_HDF5,
+    '.hdf5': FORMAT_HDF5,
+    '.arrow': FORMAT_ARROW,
+}
+FORMAT_VERSION = 1
+
+# Canais gravados por run: base de tempo e canais brutos, seguidos dos campos filtrados
+RAW_FIELDS = ('time_s', 'rpm_raw', 'velocity_raw_kmh')
+CHANNEL_FIELDS = RAW_FIELDS + FILTER_ENTRY_FIELDS
+
+
+def available_formats() -> list[str]:
+    """Formatos cujas dependências estão instaladas (npz sempre está)."""
+    formats = [FORMAT_NPZ]
+    if h5py is not None:
+        formats.append(FORMAT_HDF5)
+    if pa is not None:
+        formats.append(FORMAT_ARROW)
+    return formats
+
+def is_columnar_file(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in FORMAT_EXTENSIONS
+
+def _format_for(path: str) -> str:
+    fmt = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Extensão não suportada para exportação colunar: {path}")
+    if fmt not in available_formats():
+        module = 'h5py' if fmt == FORMAT_HDF5 else 'pyarrow'
+        raise ValueError(f"O formato {fmt} requer o pacote '{module}', que não está instalado.")
+    return fmt
+
+def _json_value(value):
+    """Converte escalares NumPy para tipos nativos na serialização JSON."""
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+def _build_metadata(runs: list[RunData], stats: list[dict], filter_settings: dict, setup_info: dict) -> dict:
+    return {
+        'format_version': FORMAT_VERSION,
+        'filter_settings': filter_settings,
+        'setup_info': setup_info or {},
+        'runs': [
+            {
+                'file_name': run.file_name,
+                'file_path': run.file_path,
+                'time_offset_s': run.time_offset_s,
+                'num_points': int(run.time_s.size),
+                'stats': run_stats,
+            }
+            for run, run_stats in zip(runs, stats)
+        ],
+    }
+
+def _run_channels(run: RunData, filtered: dict):
+    """Gera (campo, array) dos canais da run, na ordem de CHANNEL_FIELDS (`filtered` vem do cache de filtro)."""
+    for field in RAW_FIELDS:
+        yield field, np.ascontiguousarray(getattr(run, field), dtype=float)
+    for field in FILTER_ENTRY_FIELDS:
+        yield field, np.ascontiguousarray(filtered.get(field, ()), dtype=float)
+
+
+# --- Escrita ---
+
+def export_runs(runs: list[RunData], save_path: str, filter_settings: dict, setup_info: dict = None, progress=None):
+    """
+    Grava os canais brutos e filtrados de todas as runs (sob `filter_settings`), as
+    configurações do filtro, o setup e as estatísticas num contêiner colunar comprimido.
+    O formato vem da extensão (.npz, .h5/.hdf5, .arrow). Os canais são gravados run a run,
+    um de cada vez; as estatísticas vão nos metadados, gravados antes dos canais.
+    Os canais filtrados vêm do cache de filtro, sem alterar o estado das runs (pode rodar
+    numa tarefa em segundo plano). `progress(runs_gravadas, total)` acompanha a escrita.
+    """
+    fmt = _format_for(save_path)
+    filtered = [run.get_filtered_fields(filter_settings) or {} for run in runs]
+    stats = [run.compute_stats(filter_settings) for run in runs]
+    metadata = json.dumps(_build_metadata(runs, stats, filter_settings, setup_info), default=_json_value)
+
+    writer = {FORMAT_NPZ: _write_npz, FORMAT_HDF5: _write_hdf5, FORMAT_ARROW: _write_arrow}[fmt]
+    writer(runs, filtered, save_path, metadata, progress or (lambda done, total: None))
+
+def _write_npz(runs, filtered, save_path, metadata, progress):
+    # Cada canal é um membro .npy comprimido, escrito direto no zip (np.load o lê sob demanda)
+    with zipfile.ZipFile(save_path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        with archive.open('metadata.npy', 'w') as member:
+            np.lib.format.write_array(member, np.array(metadata), allow_pickle=False)
+        for i, run in enumerate(runs):
+            for field, values in _run_channels(run, filtered[i]):
+                with archive.open(f'run_{i}/{field}.npy', 'w', force_zip64=True) as member:
+                    np.lib.format.write_array(member, values, allow_pickle=False)
+            progress(i + 1, len(runs))
+
+def _write_hdf5(runs, filtered, save_path, metadata, progress):
+    with h5py.File(save_path, 'w') as h5:
+        h5.attrs['metadata'] = metadata
+        for i, run in enumerate(runs):
+            group = h5.create_group(f'run_{i}')
+            for field, values in _run_channels(run, filtered[i]):
+                group.create_dataset(
+                    field, data=values, chunks=(max(min(COLUMNAR_CHUNK_ROWS, values.size), 1),),
+                    compression=COLUMNAR_HDF5_COMPRESSION, compression_opts=COLUMNAR_HDF5_COMPRESSION_LEVEL,
+                    shuffle=True,
+                )
+            progress(i + 1, len(runs))
+
+def _write_arrow(runs, filtered, save_path, metadata, progress):
+    # Um record batch por run; o esquema é o mesmo para todas
+    schema = pa.schema([(field, pa.float64()) for field in CHANNEL_FIELDS], metadata={'ilogger': metadata})
+    options = pa.ipc.IpcWriteOptions(compression=COLUMNAR_ARROW_COMPRESSION)
+    with pa.OSFile(save_path, 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        for i, run in enumerate(runs):
+            writer.write_batch(pa.record_batch([values for _, values in _run_channels(run, filtered[i])], schema=schema))
+            progress(i + 1, len(runs))
+
+
+# --- Leitura ---
+
+class ColumnarExport:
+    """
+    Leitor de uma exportação colunar. Os metadados são lidos na abertura; cada canal só é
+    lido (e descomprimido) quando pedido em `channel`. Arquivos Arrow são mapeados em memória.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.format = _format_for(path)
+        if self.format == FORMAT_NPZ:
+            self._handle = np.load(path, allow_pickle=False)
+            metadata = str(self._handle['metadata'])
+        elif self.format == FORMAT_HDF5:
+            self._handle = h5py.File(path, 'r')
+            metadata = self._handle.attrs['metadata']
+        else:
+            self._source = pa.memory_map(path, 'r')
+            self._handle = pa.ipc.open_file(self._source)
+            metadata = self._handle.schema.metadata[b'ilogger'].decode('utf-8')
+        self.metadata = json.loads(metadata)
+
+    @property
+    def runs(self) -> list[dict]:
+        return self.metadata['runs']
+
+    @property
+    def filter_settings(self) -> dict:
+        return self.metadata['filter_settings']
+
+    def channel(self, run_index: int, field: str) -> np.ndarray:
+        """Lê o canal `field` (um de CHANNEL_FIELDS) da run de índice `run_index`."""
+        if field not in CHANNEL_FIELDS:
+            raise KeyError(f"Canal desconhecido: {field}")
+        if self.format == FORMAT_NPZ:
+            return self._handle[f'run_{run_index}/{field}']
+        if self.format == FORMAT_HDF5:
+            return self._handle[f'run_{run_index}'][field][()]
+        batch = self._handle.get_batch(run_index)
+        return batch.column(field).to_numpy(zero_copy_only=False)
+
+    def close(self):
+        if self.format == FORMAT_ARROW:
+            self._source.close()
+        else:
+            self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_export(path: str) -> ColumnarExport:
+    return ColumnarExport(path)
+
+def load_runs(path: str) -> list[RunData]:
+    """
+    Recria as runs de uma exportação colunar. Os canais filtrados entram direto no cache
+    de filtro de cada run, sob as configurações gravadas, sem refiltrar.
+    """
+    with open_export(path) as export:
+        runs = []
+        for i, info in enumerate(export.runs):
+            channels = {field: export.channel(i, field) for field in CHANNEL_FIELDS}
+            runs.append(RunData.from_arrays(
+                info['file_name'], channels['time_s'], channels['rpm_raw'], channels['velocity_raw_kmh'],
+                filtered=channels, filter_settings=export.filter_settings,
+                file_path=f"{path}::{info['file_name']}", time_offset_s=info.get('time_offset_s', 0.0),
+            ))
+        return runs
@@ -0,0 +1,42 @@
+# iLogger/services/cursor_service.py
+
+import numpy as np
+from data.run_data import RunData
+from config import *
+
+# Canais exibidos na leitura do cursor: rótulo -> chave
+CURSOR_CHANNELS = {
+    "RPM": KEY_RPM_FILT,
+    "Vel. (Km/h)": KEY_VEL_KMH_FILT,
+    "Acel. (m/s²)": KEY_ACEL_MS2_FILT,
+    "Dist. (m)": KEY_DIST_M,
+}
+
+def nearest_index(time_s: np.ndarray, t: float) -> int:
+    """Índice da amostra mais próxima de `t` num eixo de tempo crescente (busca binária, O(log n))."""
+    i = int(np.searchsorted(time_s, t))
+    if i <= 0:
+        return 0
+    if i >= time_s.size:
+        return time_s.size - 1
+    return i - 1 if t - time_s[i - 1] <= time_s[i] - t else i
+
+def values_at_time(runs: list[RunData], t: float, filter_settings: dict, channels: dict = CURSOR_CHANNELS) -> np.ndarray:
+    """
+    Valores dos canais de cada run no instante `t` (tempo alinhado), pela amostra mais próxima.
+    Retorna uma matriz [n_runs, n_canais]; runs sem dados naquele instante ficam com NaN.
+    """
+    values = np.full((len(runs), len(channels)), np.nan)
+    for i, run in enumerate(runs):
+        if run.time_s.size == 0:
+            continue
+        # O eixo original da run é deslocado pelo alinhamento
+        t_run = t + run.time_offset_s
+        if t_run < run.time_s[0] or t_run > run.time_s[-1]:
+            continue
+        idx = nearest_index(run.time_s, t_run)
+        for j, key in enumerate(channels.values()):
+            channel = run.get_channel(key, filter_settings)
+            if idx < channel.size:
+                values[i, j] = channel[idx]
+    return values
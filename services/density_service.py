@@ -0,0 +1,81 @@
+# iLogger/services/density_service.py
+
+import json
+from collections import OrderedDict
+import numpy as np
+from scipy import stats
+from data.run_data import RunData
+from config import *
+
+# Cache LRU das grades de densidade: chave -> dict do resultado
+_density_cache = OrderedDict()
+
+def clear_cache():
+    """Descarta todas as grades de densidade em cache."""
+    _density_cache.clear()
+
+def _runs_signature(runs: list[RunData]) -> tuple:
+    return tuple((run.file_path, run.time_s.size) for run in runs)
+
+def _channel_pair(run: RunData, x_key: str, y_key: str, filter_settings: dict):
+    """Retorna (x, y) do par de canais da run, descartando amostras não finitas."""
+    run.apply_filters_and_recalculate(filter_settings)
+    x = run.get_data_for_custom_plot(x_key)
+    y = run.get_data_for_custom_plot(y_key)
+    n = min(x.size, y.size)
+    x, y = x[:n], y[:n]
+    valid = np.isfinite(x) & np.isfinite(y)
+    return x[valid], y[valid]
+
+def compute_density(runs: list[RunData], x_key: str, y_key: str, filter_settings: dict, bins: tuple = DENSITY_BINS) -> dict:
+    """
+    Acumula as amostras (x, y) de todas as runs numa grade 2D com np.histogram2d.
+    O custo de exibição passa a depender só do tamanho da grade, não do número de amostras.
+
+    Retorna um dict com:
+    - 'counts': matriz [bins_x, bins_y] com o número de amostras por célula
+    - 'x_edges', 'y_edges': bordas das células
+    Ou None se não houver amostras.
+    """
+    cache_key = (x_key, y_key, json.dumps(filter_settings, sort_keys=True), tuple(bins), _runs_signature(runs))
+    if cache_key in _density_cache:
+        _density_cache.move_to_end(cache_key)
+        return _density_cache[cache_key]
+
+    pairs = [_channel_pair(run, x_key, y_key, filter_settings) for run in runs]
+    pairs = [(x, y) for x, y in pairs if x.size > 0]
+    if not pairs:
+        return None
+
+    # Bordas comuns a todas as runs para que as contagens possam ser somadas
+    x_min = min(float(x.min()) for x, _ in pairs)
+    x_max = max(float(x.max()) for x, _ in pairs)
+    y_min = min(float(y.min()) for _, y in pairs)
+    y_max = max(float(y.max()) for _, y in pairs)
+    x_edges = np.linspace(x_min, x_max if x_max > x_min else x_min + 1.0, bins[0] + 1)
+    y_edges = np.linspace(y_min, y_max if y_max > y_min else y_min + 1.0, bins[1] + 1)
+
+    counts = np.zeros(tuple(bins))
+    for x, y in pairs:
+        counts += np.histogram2d(x, y, bins=(x_edges, y_edges))[0]
+
+    for array in (counts, x_edges, y_edges):
+        array.flags.writeable = False
+    result = {'counts': counts, 'x_edges': x_edges, 'y_edges': y_edges}
+    _density_cache[cache_key] = result
+    while len(_density_cache) > DENSITY_CACHE_MAX_ENTRIES:
+        _density_cache.popitem(last=False)
+    return result
+
+def median_curve(run: RunData, x_key: str, y_key: str, filter_settings: dict, x_edges: np.ndarray):
+    """
+    Curva mediana de y por faixa de x (ex: a curva de troca da CVT: RPM mediano por velocidade).
+    Retorna (centros das faixas, medianas) apenas das faixas com amostras.
+    """
+    x, y = _channel_pair(run, x_key, y_key, filter_settings)
+    if x.size == 0:
+        return np.array([]), np.array([])
+    medians, edges, _ = stats.binned_statistic(x, y, statistic='median', bins=x_edges)
+    centers = (edges[:-1] + edges[1:]) / 2
+    valid = ~np.isnan(medians)
+    return centers[valid], medians[valid]
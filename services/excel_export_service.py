@@ -0,0 +1,248 @@
+# iLogger/services/excel_export_service.py
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from data.run_data import RunData
+from services import expression_service
+from config import *
+
+# Colunas da aba "tidy" e da aba decimada dos gráficos (após a coluna 'Run')
+ANALYSIS_COLUMNS = {
+    KEY_TEMPO_S: 'Tempo (s)',
+    KEY_VEL_KMH_FILT: 'Velocidade (km/h)',
+    KEY_RPM_FILT: 'RPM',
+    KEY_ACEL_MS2_FILT: 'Aceleração (m/s²)',
+    KEY_DIST_M: 'Distância (m)',
+}
+RUN_COLUMNS = [KEY_TEMPO_S, KEY_RPM_RAW, KEY_VEL_KMH_RAW, KEY_RPM_FILT, KEY_VEL_KMH_FILT, KEY_ACEL_MS2_FILT, KEY_DIST_M]
+
+ANALYSIS_SHEET = 'Dados para Análise'
+CHART_DATA_SHEET = 'Dados Gráficos'
+
+
+# --- Escrita Linha a Linha (modo constant_memory) ---
+
+def _rows(matrix: np.ndarray) -> list:
+    """
+    Converte a matriz [n_linhas, n_colunas] em listas Python de uma só vez, trocando os
+    valores não finitos (que o Excel não aceita) por None, que vira célula vazia.
+    """
+    rows = matrix.tolist()
+    for r in np.flatnonzero(~np.isfinite(matrix).all(axis=1)):
+        rows[r] = [v if np.isfinite(v) else None for v in rows[r]]
+    return rows
+
+def _write_matrix(sheet, start_row: int, start_col: int, matrix: np.ndarray, label: str = None) -> int:
+    """
+    Escreve a matriz em ordem crescente de linhas (exigência do modo constant_memory, em
+    que cada linha é descarregada para o disco assim que a seguinte começa). Se `label`
+    for dado, ele ocupa a coluna anterior a `start_col` em todas as linhas.
+    Retorna a próxima linha livre.
+    """
+    row = start_row
+    for values in _rows(matrix):
+        if label is not None:
+            sheet.write_string(row, start_col - 1, label)
+        sheet.write_row(row, start_col, values)
+        row += 1
+    return row
+
+def _write_dataframe(sheet, start_row: int, df: pd.DataFrame, header_format) -> int:
+    """Equivalente a `DataFrame.to_excel` (com índice) para planilhas em constant_memory."""
+    sheet.write_row(start_row, 1, [str(c) for c in df.columns], header_format)
+    row = start_row + 1
+    for index, values in zip(df.index, df.astype(object).values.tolist()):
+        sheet.write(row, 0, str(index), header_format)
+        for col, value in enumerate(values, start=1):
+            if value is None or (isinstance(value, float) and not np.isfinite(value)):
+                continue
+            sheet.write(row, col, value.item() if isinstance(value, np.generic) else value)
+        row += 1
+    return row
+
+def _run_matrix(run: RunData, filter_settings: dict, expression_channels: dict):
+    """
+    Monta uma única vez a matriz de dados processados da run (colunas de RUN_COLUMNS
+    seguidas dos canais calculados). Retorna (cabeçalhos, matriz).
+    """
+    # get_channel não altera os canais filtrados atuais da run (a exportação roda em segundo plano)
+    columns = {KEY_TEMPO_S: run.aligned_time_s}
+    columns.update((key, run.get_channel(key, filter_settings)) for key in RUN_COLUMNS[1:])
+    if expression_channels:
+        columns.update(expression_service.evaluate_channels(run, expression_channels, filter_settings))
+    n_rows = min(len(values) for values in columns.values())
+    matrix = np.empty((n_rows, len(columns)))
+    for col, values in enumerate(columns.values()):
+        matrix[:, col] = np.asarray(values, dtype=float)[:n_rows]
+    return list(columns), matrix
+
+def _run_sheet_name(run_name: str, used: set) -> str:
+    """Nome 'Dados_<run>' válido no Excel (sem []:*?/\\, até 31 caracteres) e único no arquivo."""
+    base = f"Dados_{run_name.replace('.csv', '')}"
+    base = ''.join('_' if c in '[]:*?/\\' else c for c in base)[:31]
+    name, suffix = base, 1
+    while name.lower() in used:
+        suffix += 1
+        name = f"{base[:31 - len(str(suffix)) - 1]}~{suffix}"
+    used.add(name.lower())
+    return name
+
+def decimation_indices(n_rows: int, max_points: int = EXCEL_CHART_MAX_POINTS_PER_RUN) -> np.ndarray:
+    """Índices igualmente espaçados (incluindo o primeiro e o último) para no máximo `max_points` linhas."""
+    if n_rows <= max_points:
+        return np.arange(n_rows)
+    return np.unique(np.linspace(0, n_rows - 1, max_points).round().astype(int))
+
+
+# --- Gráficos Nativos ---
+
+def _create_timeseries_chart(workbook, data_sheet_name, run_names, rows_per_run, time_col, value_col, title, y_title):
+    """Cria um gráfico de linha (série temporal) comparativo no Excel."""
+    chart = workbook.add_chart({'type': 'line'})
+    row_offset = 2
+    for i, run_name in enumerate(run_names):
+        start = row_offset
+        end = row_offset + rows_per_run[i] - 1
+        chart.add_series({
+            'name':       run_name,
+            'categories': f"='{data_sheet_name}'!${time_col}${start}:${time_col}${end}",
+            'values':     f"='{data_sheet_name}'!${value_col}${start}:${value_col}${end}",
+            'line':       {'width': 1.25},
+        })
+        row_offset += rows_per_run[i]
+    chart.set_title({'name': title})
+    chart.set_x_axis({'name': 'Tempo (s)'})
+    chart.set_y_axis({'name': y_title, 'major_gridlines': {'visible': False}})
+    chart.set_legend({'position': 'top'})
+    chart.set_size({'width': 720, 'height': 420})
+    return chart
+
+def _create_scatter_chart(workbook, data_sheet_name, run_names, rows_per_run, x_col, y_col, title, x_title, y_title):
+    """Cria um gráfico de dispersão (XY) comparativo no Excel."""
+    chart = workbook.add_chart({'type': 'scatter'})
+    row_offset = 2
+    for i, run_name in enumerate(run_names):
+        start = row_offset
+        end = row_offset + rows_per_run[i] - 1
+        chart.add_series({
+            'name':       run_name,
+            'categories': f"='{data_sheet_name}'!${x_col}${start}:${x_col}${end}",
+            'values':     f"='{data_sheet_name}'!${y_col}${start}:${y_col}${end}",
+            'marker':     {'type': 'circle', 'size': 3},
+            'line':       {'none': True},
+        })
+        row_offset += rows_per_run[i]
+    chart.set_title({'name': title})
+    chart.set_x_axis({'name': x_title})
+    chart.set_y_axis({'name': y_title})
+    chart.set_legend({'position': 'top'})
+    chart.set_size({'width': 720, 'height': 420})
+    return chart
+
+
+# --- Escrita do Dashboard ---
+
+def write_dashboard_workbook(runs: list[RunData], save_path: str, metrics_df: pd.DataFrame, variations_df: pd.DataFrame,
+                             filter_settings: dict, setup_info: dict, expression_channels: dict = None,
+                             progress=None):
+    """
+    Escreve o relatório Excel (instruções, setup/métricas, dashboard, dados "tidy", dados
+    decimados dos gráficos e uma aba por run) em modo constant_memory do XlsxWriter.
+
+    Cada run é filtrada e convertida em matriz uma única vez e escrita linha a linha nas
+    suas abas; apenas a run corrente fica na memória. Os gráficos nativos apontam para a
+    aba decimada, com no máximo EXCEL_CHART_MAX_POINTS_PER_RUN pontos por run.
+    `progress(concluídas, total)` é chamado após cada run; uma exceção lançada por ele
+    interrompe a escrita. Erros são propagados ao chamador.
+    """
+    workbook = xlsxwriter.Workbook(save_path, {'constant_memory': True, 'use_zip64': True})
+    try:
+        # Formatos
+        bold_format = workbook.add_format({'bold': True})
+        title_format = workbook.add_format({'bold': True, 'font_size': 14, 'bottom': 1, 'font_color': '#333333'})
+        header_format = workbook.add_format({'bold': True, 'bg_color': '#DDEBF7', 'border': 1, 'font_color': '#002060'})
+        table_header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+
+        # -- Criação das Abas na Ordem Correta --
+        sheet1 = workbook.add_worksheet('Instrucoes')
+        sheet2 = workbook.add_worksheet('Dados Gerais e Setup')
+        sheet3 = workbook.add_worksheet('Dashboard de Gráficos')
+        analysis_sheet = workbook.add_worksheet(ANALYSIS_SHEET)
+        chart_sheet = workbook.add_worksheet(CHART_DATA_SHEET)
+
+        # -- Aba 1: Instruções --
+        sheet1.set_column('A:A', 25)
+        sheet1.set_column('B:B', 60)
+        sheet1.write('A1', 'Guia de Utilização do Relatório', title_format)
+        sheet1.write('A3', 'Estrutura do Arquivo', header_format)
+        sheet1.write('B3', 'Descrição', header_format)
+        sheet1.write('A4', 'Dados Gerais e Setup', bold_format)
+        sheet1.write('B4', 'Informações de setup do veículo e tabelas com as métricas principais da análise.')
+        sheet1.write('A5', 'Dashboard de Gráficos', bold_format)
+        sheet1.write('B5', 'Painel visual com todos os gráficos comparativos da análise. Os gráficos são interativos.')
+        sheet1.write('A6', ANALYSIS_SHEET, bold_format)
+        sheet1.write('B6', 'Tabela com os dados filtrados em formato otimizado ("tidy data"), ideal para importação em ferramentas de BI (PowerBI, Tableau) ou para análise por IA.')
+        sheet1.write('A7', CHART_DATA_SHEET, bold_format)
+        sheet1.write('B7', f'Versão reduzida (até {EXCEL_CHART_MAX_POINTS_PER_RUN} pontos por corrida) dos dados de análise, usada pelos gráficos do dashboard.')
+        sheet1.write('A8', 'Dados_RUN_...', bold_format)
+        sheet1.write('B8', 'Abas individuais contendo os dados processados completos para cada uma das corridas analisadas.')
+
+        # -- Aba 2: Dados Gerais e Setup --
+        sheet2.set_column('A:A', 25)
+        sheet2.set_column('B:Z', 15)
+        sheet2.write('A1', 'Setup do Veículo', title_format)
+        row = 2
+        if setup_info:
+            for key, value in setup_info.items():
+                sheet2.write_string(row, 0, key, bold_format)
+                sheet2.write_string(row, 1, str(value))
+                row += 1
+        row += 2
+        sheet2.write(row, 0, 'Métricas Principais', title_format)
+        row = _write_dataframe(sheet2, row + 1, metrics_df, table_header_format)
+        row += 2
+        sheet2.write(row, 0, 'Variações Percentuais (%)', title_format)
+        _write_dataframe(sheet2, row + 1, variations_df, table_header_format)
+
+        # -- Abas de dados: uma passada por run --
+        analysis_header = ['Run', *ANALYSIS_COLUMNS.values()]
+        analysis_sheet.write_row(0, 0, analysis_header, table_header_format)
+        chart_sheet.write_row(0, 0, analysis_header, table_header_format)
+        analysis_row, chart_row = 1, 1
+        run_names = [run.file_name for run in runs]
+        chart_rows_per_run = []
+        used_sheet_names = set()
+
+        for done, (run, run_name) in enumerate(zip(runs, run_names), start=1):
+            headers, matrix = _run_matrix(run, filter_settings, expression_channels)
+            analysis = matrix[:, [headers.index(key) for key in ANALYSIS_COLUMNS]]
+
+            analysis_row = _write_matrix(analysis_sheet, analysis_row, 1, analysis, label=run_name)
+            decimated = analysis[decimation_indices(len(analysis))]
+            chart_row = _write_matrix(chart_sheet, chart_row, 1, decimated, label=run_name)
+            chart_rows_per_run.append(len(decimated))
+
+            run_sheet = workbook.add_worksheet(_run_sheet_name(run_name, used_sheet_names))
+            run_sheet.write_row(0, 0, headers, table_header_format)
+            _write_matrix(run_sheet, 1, 0, matrix)
+            if progress is not None:
+                progress(done, len(runs))
+
+        # -- Gráficos Nativos (sobre a aba decimada) --
+        charts = {}
+        charts['vel'] = _create_timeseries_chart(workbook, CHART_DATA_SHEET, run_names, chart_rows_per_run, 'B', 'C', 'Velocidade Comparativa', 'Velocidade (km/h)')
+        charts['rpm'] = _create_timeseries_chart(workbook, CHART_DATA_SHEET, run_names, chart_rows_per_run, 'B', 'D', 'RPM Comparativo', 'RPM')
+        charts['acel'] = _create_timeseries_chart(workbook, CHART_DATA_SHEET, run_names, chart_rows_per_run, 'B', 'E', 'Aceleração Comparativa', 'Aceleração (m/s²)')
+        charts['dist'] = _create_timeseries_chart(workbook, CHART_DATA_SHEET, run_names, chart_rows_per_run, 'B', 'F', 'Distância Percorrida', 'Distância (m)')
+        charts['rpm_vel'] = _create_scatter_chart(workbook, CHART_DATA_SHEET, run_names, chart_rows_per_run, 'C', 'D', 'Relação RPM x Velocidade', 'Velocidade (km/h)', 'RPM')
+
+        # -- Montar o Dashboard --
+        sheet3.write('A1', 'Dashboard de Análise de Desempenho', workbook.add_format({'bold': True, 'font_size': 20, 'font_color': '#333333'}))
+        sheet3.insert_chart('B2',  charts['vel'])
+        sheet3.insert_chart('L2',  charts['rpm'])
+        sheet3.insert_chart('B23', charts['acel'])
+        sheet3.insert_chart('L23', charts['dist'])
+        sheet3.insert_chart('B44', charts['rpm_vel'])
+    finally:
+        workbook.close()
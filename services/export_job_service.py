@@ -0,0 +1,156 @@
+# iLogger/services/export_job_service.py
+
+import json
+import os
+import threading
+from config import KEY_RPM_FILT
+from services import (processing_service, figure_service, report_service, excel_export_service, catalog_service,
+                      columnar_service)
+
+# Etapas das exportações, na ordem em que ocorrem
+STAGE_FILTERING = "Filtragem"
+STAGE_STATS = "Estatísticas"
+STAGE_FIGURES = "Figuras"
+STAGE_WRITING = "Escrita"
+STAGE_INDEXING = "Indexação"
+
+
+class JobCancelled(Exception):
+    """Lançada dentro de uma tarefa quando o cancelamento é solicitado."""
+
+
+class JobContext:
+    """
+    Canal entre uma tarefa de exportação e quem a executa: recebe o progresso por etapa e
+    sinaliza o cancelamento, verificado pela tarefa entre etapas e entre runs.
+    `on_progress(etapa, fração)` é chamado na thread da tarefa.
+    """
+    def __init__(self, on_progress=None):
+        self._on_progress = on_progress
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def report(self, stage: str, fraction: float):
+        """Informa o progresso da etapa (0 a 1) e interrompe a tarefa se ela foi cancelada."""
+        self.check()
+        if self._on_progress is not None:
+            self._on_progress(stage, fraction)
+
+    def stage_progress(self, stage: str):
+        """Callback (concluídos, total) para os serviços, convertido em progresso da etapa."""
+        return lambda done, total: self.report(stage, done / total if total else 1.0)
+
+
+# --- Etapas Comuns ---
+
+def _unique_settings(settings_list: list) -> list:
+    unique = {}
+    for settings in settings_list:
+        unique.setdefault(json.dumps(settings, sort_keys=True), settings)
+    return list(unique.values())
+
+def _filter_runs(context: JobContext, runs: list, settings_list: list):
+    """
+    Calcula (ou encontra no cache) o filtro de cada run para as configurações da exportação.
+    Usa o cache de filtro sem alterar os canais atuais das runs, que a interface continua usando.
+    """
+    settings_list = _unique_settings(settings_list)
+    report = context.stage_progress(STAGE_FILTERING)
+    total = len(runs) * len(settings_list)
+    done = 0
+    for settings in settings_list:
+        for run in runs:
+            run.get_channel(KEY_RPM_FILT, settings)
+            done += 1
+            report(done, total)
+
+def _statistics(context: JobContext, runs: list, filter_settings: dict):
+    context.report(STAGE_STATS, 0.0)
+    metrics_df, variations_df = processing_service.generate_statistics(runs, filter_settings)
+    context.report(STAGE_STATS, 1.0)
+    return metrics_df, variations_df
+
+def _discard_partial(save_path: str):
+    """Remove o arquivo incompleto deixado por uma exportação interrompida."""
+    try:
+        os.remove(save_path)
+    except OSError:
+        pass
+
+
+# --- Tarefas de Exportação ---
+
+def export_pdf_report(context: JobContext, runs: list, save_path: str, setup_info: dict, observations: str,
+                      filter_settings: dict, figure_settings: dict = None) -> str:
+    """Gera o relatório PDF: filtragem, estatísticas, figuras (fora da tela) e escrita."""
+    figure_settings = figure_settings or {}
+    _filter_runs(context, runs, [filter_settings, *figure_settings.values()])
+    metrics_df, variations_df = _statistics(context, runs, filter_settings)
+
+    context.report(STAGE_FIGURES, 0.0)
+    specs = figure_service.build_figure_specs(runs, filter_settings, metrics_df, figure_settings)
+    figures = figure_service.render_figures(specs, progress=context.stage_progress(STAGE_FIGURES))
+
+    context.report(STAGE_WRITING, 0.0)
+    try:
+        report_service.generate_pdf_report(save_path, setup_info, observations, filter_settings,
+                                           metrics_df, variations_df, figures)
+    except Exception:
+        _discard_partial(save_path)
+        raise
+    context.report(STAGE_WRITING, 1.0)
+    return f"Relatório PDF salvo em: {save_path}"
+
+def export_excel_dashboard(context: JobContext, runs: list, save_path: str, setup_info: dict,
+                           filter_settings: dict, expression_channels: dict = None) -> str:
+    """Gera o dashboard Excel: filtragem, estatísticas e escrita run a run."""
+    _filter_runs(context, runs, [filter_settings])
+    metrics_df, variations_df = _statistics(context, runs, filter_settings)
+
+    context.report(STAGE_WRITING, 0.0)
+    try:
+        excel_export_service.write_dashboard_workbook(
+            runs, save_path, metrics_df, variations_df, filter_settings, setup_info, expression_channels,
+            progress=context.stage_progress(STAGE_WRITING),
+        )
+    except Exception:
+        _discard_partial(save_path)
+        raise
+    return f"Dashboard Excel salvo em: {save_path}"
+
+def export_columnar(context: JobContext, runs: list, save_path: str, filter_settings: dict, setup_info: dict) -> str:
+    """Exporta os canais das runs para .npz/.h5/.arrow: filtragem e escrita run a run."""
+    _filter_runs(context, runs, [filter_settings])
+
+    context.report(STAGE_WRITING, 0.0)
+    try:
+        columnar_service.export_runs(runs, save_path, filter_settings, setup_info,
+                                     progress=context.stage_progress(STAGE_WRITING))
+    except Exception:
+        _discard_partial(save_path)
+        raise
+    return f"Dados exportados para {save_path}"
+
+
+# --- Outras Tarefas ---
+
+def index_catalog(context: JobContext, db_path: str, directories: list, filter_settings: dict = None) -> str:
+    """Atualiza o catálogo de RUNs com os diretórios (incremental, CSVs novos em paralelo)."""
+    context.report(STAGE_INDEXING, 0.0)
+    report = catalog_service.index_directories(db_path, directories, filter_settings,
+                                               progress=context.stage_progress(STAGE_INDEXING))
+    message = (f"Catálogo atualizado: {report['added']} novas, {report['updated']} atualizadas, "
+               f"{report['unchanged']} sem alteração, {report['removed']} removidas.")
+    if report['errors']:
+        message += f" {len(report['errors'])} arquivos com erro."
+    return message
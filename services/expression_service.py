@@ -0,0 +1,175 @@
+# iLogger/services/expression_service.py
+
+import ast
+import re
+import numpy as np
+from data.run_data import RunData
+from config import *
+
+# Apelidos curtos para os canais calculados (nomes completos podem ser usados entre chaves)
+EXPRESSION_ALIASES = {
+    't': KEY_TEMPO_S,
+    'rpm': KEY_RPM_FILT,
+    'vel': KEY_VEL_KMH_FILT,
+    'acel': KEY_ACEL_MS2_FILT,
+    'dist': KEY_DIST_M,
+    'rpm_bruto': KEY_RPM_RAW,
+    'vel_bruta': KEY_VEL_KMH_RAW,
+}
+
+# Funções permitidas nas expressões (todas vetorizadas)
+EXPRESSION_FUNCTIONS = {
+    'abs': np.abs, 'sqrt': np.sqrt, 'exp': np.exp, 'log': np.log, 'log10': np.log10,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'arctan2': np.arctan2,
+    'minimum': np.minimum, 'maximum': np.maximum, 'clip': np.clip, 'where': np.where,
+    'gradient': np.gradient, 'cumsum': np.cumsum,
+}
+# Quantidade exata de argumentos exigida por função (where com um argumento retorna índices)
+EXPRESSION_FUNCTION_ARGS = {'where': 3}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+# Nomes entre chaves, ex: {Velocidade (Km/h)}, para canais cujo nome não é um identificador
+_BRACED_NAME = re.compile(r'\{([^{}]+)\}')
+
+
+class CompiledExpression:
+    """
+    Expressão validada e compilada. `variables` lista os canais usados (já resolvidos
+    para as chaves/colunas reais); `evaluate` recebe {canal: array} e avalia de forma vetorizada.
+    """
+    def __init__(self, text: str, code, variables: dict):
+        self.text = text
+        self._code = code
+        # identificador na expressão -> nome do canal
+        self.variables = variables
+
+    def evaluate(self, arrays: dict) -> np.ndarray:
+        namespace = dict(EXPRESSION_FUNCTIONS)
+        for identifier, channel in self.variables.items():
+            namespace[identifier] = arrays[channel]
+        try:
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                result = eval(self._code, {'__builtins__': {}}, namespace)
+            result = np.array(result, dtype=float)
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise ValueError(f"Erro ao avaliar a expressão '{self.text}': {e}")
+        # Divisões por zero e afins viram NaN (lacunas no gráfico) em vez de infinitos
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+def _float_operands(node):
+    """
+    Converte as constantes inteiras usadas como operandos em float: com inteiros, o Python
+    calcularia potências como 9**9**9 em precisão arbitrária e travaria a interface; em float
+    o resultado estoura rápido (vira erro ou NaN). Argumentos de função continuam inteiros.
+    """
+    operands = (node.left, node.right) if isinstance(node, ast.BinOp) else (node.operand,)
+    for operand in operands:
+        if isinstance(operand, ast.Constant) and type(operand.value) is int:
+            try:
+                operand.value = float(operand.value)
+            except OverflowError:
+                raise ValueError("Constante grande demais na expressão.")
+
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Valida e compila a expressão. Aceita números, operadores aritméticos e de comparação,
+    as funções de EXPRESSION_FUNCTIONS, os apelidos de EXPRESSION_ALIASES, colunas do CSV
+    e nomes de canais entre chaves. Lança ValueError se a expressão for inválida.
+    """
+    braced = {}
+    def replace_braced(match):
+        identifier = f"_canal{len(braced)}"
+        braced[identifier] = match.group(1).strip()
+        return identifier
+    source = _BRACED_NAME.sub(replace_braced, text.strip())
+    if not source:
+        raise ValueError("Expressão vazia.")
+
+    try:
+        tree = ast.parse(source, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Expressão inválida: {e.msg}.")
+
+    variables = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Construção não permitida na expressão: {type(node).__name__}.")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("Apenas constantes numéricas são permitidas.")
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            _float_operands(node)
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in EXPRESSION_FUNCTIONS or node.keywords:
+                raise ValueError("Chamada de função não permitida na expressão.")
+            expected_args = EXPRESSION_FUNCTION_ARGS.get(node.func.id)
+            if expected_args is not None and len(node.args) != expected_args:
+                raise ValueError(f"A função '{node.func.id}' exige {expected_args} argumentos.")
+        if isinstance(node, ast.Name) and node.id not in EXPRESSION_FUNCTIONS:
+            variables[node.id] = braced.get(node.id, EXPRESSION_ALIASES.get(node.id, node.id))
+
+    return CompiledExpression(text, compile(tree, '<expressao>', 'eval'), variables)
+
+
+def _channel_on_time_base(run: RunData, name: str, filter_settings: dict, definitions: dict, stack: tuple) -> np.ndarray:
+    """Valores de um canal usado numa expressão, sempre na base de tempo `time_s` da run."""
+    if name in definitions:
+        return evaluate_channel(run, name, definitions, filter_settings, stack)
+    if name == KEY_TEMPO_S:
+        return run.aligned_time_s
+    if run.is_raw_column(name):
+        return run.get_grouped_column(name)
+    values = run.get_channel(name, filter_settings)
+    if values.size == 0:
+        raise ValueError(f"Canal desconhecido na expressão: '{name}'.")
+    return values
+
+
+def evaluate_channel(run: RunData, name: str, definitions: dict, filter_settings: dict, _stack: tuple = ()) -> np.ndarray:
+    """
+    Avalia o canal calculado `name` (definido em `definitions`: nome -> expressão) para a run.
+    O resultado é guardado junto à entrada do cache de filtro da run, sendo reaproveitado
+    enquanto a expressão, o filtro e o alinhamento não mudarem. Expressões podem usar outros
+    canais calculados; referências circulares lançam ValueError.
+    """
+    if name in _stack:
+        raise ValueError(f"Referência circular no canal calculado '{name}'.")
+    text = definitions[name]
+    if run.time_s.size == 0:
+        return np.array([])
+
+    # Outros canais calculados referenciados também entram na chave do cache
+    cache_key = (text, run.time_offset_s, tuple(sorted(definitions.items())))
+    cached = run.get_derived(filter_settings, 'expressions', cache_key)
+    if cached is not None:
+        return cached
+
+    compiled = compile_expression(text)
+    arrays = {
+        channel: _channel_on_time_base(run, channel, filter_settings, definitions, _stack + (name,))
+        for channel in set(compiled.variables.values())
+    }
+    result = compiled.evaluate(arrays)
+    if result.ndim == 0:
+        result = np.full(run.time_s.size, float(result))
+    if result.shape != run.time_s.shape:
+        raise ValueError(f"A expressão '{text}' deve resultar em um valor por amostra "
+                         f"({run.time_s.size}), mas resultou em {result.shape}.")
+    result.flags.writeable = False
+    return run.store_derived(filter_settings, 'expressions', cache_key, result)
+
+
+def evaluate_channels(run: RunData, definitions: dict, filter_settings: dict) -> dict:
+    """Avalia todos os canais calculados para a run; canais com erro são omitidos."""
+    results = {}
+    for name in definitions:
+        try:
+            results[name] = evaluate_channel(run, name, definitions, filter_settings)
+        except ValueError:
+            continue
+    return results
@@ -0,0 +1,56 @@
+# iLogger/services/figure_renderer.py
+
+import io
+import math
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from config import REPORT_FIGURE_SIZE_IN, REPORT_FIGURE_DPI
+
+# Executado nos processos de trabalho do relatório: importa só o matplotlib (Agg), sem Qt,
+# pandas ou scipy, para que cada processo inicie rápido.
+
+LEGEND_ENTRIES_PER_COLUMN = 15  # Acima disso a legenda sai dos eixos
+
+def _draw_lines(fig, spec):
+    ax = fig.add_subplot()
+    for label, x, y, run_index, is_raw in spec['series']:
+        # Filtrado e bruto da mesma run compartilham a cor; o bruto fica translúcido
+        color = f"C{run_index % 10}"
+        ax.plot(x, y, color=color, linewidth=0.6 if is_raw else 1.2, alpha=0.35 if is_raw else 1.0,
+                label=f"_{label}" if is_raw else label)  # '_' omite o bruto da legenda
+    ax.set_title(spec['title'])
+    ax.set_xlabel(spec['x_label'])
+    ax.set_ylabel(spec['y_label'])
+    ax.grid(True, alpha=0.3)
+    num_entries = sum(not is_raw for *_, is_raw in spec['series'])
+    if num_entries > LEGEND_ENTRIES_PER_COLUMN:
+        # Muitas runs: a legenda vai para fora dos eixos, em colunas
+        ax.legend(fontsize='xx-small', ncol=math.ceil(num_entries / (2 * LEGEND_ENTRIES_PER_COLUMN)),
+                  loc='upper left', bbox_to_anchor=(1.01, 1.0))
+    elif num_entries:
+        ax.legend(fontsize='x-small', loc='best')
+
+def _draw_bars(fig, spec):
+    labels = spec['labels']
+    metrics = spec['metrics']
+    num_cols = 2
+    num_rows = math.ceil(len(metrics) / num_cols)
+    colors = [f"C{i % 10}" for i in range(len(labels))]
+    for i, (name, values) in enumerate(metrics.items(), start=1):
+        ax = fig.add_subplot(num_rows, num_cols, i)
+        ax.bar(range(len(labels)), values, color=colors, width=0.6)
+        ax.set_title(name, fontsize='small')
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, fontsize='xx-small', rotation=30 if any(len(l) > 15 for l in labels) else 0)
+
+def render_figure(spec: dict) -> bytes:
+    """Renderiza uma especificação com o Agg (sem Qt nem pyplot) e retorna o PNG em bytes."""
+    fig = Figure(figsize=REPORT_FIGURE_SIZE_IN, dpi=REPORT_FIGURE_DPI, layout='constrained')
+    FigureCanvasAgg(fig)
+    if spec['kind'] == 'bars':
+        _draw_bars(fig, spec)
+    else:
+        _draw_lines(fig, spec)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
@@ -0,0 +1,117 @@
+# iLogger/services/figure_service.py
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from data.run_data import RunData
+from services.figure_renderer import render_figure
+from config import *
+
+# Figuras do relatório: chave -> (título, rótulo do eixo Y, canal filtrado, canal bruto sobreposto)
+TIME_SERIES_FIGURES = {
+    'rotacao': ("Rotação", "RPM", KEY_RPM_FILT, KEY_RPM_RAW),
+    'velocidade': ("Velocidade", "Velocidade (Km/h)", KEY_VEL_KMH_FILT, KEY_VEL_KMH_RAW),
+    'aceleracao': ("Aceleração", "Aceleração (m/s²)", KEY_ACEL_MS2_FILT, None),
+    'distancia': ("Distância", "Distância (m)", KEY_DIST_M, None),
+}
+FIGURE_COMPARISON = 'comparativo'
+FIGURE_RELATION = 'relacao'
+REPORT_FIGURE_KEYS = [FIGURE_COMPARISON, *TIME_SERIES_FIGURES, FIGURE_RELATION]
+
+
+# --- Montagem das Especificações (processo principal) ---
+
+def _serve(run: RunData, y_key: str, filter_settings: dict, x_key: str = KEY_TEMPO_S):
+    """Pontos da curva a partir da pirâmide LOD em cache (picos preservados), ou None."""
+    pyramid = run.get_lod_pyramid(y_key, filter_settings, x_key=x_key)
+    if pyramid is None:
+        return None
+    x, y = pyramid.serve(max_points=REPORT_MAX_POINTS_PER_SERIES)
+    if x_key == KEY_TEMPO_S and run.time_offset_s:
+        x = x - run.time_offset_s
+    return np.array(x), np.array(y)
+
+def build_figure_specs(runs: list[RunData], filter_settings: dict, metrics_df: pd.DataFrame = None,
+                       figure_settings: dict = None) -> dict:
+    """
+    Monta, a partir dos arrays em cache das runs, as especificações das figuras do relatório:
+    dicts simples (só arrays e textos) que podem ser enviados a outros processos.
+    `figure_settings` (chave da figura -> configurações) substitui `filter_settings` por figura.
+    """
+    figure_settings = figure_settings or {}
+
+    def settings_for(key):
+        return figure_settings.get(key, filter_settings)
+
+    specs = {}
+    if metrics_df is not None and not metrics_df.empty:
+        specs[FIGURE_COMPARISON] = {
+            'kind': 'bars', 'title': "Comparativo de Métricas",
+            'labels': [str(name) for name in metrics_df.index],
+            'metrics': {str(col): metrics_df[col].to_numpy(dtype=float) for col in metrics_df.columns},
+        }
+
+    for key, (title, y_label, filt_key, raw_key) in TIME_SERIES_FIGURES.items():
+        settings = settings_for(key)
+        series = []
+        for i, run in enumerate(runs):
+            filtered = _serve(run, filt_key, settings)
+            if filtered is not None:
+                series.append((f"Filt - {run.file_name}" if raw_key else run.file_name, *filtered, i, False))
+            raw = _serve(run, raw_key, settings) if raw_key else None
+            if raw is not None:
+                series.append((f"Raw - {run.file_name}", *raw, i, True))
+        specs[key] = {'kind': 'lines', 'title': title, 'x_label': "Tempo (s)", 'y_label': y_label, 'series': series}
+
+    settings = settings_for(FIGURE_RELATION)
+    series = []
+    for i, run in enumerate(runs):
+        points = _serve(run, KEY_RPM_FILT, settings, x_key=KEY_VEL_KMH_FILT)
+        if points is not None:
+            series.append((run.file_name, *points, i, False))
+    specs[FIGURE_RELATION] = {'kind': 'lines', 'title': "Relação RPM x Velocidade",
+                              'x_label': "Velocidade (Km/h)", 'y_label': "RPM", 'series': series}
+    return specs
+
+
+
+# --- Renderização ---
+
+def render_figures(specs: dict, max_workers: int = REPORT_RENDER_MAX_WORKERS, progress=None) -> dict:
+    """
+    Renderiza as figuras em paralelo num pool de processos ('spawn', seguro com a GUI aberta).
+    Retorna chave -> PNG em bytes. Com menos de REPORT_RENDER_MIN_POOL_WORKERS processos
+    possíveis (poucos núcleos ou max_workers=0) renderiza no próprio processo, onde o
+    custo de iniciar os processos não compensa.
+    `progress(concluídas, total)` é chamado a cada figura pronta.
+    """
+    figures = {}
+    total = len(specs)
+    workers = min(max_workers, total, os.cpu_count() or 1)
+    if workers < REPORT_RENDER_MIN_POOL_WORKERS:
+        for key, spec in specs.items():
+            figures[key] = render_figure(spec)
+            if progress is not None:
+                progress(len(figures), total)
+        return figures
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(render_figure, spec): key for key, spec in specs.items()}
+        try:
+            for future in as_completed(futures):
+                figures[futures[future]] = future.result()
+                if progress is not None:
+                    progress(len(figures), total)
+        except BaseException:
+            # Interrompido (ex: cancelamento): descarta as figuras que ainda não começaram
+            for future in futures:
+                future.cancel()
+            raise
+    return {key: figures[key] for key in specs}
+
+def render_report_figures(runs: list[RunData], filter_settings: dict, metrics_df: pd.DataFrame = None,
+                          figure_settings: dict = None, max_workers: int = REPORT_RENDER_MAX_WORKERS) -> dict:
+    """Atalho: monta as especificações a partir das runs e as renderiza."""
+    return render_figures(build_figure_specs(runs, filter_settings, metrics_df, figure_settings), max_workers)
@@ -0,0 +1,332 @@
+# iLogger/services/live_service.py
+
+"""
+Acompanhamento ao vivo de uma RUN (sem Qt): os canais brutos crescem em grupos completos
+de RAW_SAMPLES_PER_GROUP linhas à medida que as amostras chegam, e os canais filtrados são
+atualizados de forma incremental, com custo constante por atualização:
+
+- estágio causal (`sosfilt`/`lfilter` com estado `zi`), exibido assim que a amostra chega;
+- refinamento de fase zero (`compute_filtered_channels`) sobre os últimos
+  LIVE_REFINE_WINDOW grupos, que converge para o resultado da análise completa.
+
+A origem das amostras fica separada (ex: CsvTailSource, que lê só os bytes acrescentados
+ao CSV que o logger está gravando, ou as origens de telemetry_service). Para recepção
+contínua, LiveRun pode guardar só as últimas amostras num anel de tamanho fixo.
+"""
+
+import io
+import os
+import numpy as np
+import pandas as pd
+from scipy import signal
+from data.run_data import RunData, compute_filtered_channels, group_raw_samples, FILTER_ENTRY_FIELDS
+from config import *
+
+RAW_FIELDS = ('time_s', 'rpm_raw', 'velocity_raw_kmh')
+CAUSAL_FIELDS = ('rpm_causal', 'velocity_causal_kmh')
+_INITIAL_CAPACITY = 4096
+
+
+# --- Estágio Causal ---
+
+class CausalFilter:
+    """
+    Versão causal do filtro configurado, com estado entre chamadas (`zi`), para um canal.
+    Butterworth, Chebyshev e Bessel usam seções de segunda ordem (`sosfilt`); a média
+    móvel usa `lfilter`. Savitzky-Golay e mediana não têm versão causal útil:
+    `available` é False e o canal ao vivo usa apenas o refinamento.
+    """
+    def __init__(self, filter_settings: dict):
+        filter_type = filter_settings.get('type', 'butterworth')
+        self.sos, self.b = None, None
+        if filter_type in ('savitzky_golay', 'median'):
+            pass
+        elif filter_type == 'moving_average':
+            window = filter_settings.get('moving_avg_window', MOVING_AVG_WINDOW)
+            self.b = np.ones(window) / window
+        elif filter_type == 'chebyshev_type_i':
+            self.sos = signal.cheby1(filter_settings.get('cheby1_order', CHEBY1_ORDER),
+                                     filter_settings.get('cheby1_rp', CHEBY1_RP),
+                                     filter_settings.get('cheby1_cutoff', CHEBY1_CUTOFF), btype='low', output='sos')
+        elif filter_type == 'bessel':
+            self.sos = signal.bessel(filter_settings.get('bessel_order', BESSEL_ORDER),
+                                     filter_settings.get('bessel_cutoff', BESSEL_CUTOFF), btype='low',
+                                     norm='phase', output='sos')
+        else: # Butterworth (padrão, como em compute_filtered_channels)
+            self.sos = signal.butter(filter_settings.get('butter_order', BUTTERWORTH_ORDER),
+                                     filter_settings.get('butter_cutoff', BUTTERWORTH_CUTOFF), output='sos')
+        self.zi = None
+
+    @property
+    def available(self) -> bool:
+        return self.sos is not None or self.b is not None
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """Filtra o próximo trecho do canal; o estado inicial parte do primeiro valor (sem degrau)."""
+        if not self.available or x.size == 0:
+            return x.copy()
+        if self.sos is not None:
+            if self.zi is None:
+                self.zi = signal.sosfilt_zi(self.sos) * x[0]
+            y, self.zi = signal.sosfilt(self.sos, x, zi=self.zi)
+        else:
+            if self.zi is None:
+                self.zi = signal.lfilter_zi(self.b, 1.0) * x[0]
+            y, self.zi = signal.lfilter(self.b, 1.0, x, zi=self.zi)
+        return y
+
+
+# --- Armazenamento ---
+
+class SampleBuffer:
+    """
+    Canais de mesmo comprimento indexados pela posição absoluta da amostra.
+    Sem `capacity`, os arrays dobram quando enchem (custo amortizado constante) e guardam
+    tudo. Com `capacity`, é um anel pré-alocado com as últimas `capacity` amostras:
+    cada valor é gravado em duas cópias (i e i + capacity), de modo que o fim do anel
+    é sempre uma fatia contígua (visão sem cópia, como no modo que cresce).
+    """
+    def __init__(self, fields: tuple, capacity: int = None):
+        self.capacity = capacity
+        self.size = 0  # Total de amostras já gravadas (posição absoluta do fim)
+        length = 2 * capacity if capacity else _INITIAL_CAPACITY
+        self._arrays = {field: np.zeros(length) for field in fields}
+
+    @property
+    def first(self) -> int:
+        """Posição absoluta da amostra mais antiga ainda guardada."""
+        return max(0, self.size - self.capacity) if self.capacity else 0
+
+    def _grow(self, size: int):
+        length = len(next(iter(self._arrays.values())))
+        if size <= length:
+            return
+        while length < size:
+            length *= 2
+        for field, array in self._arrays.items():
+            grown = np.zeros(length)
+            grown[:self.size] = array[:self.size]
+            self._arrays[field] = grown
+
+    def extend(self, count: int):
+        """Reserva `count` amostras novas no fim (preenchidas depois com `write`)."""
+        if not self.capacity:
+            self._grow(self.size + count)
+        self.size += count
+
+    def write(self, field: str, start: int, values: np.ndarray):
+        """Grava `values` a partir da posição absoluta `start` (o que já saiu do anel é ignorado)."""
+        values = np.asarray(values)
+        if start < self.first:
+            values, start = values[self.first - start:], self.first
+        end = start + len(values)
+        array = self._arrays[field]
+        if not self.capacity:
+            array[start:end] = values
+            return
+        index = np.arange(start, end) % self.capacity
+        array[index] = values
+        array[index + self.capacity] = values
+
+    def tail(self, field: str, start: int) -> np.ndarray:
+        """Visão sem cópia do canal da posição absoluta `start` até o fim."""
+        start = max(start, self.first)
+        array = self._arrays[field]
+        if not self.capacity:
+            return array[start:self.size]
+        end = self.size % self.capacity + self.capacity
+        return array[end - (self.size - start):end]
+
+    def value(self, field: str, position: int) -> float:
+        return self._arrays[field][position % self.capacity if self.capacity else position]
+
+
+# --- Run ao Vivo ---
+
+class LiveRun:
+    """
+    Run que cresce durante a gravação ou a recepção. `window` devolve visões sem cópia do
+    fim da run. Com `max_samples`, só as últimas amostras são guardadas (anel de tamanho
+    fixo, para recepção contínua por telemetria); as posições continuam absolutas.
+    """
+    def __init__(self, name: str, filter_settings: dict, file_path: str = None, max_samples: int = None):
+        self.name = name
+        self.file_path = file_path or name
+        self.filter_settings = dict(filter_settings)
+        self.max_samples = max_samples
+        self.reset()
+
+    def reset(self):
+        """Descarta as amostras (ex: o logger reiniciou o arquivo)."""
+        self._samples = SampleBuffer(RAW_FIELDS + CAUSAL_FIELDS + FILTER_ENTRY_FIELDS, self.max_samples)
+        # Linhas que ainda não completam um grupo
+        self._pending_f1 = np.empty(0)
+        self._pending_f2 = np.empty(0)
+        self._causal = {field: CausalFilter(self.filter_settings) for field in CAUSAL_FIELDS}
+        self._last_distance = 0.0
+
+    @property
+    def size(self) -> int:
+        """Total de grupos recebidos (inclusive os que já saíram do anel)."""
+        return self._samples.size
+
+    @property
+    def duration_s(self) -> float:
+        return self.size * RAW_SAMPLE_PERIOD_S * RAW_SAMPLES_PER_GROUP
+
+    def append_samples(self, f1: np.ndarray, f2: np.ndarray) -> int:
+        """
+        Acrescenta linhas do logger (contagens f1/f2). Só grupos completos viram amostras;
+        o resto fica pendente até a próxima chamada. Retorna o número de grupos novos.
+        """
+        f1 = np.concatenate((self._pending_f1, np.asarray(f1, dtype=float)))
+        f2 = np.concatenate((self._pending_f2, np.asarray(f2, dtype=float)))
+        complete = (len(f1) // RAW_SAMPLES_PER_GROUP) * RAW_SAMPLES_PER_GROUP
+        self._pending_f1, self._pending_f2 = f1[complete:], f2[complete:]
+        rpm_raw, velocity_raw_kmh = group_raw_samples(f1[:complete], f2[:complete])
+        added = rpm_raw.size
+        if added == 0:
+            return 0
+
+        samples = self._samples
+        start = samples.size
+        samples.extend(added)
+        group_period_s = RAW_SAMPLE_PERIOD_S * RAW_SAMPLES_PER_GROUP
+        samples.write('time_s', start, np.arange(start, start + added) * group_period_s)
+        samples.write('rpm_raw', start, rpm_raw)
+        samples.write('velocity_raw_kmh', start, velocity_raw_kmh)
+        samples.write('rpm_causal', start, self._causal['rpm_causal'].process(rpm_raw))
+        samples.write('velocity_causal_kmh', start, self._causal['velocity_causal_kmh'].process(velocity_raw_kmh))
+        self._refine(start)
+        return added
+
+    def _refine(self, first_new: int):
+        """
+        Refiltra com fase zero os últimos grupos e grava o resultado a partir de `write_start`.
+        Os LIVE_REFINE_GUARD grupos iniciais da janela só servem de contexto (o início da
+        janela tem transiente de borda), exceto quando a janela começa no início da run.
+        """
+        samples = self._samples
+        n, first = samples.size, samples.first
+        write_start = max(first, min(first_new, n - (LIVE_REFINE_WINDOW - LIVE_REFINE_GUARD)))
+        window_start = max(first, write_start - LIVE_REFINE_GUARD)
+        time_s = samples.tail('time_s', window_start)
+        rpm_raw = samples.tail('rpm_raw', window_start)
+        velocity_raw_kmh = samples.tail('velocity_raw_kmh', window_start)
+        try:
+            fields = compute_filtered_channels(time_s, rpm_raw, velocity_raw_kmh, self.filter_settings)
+        except ValueError:
+            fields = None  # Poucos grupos para o filtro de fase zero
+        if fields is None:
+            velocity_ms = velocity_raw_kmh * (5 / 18)
+            fields = {'rpm_filtered': rpm_raw, 'velocity_filtered_ms': velocity_ms,
+                      'velocity_filtered_kmh': velocity_raw_kmh,
+                      'acceleration_filtered_ms2': np.zeros_like(time_s), 'jerk_ms3': np.zeros_like(time_s)}
+
+        # Distância costurada à parte já calculada (a da janela começaria do zero)
+        if write_start > first:
+            base = samples.value('distance_m', write_start - 1)
+            dt = np.diff(samples.tail('time_s', write_start - 1))
+        else:
+            # Início da run, ou o anel já descartou a amostra anterior
+            if write_start == 0:
+                base = 0.0
+            else:
+                base = samples.value('distance_m', write_start) if write_start < first_new else self._last_distance
+            dt = np.diff(samples.tail('time_s', write_start), prepend=samples.value('time_s', write_start))
+
+        skip = write_start - window_start
+        for field in FILTER_ENTRY_FIELDS:
+            if field != 'distance_m':
+                samples.write(field, write_start, fields[field][skip:])
+        samples.write('distance_m', write_start, base + np.cumsum(fields['velocity_filtered_ms'][skip:] * dt))
+        self._last_distance = samples.value('distance_m', n - 1)
+
+        # Sem estágio causal (Savitzky-Golay, mediana), o canal ao vivo é o refinado
+        for causal_field, refined_field in (('rpm_causal', 'rpm_filtered'), ('velocity_causal_kmh', 'velocity_filtered_kmh')):
+            if not self._causal[causal_field].available:
+                samples.write(causal_field, write_start, fields[refined_field][skip:])
+
+    def set_filter_settings(self, filter_settings: dict):
+        """Troca o filtro: refaz os estágios causal e refinado sobre as amostras guardadas (uma vez)."""
+        self.filter_settings = dict(filter_settings)
+        self._causal = {field: CausalFilter(self.filter_settings) for field in CAUSAL_FIELDS}
+        if self.size == 0:
+            return
+        samples, first = self._samples, self._samples.first
+        samples.write('rpm_causal', first, self._causal['rpm_causal'].process(samples.tail('rpm_raw', first)))
+        samples.write('velocity_causal_kmh', first,
+                      self._causal['velocity_causal_kmh'].process(samples.tail('velocity_raw_kmh', first)))
+        self._refine(first)
+
+    def channel(self, field: str) -> np.ndarray:
+        """Canal com todas as amostras guardadas (visão; não guarde entre atualizações)."""
+        return self._samples.tail(field, self._samples.first)
+
+    def window(self, seconds: float) -> dict:
+        """Visões dos canais cobrindo os últimos `seconds` segundos."""
+        group_period_s = RAW_SAMPLE_PERIOD_S * RAW_SAMPLES_PER_GROUP
+        start = self.size - int(np.ceil(seconds / group_period_s))
+        return {field: self._samples.tail(field, start) for field in RAW_FIELDS + CAUSAL_FIELDS + FILTER_ENTRY_FIELDS}
+
+    def to_run_data(self) -> RunData:
+        """
+        Cópia das amostras guardadas, para a análise completa (o tempo recomeça do zero se
+        o anel já descartou o início). O filtro da análise é recalculado com fase zero sobre
+        a run inteira (o refinamento ao vivo é só aproximado nas emendas).
+        """
+        time_s, rpm_raw, velocity_raw_kmh = (self.channel(field).copy() for field in RAW_FIELDS)
+        return RunData.from_arrays(self.name, time_s - time_s[0] if time_s.size else time_s, rpm_raw,
+                                   velocity_raw_kmh, file_path=self.file_path)
+
+
+# --- Origem: CSV em Gravação ---
+
+class CsvTailSource:
+    """
+    Lê apenas os bytes acrescentados ao CSV desde a última leitura. A última linha só é
+    processada quando termina em quebra de linha (o logger pode estar no meio dela).
+    Se o arquivo encolher, o logger o recriou: a leitura recomeça do início.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._offset = 0
+        self._header = None
+        self._partial = b''
+
+    def read_new(self) -> (np.ndarray, np.ndarray, bool):
+        """Retorna (f1, f2, reiniciado) com as linhas completas novas."""
+        restarted = False
+        size = os.path.getsize(self.path)
+        if size < self._offset:
+            self._offset, self._header, self._partial = 0, None, b''
+            restarted = True
+        if size == self._offset:
+            return np.empty(0), np.empty(0), restarted
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        self._offset += len(chunk)
+        data = self._partial + chunk
+        end = data.rfind(b'\n') + 1
+        self._partial = data[end:]
+        data = data[:end]
+
+        if self._header is None:
+            header_end = data.find(b'\n') + 1
+            if header_end == 0:
+                self._partial = data + self._partial
+                return np.empty(0), np.empty(0), restarted
+            self._header, data = data[:header_end], data[header_end:]
+            columns = self._header.decode('utf-8', errors='replace').strip().split(',')
+            if not {'f1', 'f2'}.issubset(col.strip() for col in columns):
+                raise ValueError(f"Arquivo {self.name} inválido: colunas 'f1' e 'f2' são obrigatórias.")
+        if not data.strip():
+            return np.empty(0), np.empty(0), restarted
+
+        df = pd.read_csv(io.BytesIO(self._header + data), engine='c', usecols=['f1', 'f2'])
+        f1 = pd.to_numeric(df['f1'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        f2 = pd.to_numeric(df['f2'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        return f1, f2, restarted
@@ -1,35 +1,80 @@
 # iLogger/services/processing_service.py
 
 import pandas as pd
-from data.run_data import RunData
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from data.run_data import RunData, FILTER_ENTRY_FIELDS
+from services import columnar_service
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from config import *
 
+def _load_path(path: str) -> list[RunData]:
+    """Carrega um CSV de RUN ou todas as runs de uma exportação colunar (.npz/.h5/.arrow)."""
+    if columnar_service.is_columnar_file(path):
+        return columnar_service.load_runs(path)
+    return [RunData(path)]
+
 def process_run_files(file_paths: list) -> (list[RunData], list[str]):
     """
     Processa uma lista de arquivos de RUN em paralelo para acelerar a inicialização.
     Utiliza um ThreadPoolExecutor para carregar e realizar os cálculos brutos
-    de múltiplos arquivos simultaneamente.
+    de múltiplos arquivos simultaneamente. Exportações colunares entram com todas as
+    suas runs, já filtradas.
     """
-    runs = []
+    loaded = {}
     errors = []
 
     # Otimização: Usa um pool de threads para processar arquivos em paralelo.
     with ThreadPoolExecutor() as executor:
         # Mapeia cada future (operação assíncrona) ao seu respectivo path de arquivo.
-        future_to_path = {executor.submit(RunData, path): path for path in file_paths}
+        future_to_path = {executor.submit(_load_path, path): path for path in file_paths}
         
         # Coleta os resultados à medida que são concluídos.
         for future in as_completed(future_to_path):
             path = future_to_path[future]
             try:
-                run = future.result()
-                runs.append(run)
+                loaded[path] = future.result()
             except Exception as e:
                 errors.append(f"Erro ao processar {path}: {e}")
 
     # Garante que a ordem das runs seja a mesma da seleção de arquivos original.
-    runs.sort(key=lambda r: file_paths.index(r.file_path))
+    runs = [run for path in file_paths for run in loaded.get(path, [])]
+    return runs, errors
+
+def _load_and_filter(path: str, filter_settings: dict) -> dict:
+    """Executado nos processos de trabalho: carrega e filtra a run, retornando só os arrays."""
+    run = RunData(path)
+    run.apply_filters_and_recalculate(filter_settings)
+    return {
+        'file_name': run.file_name,
+        'time_s': run.time_s,
+        'rpm_raw': run.rpm_raw,
+        'velocity_raw_kmh': run.velocity_raw_kmh,
+        'filtered': {field: getattr(run, field) for field in FILTER_ENTRY_FIELDS},
+    }
+
+def process_run_files_multiprocess(file_paths: list, filter_settings: dict, max_workers: int = None) -> (list[RunData], list[str]):
+    """
+    Carrega e filtra os CSVs em paralelo em processos (todos os núcleos por padrão), para
+    lotes grandes sem interface. Cada run volta como arrays e é recriada com
+    RunData.from_arrays, já com o filtro de `filter_settings` no cache. As colunas brutas
+    do CSV não acompanham as runs.
+    """
+    loaded = {}
+    errors = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        future_to_path = {executor.submit(_load_and_filter, path, filter_settings): path for path in file_paths}
+        for future in as_completed(future_to_path):
+            path = future_to_path[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                errors.append(f"Erro ao processar {path}: {e}")
+                continue
+            loaded[path] = RunData.from_arrays(
+                data['file_name'], data['time_s'], data['rpm_raw'], data['velocity_raw_kmh'],
+                filtered=data['filtered'], filter_settings=filter_settings, file_path=path,
+            )
+
+    runs = [loaded[path] for path in file_paths if path in loaded]
     return runs, errors
 
 def generate_statistics(runs: list[RunData], filter_settings: dict) -> (pd.DataFrame, pd.DataFrame):
@@ -39,11 +84,9 @@ def generate_statistics(runs: list[RunData], filter_settings: dict) -> (pd.DataF
     if not runs:
         return pd.DataFrame(), pd.DataFrame()
 
-    all_stats = []
-    for run in runs:
-        # Aplica o filtro desejado e recalcula as estatísticas internas da run.
-        run.apply_filters_and_recalculate(filter_settings)
-        all_stats.append(run.stats)
+    # As estatísticas vêm do cache de filtro sem alterar o estado das runs, o que permite
+    # gerá-las em segundo plano (exportações) enquanto a interface usa outros filtros.
+    all_stats = [run.compute_stats(filter_settings) for run in runs]
 
     if not all_stats:
         return pd.DataFrame(), pd.DataFrame()
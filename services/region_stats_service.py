@@ -0,0 +1,29 @@
+# iLogger/services/region_stats_service.py
+
+import numpy as np
+import pandas as pd
+from data.run_data import RunData
+
+REGION_STATS_COLUMNS = ['Mín', 'Máx', 'Média', 'Integral']
+
+def compute_region_stats(runs: list[RunData], channels: dict, filter_settings: dict, t_start: float, t_end: float) -> pd.DataFrame:
+    """
+    Calcula mín/máx/média/integral de cada canal na janela [t_start, t_end] para todas as runs.
+
+    `channels` mapeia o rótulo exibido para a chave de dados (ex: {"Velocidade": KEY_VEL_KMH_FILT}).
+    As consultas usam os índices pré-computados de cada run, portanto o custo independe
+    do tamanho da janela e pode ser chamado a cada movimento da região.
+    """
+    if not runs or not channels:
+        return pd.DataFrame(columns=REGION_STATS_COLUMNS)
+
+    t_start, t_end = min(t_start, t_end), max(t_start, t_end)
+    multi_channel = len(channels) > 1
+    rows, labels = [], []
+    for label, data_key in channels.items():
+        for run in runs:
+            stats = run.get_region_stats(data_key, filter_settings, t_start, t_end)
+            labels.append(f"{run.file_name} · {label}" if multi_channel else run.file_name)
+            rows.append(stats if stats else dict.fromkeys(REGION_STATS_COLUMNS, np.nan))
+
+    return pd.DataFrame(rows, index=labels, columns=REGION_STATS_COLUMNS)
@@ -0,0 +1,146 @@
+# iLogger/services/resampling_service.py
+
+import json
+from collections import OrderedDict
+import numpy as np
+from data.run_data import RunData
+from services import expression_service
+from config import *
+
+AXIS_TIME = 'time'
+AXIS_DISTANCE = 'distance'
+
+# Cache LRU dos resultados de reamostragem: chave -> (grade, matriz [n_runs, n_pontos])
+_resample_cache = OrderedDict()
+
+def clear_cache():
+    """Descarta todos os resultados de reamostragem em cache."""
+    _resample_cache.clear()
+
+def _cache_get(key):
+    if key in _resample_cache:
+        _resample_cache.move_to_end(key)
+        return _resample_cache[key]
+    return None
+
+def _cache_put(key, grid: np.ndarray, matrix: np.ndarray):
+    # Os arrays em cache são compartilhados entre os widgets, então ficam somente-leitura
+    grid.flags.writeable = False
+    matrix.flags.writeable = False
+    _resample_cache[key] = (grid, matrix)
+    while len(_resample_cache) > RESAMPLE_CACHE_MAX_ENTRIES:
+        _resample_cache.popitem(last=False)
+    return grid, matrix
+
+def _runs_signature(runs: list[RunData]) -> tuple:
+    return tuple((run.file_path, run.time_offset_s, run.time_s.size) for run in runs)
+
+def _channel_values(run: RunData, data_key: str, filter_settings: dict, expressions: dict = None) -> np.ndarray:
+    # Canais calculados e colunas do CSV ficam na base de tempo `time_s`, como os demais canais
+    if expressions and data_key in expressions:
+        return expression_service.evaluate_channel(run, data_key, expressions, filter_settings)
+    if run.is_raw_column(data_key):
+        return run.get_grouped_column(data_key)
+    run.apply_filters_and_recalculate(filter_settings)
+    return run.get_data_for_custom_plot(data_key)
+
+def _distance_profile(run: RunData, filter_settings: dict):
+    """
+    Retorna (distância, índices) apenas dos pontos em que a distância cresce estritamente,
+    garantindo um eixo monotônico para np.interp (paradas e pequenas oscilações são descartadas).
+    """
+    run.apply_filters_and_recalculate(filter_settings)
+    dist = run.distance_m
+    if dist.size == 0:
+        return dist, np.array([], dtype=int)
+    keep = np.flatnonzero(dist > np.concatenate(([-np.inf], np.maximum.accumulate(dist)[:-1])))
+    return dist[keep], keep
+
+def time_grid(runs: list[RunData], step: float = None) -> np.ndarray:
+    """Grade de tempo comum (tempo alinhado) cobrindo o intervalo presente em todas as runs."""
+    valid = [run for run in runs if run.time_s.size > 1]
+    if not valid:
+        return np.array([])
+    if step is None:
+        step = valid[0].time_s[1] - valid[0].time_s[0]
+    start = max(run.aligned_time_s[0] for run in valid)
+    end = min(run.aligned_time_s[-1] for run in valid)
+    if end <= start:
+        return np.array([])
+    return np.arange(start, end + step / 2, step)
+
+def distance_grid(runs: list[RunData], filter_settings: dict, num_points: int = RESAMPLE_DISTANCE_POINTS) -> np.ndarray:
+    """Grade de distância comum, de 0 até a menor distância total entre as runs."""
+    totals = [run.distance_m[-1] for run in runs if _distance_profile(run, filter_settings)[0].size > 1]
+    if not totals or min(totals) <= 0:
+        return np.array([])
+    return np.linspace(0, min(totals), num_points)
+
+def resample_runs(runs: list[RunData], data_key: str, filter_settings: dict, axis: str = AXIS_TIME,
+                  num_points: int = RESAMPLE_DISTANCE_POINTS, expressions: dict = None):
+    """
+    Interpola o canal `data_key` de todas as runs numa grade comum de tempo ou distância.
+    `expressions` (nome -> expressão) permite reamostrar canais calculados; expressões com
+    erro lançam ValueError. Retorna (grade, matriz) com uma linha por run; pontos sem dado ficam como NaN.
+    """
+    # A definição do canal calculado (e das que ele usa) entra na chave do cache
+    definitions = tuple(sorted(expressions.items())) if expressions and data_key in expressions else None
+    cache_key = ('channel', axis, data_key, definitions, json.dumps(filter_settings, sort_keys=True), num_points,
+                 _runs_signature(runs))
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    grid = time_grid(runs) if axis == AXIS_TIME else distance_grid(runs, filter_settings, num_points)
+    matrix = np.full((len(runs), grid.size), np.nan)
+    for i, run in enumerate(runs):
+        values = _channel_values(run, data_key, filter_settings, expressions)
+        if axis == AXIS_TIME:
+            x = run.aligned_time_s
+            if values.size != x.size or x.size < 2:
+                continue
+        else:
+            x, keep = _distance_profile(run, filter_settings)
+            values = values[keep] if values.size == run.time_s.size else np.array([])
+            if x.size < 2 or values.size == 0:
+                continue
+        matrix[i] = np.interp(grid, x, values, left=np.nan, right=np.nan)
+
+    return _cache_put(cache_key, grid, matrix)
+
+def compute_delta_t(runs: list[RunData], reference: RunData, filter_settings: dict, num_points: int = RESAMPLE_DISTANCE_POINTS):
+    """
+    Calcula o canal Delta-T em função da distância: para cada ponto da grade de distância,
+    o tempo (alinhado) que cada run levou para alcançá-lo menos o tempo da run de referência.
+    Valores positivos indicam que a run está atrás da referência.
+    """
+    cache_key = ('delta_t', reference.file_path, json.dumps(filter_settings, sort_keys=True), num_points, _runs_signature(runs))
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    grid = distance_grid(runs, filter_settings, num_points)
+    arrival = np.full((len(runs), grid.size), np.nan)
+    for i, run in enumerate(runs):
+        dist, keep = _distance_profile(run, filter_settings)
+        if dist.size > 1:
+            arrival[i] = np.interp(grid, dist, run.aligned_time_s[keep], left=np.nan, right=np.nan)
+
+    ref_arrival = arrival[runs.index(reference)] if reference in runs else np.full(grid.size, np.nan)
+    return _cache_put(cache_key, grid, arrival - ref_arrival)
+
+def compute_percentile_envelope(matrix: np.ndarray, percentiles: tuple = ENVELOPE_PERCENTILES) -> np.ndarray:
+    """
+    Calcula as bandas percentis de uma matriz [n_runs, n_pontos] numa única chamada vetorizada.
+    Retorna uma matriz [len(percentiles), n_pontos] (ex: p10, mediana, p90).
+    """
+    if matrix.size == 0:
+        return np.empty((len(percentiles), matrix.shape[-1] if matrix.ndim == 2 else 0))
+    if np.isnan(matrix).any():
+        return np.nanpercentile(matrix, percentiles, axis=0)
+    return np.percentile(matrix, percentiles, axis=0)
+
+def resample_envelope(runs: list[RunData], data_key: str, filter_settings: dict, axis: str = AXIS_TIME):
+    """Reamostra o canal de todas as runs na grade comum e retorna (grade, bandas percentis)."""
+    grid, matrix = resample_runs(runs, data_key, filter_settings, axis=axis)
+    return grid, compute_percentile_envelope(matrix)
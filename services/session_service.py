@@ -0,0 +1,181 @@
+# iLogger/services/session_service.py
+
+"""
+Sessão salva (.ilsession): um único arquivo com as runs (canais brutos, colunas do CSV e
+entradas do cache de filtro) e o estado da interface, para reabrir uma análise sem reler
+os CSVs nem refiltrar.
+
+Formato: assinatura, tamanho do cabeçalho (uint64), cabeçalho JSON e os arrays crus, cada
+um alinhado a SESSION_DATA_ALIGNMENT bytes. Ao abrir, o arquivo é mapeado em memória e os
+arrays são visões somente leitura sobre ele (nada é copiado até ser usado).
+"""
+
+import gc
+import json
+import mmap
+import os
+import struct
+import time
+import weakref
+import numpy as np
+from data.run_data import RunData
+from config import *
+
+SESSION_MAGIC = b'ILGSESS1'
+SESSION_FORMAT_VERSION = 1
+RAW_FIELDS = ('time_s', 'rpm_raw', 'velocity_raw_kmh')
+
+# Sessões mapeadas em memória: caminho normalizado -> referência fraca ao mmap (vivo enquanto
+# houver visões sobre ele). No Windows um arquivo mapeado não pode ser substituído.
+_mapped_sessions = {}
+
+
+def _aligned(size: int) -> int:
+    return -(-size // SESSION_DATA_ALIGNMENT) * SESSION_DATA_ALIGNMENT
+
+def file_fingerprint(path: str):
+    """Tamanho e data de modificação do arquivo de origem, ou None se ele não existir."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _session_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+def is_mapped_session(path: str) -> bool:
+    """Indica se `path` é uma sessão aberta cujos arrays ainda estão mapeados em memória."""
+    ref = _mapped_sessions.get(_session_key(path))
+    return ref is not None and ref() is not None
+
+def release_session_file(path: str, runs: list[RunData]) -> bool:
+    """
+    Solta o mapeamento da sessão `path` para que ela possa ser sobrescrita: as runs passam
+    a usar cópias próprias dos arrays. Retorna True se o mapeamento foi liberado (False se
+    ainda houver visões em uso fora das runs, ex: gráficos ainda não redesenhados).
+    """
+    key = _session_key(path)
+    if not is_mapped_session(path):
+        _mapped_sessions.pop(key, None)
+        return True
+    for run in runs:
+        run.copy_arrays()
+    # Visões presas em ciclos de referência só somem na coleta
+    gc.collect()
+    if is_mapped_session(path):
+        return False
+    _mapped_sessions.pop(key, None)
+    return True
+
+
+# --- Escrita ---
+
+def save_session(save_path: str, runs: list[RunData], ui_state: dict = None):
+    """
+    Grava as runs e `ui_state` (dict serializável em JSON, montado pela interface).
+    O arquivo é escrito ao lado e renomeado no fim, para não corromper uma sessão anterior.
+    Salvar por cima da sessão aberta (mapeada em memória) primeiro copia os arrays das runs.
+    """
+    if is_mapped_session(save_path):
+        release_session_file(save_path, runs)
+    arrays = []
+
+    def ref(array) -> int:
+        arrays.append(np.ascontiguousarray(array))
+        return len(arrays) - 1
+
+    run_entries = []
+    for run in runs:
+        run_entries.append({
+            'file_name': run.file_name,
+            'file_path': run.file_path,
+            'fingerprint': file_fingerprint(run.file_path),
+            'time_offset_s': run.time_offset_s,
+            'channels': {field: ref(getattr(run, field)) for field in RAW_FIELDS},
+            'raw_columns': {str(name): ref(run.get_raw_column(name)) for name in run.df_raw.columns},
+            'filter_cache': [
+                {'settings': settings, 'channels': {field: ref(values) for field, values in fields.items()}}
+                for settings, fields in run.filter_cache_snapshot()
+            ],
+        })
+
+    layout, offset = [], 0
+    for array in arrays:
+        layout.append({'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({
+        'version': SESSION_FORMAT_VERSION, 'app_version': APP_VERSION,
+        'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'runs': run_entries, 'ui': ui_state or {}, 'arrays': layout,
+    }).encode('utf-8')
+    data_start = _aligned(len(SESSION_MAGIC) + 8 + len(header))
+
+    tmp_path = f"{save_path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(SESSION_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for array, info in zip(arrays, layout):
+                f.seek(data_start + info['offset'])
+                f.write(array.data)
+            f.truncate(data_start + offset)
+        try:
+            os.replace(tmp_path, save_path)
+        except PermissionError:
+            if not is_mapped_session(save_path):
+                raise
+            raise OSError("A sessão aberta ainda está em uso e não pode ser sobrescrita; "
+                          "salve com outro nome.") from None
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# --- Leitura ---
+
+def _read_header(mapped) -> (dict, int):
+    if mapped[:len(SESSION_MAGIC)] != SESSION_MAGIC:
+        raise ValueError("Arquivo de sessão inválido.")
+    start = len(SESSION_MAGIC)
+    (header_len,) = struct.unpack('<Q', mapped[start:start + 8])
+    header = json.loads(bytes(mapped[start + 8:start + 8 + header_len]).decode('utf-8'))
+    if header.get('version', 0) > SESSION_FORMAT_VERSION:
+        raise ValueError("A sessão foi salva por uma versão mais nova do programa.")
+    return header, _aligned(start + 8 + header_len)
+
+def load_session(path: str) -> (list[RunData], dict, list[str]):
+    """
+    Reabre uma sessão. Retorna (runs, ui_state, avisos); os avisos apontam arquivos de
+    origem que mudaram desde que a sessão foi salva (as runs usam os dados da sessão).
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, data_start = _read_header(mapped)
+    _mapped_sessions[_session_key(path)] = weakref.ref(mapped)
+
+    def array(index: int) -> np.ndarray:
+        info = header['arrays'][index]
+        count = int(np.prod(info['shape']))
+        if count == 0:
+            return np.empty(info['shape'], dtype=np.dtype(info['dtype']))
+        return np.frombuffer(mapped, dtype=np.dtype(info['dtype']), count=count,
+                             offset=data_start + info['offset']).reshape(info['shape'])
+
+    runs, warnings = [], []
+    for entry in header['runs']:
+        channels = {field: array(index) for field, index in entry['channels'].items()}
+        cached = [(item['settings'], {field: array(index) for field, index in item['channels'].items()})
+                  for item in entry['filter_cache']]
+        runs.append(RunData.from_arrays(
+            entry['file_name'], channels['time_s'], channels['rpm_raw'], channels['velocity_raw_kmh'],
+            file_path=entry['file_path'], time_offset_s=entry['time_offset_s'], cached_filters=cached,
+            raw_columns={name: array(index) for name, index in entry['raw_columns'].items()},
+        ))
+        current = file_fingerprint(entry['file_path'])
+        if entry['fingerprint'] is not None and current is not None and current != entry['fingerprint']:
+            warnings.append(f"{entry['file_name']}: o arquivo de origem mudou desde que a sessão foi salva "
+                            f"(usando os dados da sessão).")
+    return runs, header['ui'], warnings
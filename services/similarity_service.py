@@ -0,0 +1,74 @@
+# iLogger/services/similarity_service.py
+
+import numpy as np
+from scipy.cluster import hierarchy
+from scipy.spatial.distance import squareform
+from data.run_data import RunData
+from services import resampling_service
+
+METRIC_RMS = 'rms'
+METRIC_CORRELATION = 'correlacao'
+
+SIMILARITY_METRICS = {
+    METRIC_RMS: "Diferença RMS",
+    METRIC_CORRELATION: "Correlação",
+}
+
+def rms_difference_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    Matriz N×N da diferença RMS entre as linhas de `matrix` [n_runs, n_pontos], calculada
+    com álgebra matricial: ||xi - xj||² = ||xi||² + ||xj||² - 2·xi·xj.
+    """
+    n_points = matrix.shape[1]
+    if n_points == 0:
+        return np.zeros((matrix.shape[0], matrix.shape[0]))
+    gram = matrix @ matrix.T
+    sq_norms = np.diag(gram)
+    sq_dist = sq_norms[:, None] + sq_norms[None, :] - 2 * gram
+    rms = np.sqrt(np.maximum(sq_dist, 0) / n_points)
+    np.fill_diagonal(rms, 0.0)
+    return rms
+
+def correlation_matrix(matrix: np.ndarray) -> np.ndarray:
+    """Matriz N×N do coeficiente de correlação de Pearson entre as linhas de `matrix`."""
+    if matrix.shape[1] < 2:
+        return np.eye(matrix.shape[0])
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1)
+    norms[norms == 0] = 1.0
+    normalized = centered / norms[:, None]
+    return np.clip(normalized @ normalized.T, -1.0, 1.0)
+
+def cluster_order(distance: np.ndarray) -> np.ndarray:
+    """Ordem das runs pelas folhas de um agrupamento hierárquico (ligação média)."""
+    n = distance.shape[0]
+    if n < 3:
+        return np.arange(n)
+    condensed = squareform(distance, checks=False)
+    return hierarchy.leaves_list(hierarchy.linkage(condensed, method='average'))
+
+def compute_similarity(runs: list[RunData], data_key: str, filter_settings: dict, metric: str = METRIC_RMS) -> dict:
+    """
+    Reamostra o canal de todas as runs na grade de tempo comum e calcula a matriz de similaridade.
+
+    Retorna um dict com:
+    - 'matrix': matriz N×N na ordem original das runs
+    - 'order': índices das runs na ordem do agrupamento (para exibir o heatmap agrupado)
+    - 'names': nomes dos arquivos na ordem original
+    """
+    names = [run.file_name for run in runs]
+    if not runs:
+        return {'matrix': np.zeros((0, 0)), 'order': np.array([], dtype=int), 'names': names}
+
+    _, resampled = resampling_service.resample_runs(runs, data_key, filter_settings)
+    # Descarta os pontos da grade sem dados em alguma run (canal ausente ou fora do intervalo)
+    resampled = resampled[:, ~np.isnan(resampled).any(axis=0)]
+
+    if metric == METRIC_CORRELATION:
+        matrix = correlation_matrix(resampled)
+        distance = 1.0 - matrix
+    else:
+        matrix = rms_difference_matrix(resampled)
+        distance = matrix
+
+    return {'matrix': matrix, 'order': cluster_order(distance), 'names': names}
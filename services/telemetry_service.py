@@ -0,0 +1,341 @@
+# iLogger/services/telemetry_service.py
+
+"""
+Telemetria ao vivo (sem Qt): recebe as linhas f1/f2 do carro por UDP ou porta serial,
+decodifica os pacotes em lote com NumPy e as guarda num anel pré-alocado de tamanho fixo.
+A tela (aba "Ao Vivo") consome o anel no seu próprio ritmo com `read_new`, como faz com
+o CSV em gravação, e o LiveRun agrupa e filtra as amostras de forma incremental.
+
+Pacote: cabeçalho '<4sIHH' (assinatura, número da primeira linha, quantidade de linhas,
+soma de verificação dos dados) seguido das linhas como pares uint16 (f1, f2). O número
+da linha permite contar as linhas perdidas; pela serial a assinatura ressincroniza o fluxo.
+
+`replay_csv` transmite um CSV existente por UDP em tempo real (ou acelerado), para testar
+o caminho inteiro sem o carro.
+"""
+
+import socket
+import struct
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config import *
+
+# Dependência opcional: sem pyserial, só a telemetria por UDP fica disponível
+try:
+    import serial
+except ImportError:
+    serial = None
+
+PACKET_MAGIC = b'ILT1'
+_HEADER = struct.Struct('<4sIHH')
+_ROW_DTYPE = np.dtype([('f1', '<u2'), ('f2', '<u2')])
+_MAX_ROWS_PER_PACKET = 1024  # Limita a espera por um cabeçalho falso no fluxo serial
+_SEQ_MODULO = 1 << 32
+_UDP_RECEIVE_SIZE = 65536
+_UDP_MAX_DATAGRAMS_PER_BATCH = 512
+_RECEIVE_TIMEOUT_S = 0.2
+
+
+def serial_available() -> bool:
+    return serial is not None
+
+
+# --- Pacotes ---
+
+def _checksum(payload: bytes) -> int:
+    return int(np.frombuffer(payload, dtype='<u2').sum(dtype=np.uint64) & 0xFFFF)
+
+def encode_packet(first_row: int, f1: np.ndarray, f2: np.ndarray) -> bytes:
+    """Monta um pacote com as linhas (f1, f2) a partir da linha `first_row`."""
+    rows = np.empty(len(f1), dtype=_ROW_DTYPE)
+    rows['f1'] = np.clip(f1, 0, 0xFFFF)
+    rows['f2'] = np.clip(f2, 0, 0xFFFF)
+    payload = rows.tobytes()
+    return _HEADER.pack(PACKET_MAGIC, first_row % _SEQ_MODULO, len(rows), _checksum(payload)) + payload
+
+
+class PacketDecoder:
+    """
+    Decodifica lotes de pacotes: confere os cabeçalhos um a um e converte os dados de
+    todos os pacotes válidos de uma vez. Conta pacotes inválidos e linhas perdidas
+    (lacunas na numeração). Pacotes atrasados ou repetidos (recuo de até
+    TELEMETRY_REORDER_WINDOW_PACKETS pacotes) são descartados e contados; um recuo maior
+    é um reinício do envio (numeração voltou ao início) e ressincroniza a numeração.
+    """
+    def __init__(self):
+        self.expected_row = None
+        self.packets = 0
+        self.bad_packets = 0
+        self.late_packets = 0
+        self.lost_rows = 0
+        self.restarts = 0
+
+    def decode(self, packets: list) -> (np.ndarray, np.ndarray, bool):
+        """
+        Retorna (f1, f2, reiniciado). Se o envio reiniciou no meio do lote, só as linhas
+        recebidas a partir do reinício são retornadas (as anteriores são da sessão antiga).
+        """
+        payloads = []
+        restarted = False
+        for packet in packets:
+            if len(packet) < _HEADER.size:
+                self.bad_packets += 1
+                continue
+            magic, first_row, count, checksum = _HEADER.unpack_from(packet)
+            payload = packet[_HEADER.size:_HEADER.size + count * _ROW_DTYPE.itemsize]
+            if magic != PACKET_MAGIC or count > _MAX_ROWS_PER_PACKET or len(payload) != count * _ROW_DTYPE.itemsize or _checksum(payload) != checksum:
+                self.bad_packets += 1
+                continue
+            if self.expected_row is not None:
+                gap = (first_row - self.expected_row) % _SEQ_MODULO
+                if gap >= _SEQ_MODULO // 2:
+                    behind = _SEQ_MODULO - gap
+                    if behind <= TELEMETRY_REORDER_WINDOW_PACKETS * max(count, 1):
+                        self.late_packets += 1  # Atrasado ou repetido (já passou)
+                        continue
+                    self.restarts += 1
+                    restarted = True
+                    payloads.clear()
+                else:
+                    self.lost_rows += gap
+            self.expected_row = (first_row + count) % _SEQ_MODULO
+            self.packets += 1
+            payloads.append(payload)
+        if not payloads:
+            return np.empty(0), np.empty(0), restarted
+        rows = np.frombuffer(b''.join(payloads), dtype=_ROW_DTYPE)
+        return rows['f1'].astype(float), rows['f2'].astype(float), restarted
+
+
+class StreamFramer:
+    """Separa os pacotes de um fluxo de bytes (serial), ressincronizando pela assinatura."""
+    def __init__(self):
+        self._buffer = bytearray()
+        self.skipped_bytes = 0
+
+    def feed(self, data: bytes) -> list:
+        self._buffer += data
+        packets = []
+        while True:
+            start = self._buffer.find(PACKET_MAGIC)
+            if start < 0:
+                # Guarda um possível início de assinatura cortado no fim
+                keep = len(PACKET_MAGIC) - 1
+                self.skipped_bytes += max(0, len(self._buffer) - keep)
+                del self._buffer[:-keep or None]
+                break
+            if start:
+                self.skipped_bytes += start
+                del self._buffer[:start]
+            if len(self._buffer) < _HEADER.size:
+                break
+            count, checksum = _HEADER.unpack_from(self._buffer)[2:]
+            size = _HEADER.size + count * _ROW_DTYPE.itemsize
+            if count > _MAX_ROWS_PER_PACKET:
+                self.skipped_bytes += 1
+                del self._buffer[:1]
+                continue
+            if len(self._buffer) < size:
+                break
+            if _checksum(bytes(self._buffer[_HEADER.size:size])) != checksum:
+                # Assinatura falsa (ou pacote corrompido): procura a próxima
+                self.skipped_bytes += 1
+                del self._buffer[:1]
+                continue
+            packets.append(bytes(self._buffer[:size]))
+            del self._buffer[:size]
+        return packets
+
+
+# --- Anel de Linhas ---
+
+class RowRingBuffer:
+    """
+    Anel pré-alocado de linhas (f1, f2) entre a thread de recepção e a tela. Se a tela
+    ficar mais de `capacity` linhas atrasada, as mais antigas são perdidas (e contadas).
+    """
+    def __init__(self, capacity: int = TELEMETRY_RING_ROWS):
+        self.capacity = capacity
+        self._f1 = np.zeros(capacity)
+        self._f2 = np.zeros(capacity)
+        self.written = 0  # Total de linhas gravadas (posição absoluta do fim)
+        self._lock = threading.Lock()
+
+    def write(self, f1: np.ndarray, f2: np.ndarray):
+        count = len(f1)
+        if count > self.capacity:
+            f1, f2 = f1[-self.capacity:], f2[-self.capacity:]
+        with self._lock:
+            index = np.arange(self.written + count - len(f1), self.written + count) % self.capacity
+            self._f1[index] = f1
+            self._f2[index] = f2
+            self.written += count
+
+    def read_since(self, cursor: int) -> (np.ndarray, np.ndarray, int, int):
+        """Retorna (f1, f2, novo cursor, linhas sobrescritas antes de serem lidas)."""
+        with self._lock:
+            end = self.written
+            overrun = max(0, end - self.capacity - cursor)
+            index = np.arange(cursor + overrun, end) % self.capacity
+            return self._f1[index], self._f2[index], end, overrun
+
+
+# --- Origens ---
+
+class TelemetrySource:
+    """
+    Base das origens de telemetria: uma thread recebe os pacotes em lote (`_receive`),
+    decodifica e grava no anel; `read_new` entrega à tela as linhas novas, na mesma
+    interface do CsvTailSource.
+    """
+    def __init__(self, name: str, ring_rows: int = TELEMETRY_RING_ROWS):
+        self.name = name
+        self.ring = RowRingBuffer(ring_rows)
+        self.decoder = PacketDecoder()
+        self.overrun_rows = 0
+        self.error = None
+        self._cursor = 0
+        # Posição do anel onde começa a sessão após um reinício do envio, até a tela ler
+        self._restart_at = None
+        self._restart_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"telemetria {name}", daemon=True)
+
+    def start(self) -> 'TelemetrySource':
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                packets = self._receive()
+                if packets:
+                    f1, f2, restarted = self.decoder.decode(packets)
+                    if restarted:
+                        with self._restart_lock:
+                            self._restart_at = self.ring.written
+                    if f1.size:
+                        self.ring.write(f1, f2)
+        except Exception as e:
+            if not self._stop.is_set():
+                self.error = e
+        finally:
+            self._close_transport()
+
+    def _receive(self) -> list:
+        raise NotImplementedError
+
+    def _close_transport(self):
+        pass
+
+    def read_new(self) -> (np.ndarray, np.ndarray, bool):
+        if self.error is not None:
+            raise self.error
+        with self._restart_lock:
+            restart_at, self._restart_at = self._restart_at, None
+        if restart_at is not None:
+            # As linhas da sessão anterior ainda não lidas são descartadas
+            self._cursor = max(self._cursor, restart_at)
+        f1, f2, self._cursor, overrun = self.ring.read_since(self._cursor)
+        self.overrun_rows += overrun
+        return f1, f2, restart_at is not None
+
+    def status_text(self) -> str:
+        decoder = self.decoder
+        return (f"{decoder.packets} pacotes, {decoder.lost_rows + self.overrun_rows} linhas perdidas, "
+                f"{decoder.late_packets} atrasados, {decoder.bad_packets} inválidos, {decoder.restarts} reinícios")
+
+    def close(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2 * _RECEIVE_TIMEOUT_S + 1)
+
+
+class UdpTelemetrySource(TelemetrySource):
+    """Recebe os pacotes por UDP (um pacote por datagrama)."""
+    def __init__(self, port: int = TELEMETRY_UDP_PORT, host: str = TELEMETRY_UDP_HOST, ring_rows: int = TELEMETRY_RING_ROWS):
+        super().__init__(f"udp://{host}:{port}", ring_rows)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind((host, port))
+        self.port = self.sock.getsockname()[1]
+        self.sock.settimeout(_RECEIVE_TIMEOUT_S)
+
+    def _receive(self) -> list:
+        try:
+            packets = [self.sock.recv(_UDP_RECEIVE_SIZE)]
+        except socket.timeout:
+            return []
+        # Esvazia o que já chegou, para decodificar tudo num único lote
+        self.sock.setblocking(False)
+        try:
+            while len(packets) < _UDP_MAX_DATAGRAMS_PER_BATCH:
+                packets.append(self.sock.recv(_UDP_RECEIVE_SIZE))
+        except BlockingIOError:
+            pass
+        finally:
+            self.sock.settimeout(_RECEIVE_TIMEOUT_S)
+        return packets
+
+    def _close_transport(self):
+        self.sock.close()
+
+
+class SerialTelemetrySource(TelemetrySource):
+    """Recebe os pacotes pela porta serial (rádio), requer o pacote 'pyserial'."""
+    def __init__(self, port: str, baudrate: int = TELEMETRY_SERIAL_BAUDRATE, ring_rows: int = TELEMETRY_RING_ROWS):
+        if serial is None:
+            raise ValueError("A telemetria serial requer o pacote 'pyserial', que não está instalado.")
+        super().__init__(f"serial://{port}", ring_rows)
+        self.port = serial.Serial(port, baudrate, timeout=_RECEIVE_TIMEOUT_S)
+        self.framer = StreamFramer()
+
+    def _receive(self) -> list:
+        data = self.port.read(max(1, self.port.in_waiting))
+        return self.framer.feed(data) if data else []
+
+    def _close_transport(self):
+        self.port.close()
+
+
+# --- Replay ---
+
+def replay_csv(csv_path: str, host: str = '127.0.0.1', port: int = TELEMETRY_UDP_PORT, speed: float = 1.0,
+               rows_per_packet: int = TELEMETRY_ROWS_PER_PACKET, loop: bool = False, stop_event=None,
+               progress=None) -> int:
+    """
+    Transmite as linhas f1/f2 de um CSV por UDP como o carro faria. `speed` multiplica o
+    ritmo real (RAW_SAMPLE_PERIOD_S por linha); 0 envia o mais rápido possível.
+    `progress(linhas_enviadas, total)` é chamado a cada segundo. Retorna as linhas enviadas.
+    """
+    df = pd.read_csv(csv_path, engine='c', usecols=['f1', 'f2'])
+    f1 = pd.to_numeric(df['f1'], errors='coerce').fillna(0).to_numpy()
+    f2 = pd.to_numeric(df['f2'], errors='coerce').fillna(0).to_numpy()
+    rows_per_packet = max(1, min(rows_per_packet, _MAX_ROWS_PER_PACKET))
+    row_period_s = RAW_SAMPLE_PERIOD_S / speed if speed > 0 else 0.0
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = 0
+    try:
+        while True:
+            started = time.perf_counter()
+            last_report = started
+            for start in range(0, len(f1), rows_per_packet):
+                if stop_event is not None and stop_event.is_set():
+                    return sent
+                end = min(start + rows_per_packet, len(f1))
+                # Cada pacote sai quando sua última linha teria sido medida
+                delay = started + end * row_period_s - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sock.sendto(encode_packet(sent, f1[start:end], f2[start:end]), (host, port))
+                sent += end - start
+                if progress is not None and time.perf_counter() - last_report >= 1.0:
+                    last_report = time.perf_counter()
+                    progress(sent, len(f1))
+            if not loop:
+                return sent
+    finally:
+        sock.close()
@@ -13,19 +13,69 @@ class AppState(QObject):
     data_loaded = pyqtSignal()
     # Sinal emitido para mensagens na barra de status
     status_message_changed = pyqtSignal(str, int)
+    # Sinal emitido quando os deslocamentos de alinhamento entre runs mudam
+    alignment_changed = pyqtSignal()
+    # Sinal emitido quando o cursor sincronizado muda de instante (tempo alinhado, em s)
+    cursor_time_changed = pyqtSignal(float)
+    # Sinal emitido quando os canais calculados (expressões) mudam
+    expression_channels_changed = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self.raw_runs = []
+        # Alinhamento atual: (caminho da run de referência, método) e cache de deslocamentos
+        self.alignment_key = None
+        self.alignment_cache = {}
+        # Instante atual do cursor sincronizado entre os gráficos (None se não posicionado)
+        self.cursor_time = None
+        # Canais calculados definidos pelo usuário: nome -> expressão (mantidos entre análises)
+        self.expression_channels = {}
 
     def update_analysis_results(self, runs: list):
         """
         Atualiza o estado com os dados brutos de uma nova análise.
         """
         self.raw_runs = runs
+        self.alignment_key = None
+        self.alignment_cache = {}
         self.data_loaded.emit() # Emite o sinal de que novos dados brutos estão prontos
 
+    def set_alignment(self, alignment_key: tuple, offsets: dict):
+        """
+        Aplica os deslocamentos {file_path: offset_s} às runs e guarda o resultado
+        no cache para que só seja recalculado quando a referência ou o método mudar.
+        """
+        self.alignment_cache[alignment_key] = offsets
+        self.alignment_key = alignment_key
+        for run in self.raw_runs:
+            run.time_offset_s = offsets.get(run.file_path, 0.0)
+        self.alignment_changed.emit()
+
+    def set_expression_channel(self, name: str, expression: str):
+        """Define (ou redefine) um canal calculado a partir de uma expressão já validada."""
+        self.expression_channels[name] = expression
+        self.expression_channels_changed.emit()
+
+    def set_cursor_time(self, time_s: float):
+        """Posiciona o cursor sincronizado em todos os gráficos com eixo de tempo."""
+        if time_s == self.cursor_time:
+            return
+        self.cursor_time = time_s
+        self.cursor_time_changed.emit(time_s)
+
+    def reference_run(self):
+        """Run de referência do alinhamento atual (ou a primeira run, se não houver alinhamento)."""
+        if not self.raw_runs:
+            return None
+        if self.alignment_key is not None:
+            for run in self.raw_runs:
+                if run.file_path == self.alignment_key[0]:
+                    return run
+        return self.raw_runs[0]
+
     def clear_data(self):
         """Limpa todos os dados da análise atual."""
         self.raw_runs = []
+        self.alignment_key = None
+        self.alignment_cache = {}
         self.data_loaded.emit()
\ No newline at end of file
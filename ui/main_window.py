@@ -7,15 +7,16 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget,
     QMessageBox, QTextEdit, QToolBar, QApplication, QFileDialog,
-    QStatusBar, QTableWidget, QTableWidgetItem, QHeaderView, QLabel,
-    QSplitter
+    QStatusBar, QTableView, QHeaderView, QLabel,
+    QSplitter, QInputDialog
 )
-from PyQt6.QtGui import QIcon, QAction, QPixmap
+from PyQt6.QtGui import QIcon, QAction
 from qt_material import apply_stylesheet
 
 from config import *
 from state.app_state import AppState
-from services import processing_service, report_service, file_service
+from services import processing_service, file_service, alignment_service, columnar_service, export_job_service, session_service
+from services.analysis_client import AnalysisClient
 from .widgets.navigation_panel import NavigationPanel
 from .widgets.controls_panel import ControlsPanel
 from .widgets.plot_widgets import (
@@ -23,6 +24,13 @@ from .widgets.plot_widgets import (
 )
 from .widgets.custom_plot_widget import CustomPlotWidget
 from .widgets.dashboard_widget import DashboardWidget
+from .widgets.similarity_widget import SimilarityWidget
+from .widgets.update_scheduler import UpdateScheduler
+from .widgets.filter_prefetcher import FilterPrefetcher
+from .widgets.dataframe_model import DataFrameTableModel
+from .widgets.job_queue import JobQueue, JobQueuePanel
+from .widgets.catalog_panel import CatalogPanel
+from .widgets.live_view import LiveView
 
 
 class MainWindow(QMainWindow):
@@ -36,6 +44,17 @@ class MainWindow(QMainWindow):
         self.current_theme = DEFAULT_THEME
 
         self.reportable_widgets = {}
+        # Todas as abas por chave (para salvar e restaurar o estado da sessão)
+        self.views = {}
+        # Pré-calcula em segundo plano as posições vizinhas dos sliders de filtro
+        self.filter_prefetcher = FilterPrefetcher(self.app_state, self)
+        # Exportações (PDF, Excel) rodam em segundo plano, uma de cada vez
+        self.job_queue = JobQueue(self)
+        # Tarefas de indexação do catálogo (a aba é atualizada quando terminam)
+        self._catalog_jobs = set()
+        # id -> título das tarefas da fila, para as mensagens de conclusão, falha e cancelamento
+        self._job_titles = {}
+        self.statusBar().addPermanentWidget(JobQueuePanel(self.job_queue))
 
         self._init_ui()
         self._connect_signals()
@@ -52,6 +71,8 @@ class MainWindow(QMainWindow):
         
         self.nav_panel = NavigationPanel()
         self.view_stack = QStackedWidget()
+        # Abas ocultas só são redesenhadas quando exibidas
+        self.update_scheduler = UpdateScheduler(self.view_stack, parent=self)
         
         main_layout.addWidget(self.nav_panel)
         main_layout.addWidget(self.view_stack)
@@ -67,25 +88,26 @@ class MainWindow(QMainWindow):
         self._add_plot_view("Velocidade", "velocidade", KEY_VEL_KMH_RAW, KEY_VEL_KMH_FILT, y_label="Velocidade (Km/h)")
         
         accel_view = AccelerationPlotWidget()
-        self._add_view(accel_view, "Aceleração / Força G", key="aceleracao")
+        self._add_view(accel_view, "Aceleração / Força G", key="aceleracao", reportable=True)
 
         self._add_plot_view("Distância", "distancia", KEY_DIST_M, KEY_DIST_M, y_label="Distância (m)")
 
         relation_view = RelationPlotWidget()
-        self._add_view(relation_view, "Relação RPM x Velocidade", key="relacao")
+        self._add_view(relation_view, "Relação RPM x Velocidade", key="relacao", reportable=True)
 
         # --- ABA DE ESTATÍSTICAS (COM SPLITTER) ---
         stats_view = QSplitter(Qt.Orientation.Horizontal)
+        self.stats_view = stats_view
 
         tables_container = QWidget()
         tables_layout = QVBoxLayout(tables_container)
         
         tables_layout.addWidget(QLabel("<h3>Tabela de Métricas Principais</h3>"))
-        self.metrics_table = QTableWidget()
+        self.metrics_table = self._create_stats_table()
         tables_layout.addWidget(self.metrics_table)
 
         tables_layout.addWidget(QLabel("<h3>Variações Percentuais em Relação ao Primeiro Arquivo</h3>"))
-        self.variations_table = QTableWidget()
+        self.variations_table = self._create_stats_table()
         tables_layout.addWidget(self.variations_table)
         
         self.comparison_plot = ComparisonPlotWidget()
@@ -98,36 +120,68 @@ class MainWindow(QMainWindow):
         self.reportable_widgets['comparativo'] = self.comparison_plot
         
         self.dashboard_widget = DashboardWidget()
-        self._add_view(self.dashboard_widget, "Dashboard", key="dashboard")
+        self._add_view(self.dashboard_widget, "Dashboard", key="dashboard", reportable=True)
 
         self.custom_plot_widget = CustomPlotWidget()
-        self._add_view(self.custom_plot_widget, "Gráfico Personalizado", key="custom_plot")
+        self._add_view(self.custom_plot_widget, "Gráfico Personalizado", key="custom_plot", reportable=True)
 
-    def _add_view(self, widget, name: str, key: str, icon_path: str = None):
+        self.similarity_widget = SimilarityWidget()
+        self._add_view(self.similarity_widget, "Similaridade entre RUNs", key="similaridade", reportable=True)
+
+        self.catalog_panel = CatalogPanel()
+        self._add_view(self.catalog_panel, "Catálogo de RUNs", key="catalogo")
+
+        self.live_view = LiveView()
+        self._add_view(self.live_view, "Ao Vivo", key="ao_vivo")
+
+    def _add_view(self, widget, name: str, key: str, icon_path: str = None, reportable: bool = False):
+        """
+        Adiciona uma aba. As abas `reportable` são as de análise: ligadas ao estado das runs
+        e com filtros próprios usados nas figuras correspondentes do relatório.
+        """
         self.view_stack.addWidget(widget)
         self.nav_panel.add_view(name, icon_path)
-        if hasattr(widget, 'get_figure_for_report'):
+        self.views[key] = widget
+        if reportable:
             self.reportable_widgets[key] = widget
     
     def _add_plot_view(self, name: str, key: str, raw_key: str, filt_key: str, y_label: str = None):
         if y_label is None: y_label = name
         plot_widget = TimeSeriesPlotWidget(name, y_label, raw_key, filt_key)
-        self._add_view(plot_widget, name, key=key)
+        self._add_view(plot_widget, name, key=key, reportable=True)
         
         if key == 'velocidade':
-            plot_widget.filter_controls.filter_changed.connect(self.update_statistics_view)
+            plot_widget.filter_controls.filter_changed.connect(self._request_statistics_update)
 
     def _connect_signals(self):
         self.nav_panel.view_selected.connect(self.view_stack.setCurrentIndex)
+        self.view_stack.currentChanged.connect(self._prefetch_visible_filters)
+        self.filter_prefetcher.batch_finished.connect(self._on_prefetch_finished)
         self.controls_panel.analysis_requested.connect(self.start_analysis)
         self.controls_panel.csv_generation_requested.connect(self.generate_csv_file)
+        self.controls_panel.alignment_requested.connect(self.apply_alignment)
+        self.catalog_panel.index_requested.connect(self.index_catalog)
+        self.catalog_panel.load_requested.connect(lambda paths: self.start_analysis({"file_paths": paths}))
+        self.live_view.publish_requested.connect(self.publish_live_run)
         
-        self.app_state.data_loaded.connect(self.update_statistics_view)
+        self.app_state.data_loaded.connect(self._request_statistics_update)
+        self.app_state.data_loaded.connect(self._on_data_loaded)
+        self.app_state.data_loaded.connect(self.filter_prefetcher.cancel)
         self.app_state.status_message_changed.connect(self.statusBar().showMessage)
+        self.job_queue.job_queued.connect(self._job_titles.__setitem__)
+        self.job_queue.job_finished.connect(self._on_job_finished)
+        self.job_queue.job_failed.connect(self._on_job_failed)
+        self.job_queue.job_cancelled.connect(self._on_job_cancelled)
         
-        for widget in self.reportable_widgets.values():
+        for key, widget in self.reportable_widgets.items():
+            if hasattr(widget, 'filter_controls'):
+                widget.filter_controls.filter_changed.connect(
+                    lambda _settings, panel=widget.filter_controls: self.filter_prefetcher.schedule(panel)
+                )
+            if key == 'custom_plot':
+                continue
             if hasattr(widget, 'link_state'):
-                widget.link_state(self.app_state)
+                widget.link_state(self.app_state, self.update_scheduler)
         
         if 'custom_plot' in self.reportable_widgets:
              self.reportable_widgets['custom_plot'].link_state(self.app_state)
@@ -137,6 +191,14 @@ class MainWindow(QMainWindow):
         toolbar = QToolBar("Ações Gerais")
         self.addToolBar(toolbar)
         
+        open_session_action = QAction("Abrir Sessão", self)
+        open_session_action.triggered.connect(self.open_session)
+        toolbar.addAction(open_session_action)
+
+        save_session_action = QAction("Salvar Sessão", self)
+        save_session_action.triggered.connect(self.save_session)
+        toolbar.addAction(save_session_action)
+
         pdf_action = QAction("Salvar Relatório PDF", self)
         pdf_action.triggered.connect(self.save_report)
         toolbar.addAction(pdf_action)
@@ -145,6 +207,14 @@ class MainWindow(QMainWindow):
         excel_action.triggered.connect(self.export_to_excel)
         toolbar.addAction(excel_action)
 
+        columnar_action = QAction("Exportar Dados Colunares", self)
+        columnar_action.triggered.connect(self.export_columnar_data)
+        toolbar.addAction(columnar_action)
+
+        server_action = QAction("Conectar a Servidor de Análise", self)
+        server_action.triggered.connect(self.attach_to_analysis_server)
+        toolbar.addAction(server_action)
+
         theme_action = QAction("Alternar Tema", self)
         theme_action.triggered.connect(self.toggle_theme)
         toolbar.addAction(theme_action)
@@ -169,6 +239,73 @@ class MainWindow(QMainWindow):
         self.view_stack.setCurrentIndex(1)
         self.app_state.status_message_changed.emit("Dados carregados. Filtros são independentes por gráfico.", 5000)
 
+    def attach_to_analysis_server(self):
+        """Usa as runs já carregadas e filtradas por um servidor de análise, em vez de ler os CSVs."""
+        url, ok = QInputDialog.getText(self, "Servidor de Análise", "Endereço do servidor:",
+                                       text=f"http://{ANALYSIS_SERVER_HOST}:{ANALYSIS_SERVER_PORT}")
+        if not ok or not url.strip():
+            return
+
+        self.app_state.status_message_changed.emit("Recebendo runs do servidor...", 0)
+        QApplication.processEvents()
+        try:
+            with AnalysisClient(url.strip()) as client:
+                runs = client.fetch_runs(self.reportable_widgets['velocidade'].filter_settings)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível obter as runs do servidor.\nErro: {e}")
+            self.app_state.status_message_changed.emit("Falha ao conectar ao servidor.", 5000)
+            return
+        if not runs:
+            QMessageBox.warning(self, "Aviso", "O servidor não tem runs carregadas.")
+            return
+
+        self.app_state.update_analysis_results(runs)
+        self.view_stack.setCurrentIndex(1)
+        self.app_state.status_message_changed.emit(f"{len(runs)} runs recebidas de {url.strip()}.", 5000)
+
+    def publish_live_run(self, run):
+        """Acrescenta à análise a run acompanhada ao vivo (substitui um envio anterior do mesmo arquivo)."""
+        runs = [existing for existing in self.app_state.raw_runs if existing.file_path != run.file_path]
+        self.app_state.update_analysis_results(runs + [run])
+        self.app_state.status_message_changed.emit(
+            f"{run.file_name} enviada para a análise ({run.time_s.size} amostras).", 5000)
+
+    def _on_data_loaded(self):
+        self.controls_panel.set_available_runs([run.file_name for run in self.app_state.raw_runs])
+
+    def _prefetch_visible_filters(self, index: int):
+        """Pré-calcula a vizinhança do painel de filtros da aba exibida, se houver."""
+        panel = getattr(self.view_stack.widget(index), 'filter_controls', None)
+        if panel is not None:
+            self.filter_prefetcher.schedule(panel)
+
+    def _on_prefetch_finished(self, added: int):
+        if added:
+            stats = self.filter_prefetcher.stats()
+            self.statusBar().showMessage(
+                f"Pré-cálculo de filtros: {added} resultados em cache "
+                f"(taxa de acerto {stats['hit_rate']:.0%}, {stats['prefetch_hits']} acertos pré-calculados).", 3000
+            )
+
+    def apply_alignment(self, alignment_data: dict):
+        """Calcula (ou recupera do cache) os deslocamentos entre runs e os aplica ao estado."""
+        runs = self.app_state.raw_runs
+        if not runs:
+            QMessageBox.warning(self, "Aviso", "Execute uma análise primeiro.")
+            return
+
+        method = alignment_data.get("method", alignment_service.ALIGN_NONE)
+        reference_index = max(alignment_data.get("reference_index", 0), 0)
+        alignment_key = (runs[reference_index].file_path, method)
+
+        offsets = self.app_state.alignment_cache.get(alignment_key)
+        if offsets is None:
+            offsets = alignment_service.compute_offsets(runs, reference_index, method)
+        self.app_state.set_alignment(alignment_key, offsets)
+
+        label = alignment_service.ALIGNMENT_METHODS.get(method, method)
+        self.app_state.status_message_changed.emit(f"Alinhamento aplicado ({label}) em relação a {runs[reference_index].file_name}.", 5000)
+
     def generate_csv_file(self, csv_data: dict):
         """Lida com a solicitação de geração de um arquivo CSV processado."""
         run_dir = csv_data.get("run_dir")
@@ -194,27 +331,20 @@ class MainWindow(QMainWindow):
         )
         self.app_state.status_message_changed.emit("Processamento de CSV concluído.", 5000)
 
-    def _populate_table(self, table_widget: QTableWidget, df: pd.DataFrame):
-        table_widget.clear()
-        if df.empty:
-            table_widget.setRowCount(0)
-            table_widget.setColumnCount(0)
-            return
+    def _create_stats_table(self) -> QTableView:
+        """Tabela de estatísticas virtualizada: os valores são formatados sob demanda pelo modelo."""
+        table_view = QTableView()
+        table_view.setModel(DataFrameTableModel(table_view))
+        table_view.setSortingEnabled(True)
+        table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        return table_view
 
-        table_widget.setRowCount(df.shape[0])
-        table_widget.setColumnCount(df.shape[1])
-        table_widget.setHorizontalHeaderLabels(df.columns)
-        table_widget.setVerticalHeaderLabels(df.index.astype(str))
+    def _populate_table(self, table_view: QTableView, df: pd.DataFrame):
+        table_view.model().set_dataframe(df)
 
-        for row in range(df.shape[0]):
-            for col in range(df.shape[1]):
-                value = df.iat[row, col]
-                item = QTableWidgetItem(f"{value:.2f}")
-                table_widget.setItem(row, col, item)
-        
-        header = table_widget.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table_widget.resizeRowsToContents()
+    def _request_statistics_update(self):
+        """Atualiza as tabelas de estatísticas agora ou quando a aba for exibida."""
+        self.update_scheduler.request(self.stats_view, self.update_statistics_view)
 
     def update_statistics_view(self):
         if 'velocidade' in self.reportable_widgets and self.app_state.raw_runs:
@@ -232,17 +362,10 @@ class MainWindow(QMainWindow):
             self.comparison_plot.update_plot(pd.DataFrame())
 
 
-    def _get_all_figures(self) -> dict:
-        figures_pixmap = {}
-        for key, widget in self.reportable_widgets.items():
-            if hasattr(widget, 'get_figure_for_report'):
-                fig_bytes = widget.get_figure_for_report()
-                if fig_bytes:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(fig_bytes)
-                    if not pixmap.isNull():
-                        figures_pixmap[key] = pixmap
-        return figures_pixmap
+    def _figure_settings(self) -> dict:
+        """Configurações de filtro de cada aba, usadas nas figuras correspondentes do relatório."""
+        return {key: dict(widget.filter_settings) for key, widget in self.reportable_widgets.items()
+                if hasattr(widget, 'filter_settings')}
 
     def save_report(self):
         if not self.app_state.raw_runs:
@@ -254,18 +377,17 @@ class MainWindow(QMainWindow):
         
         report_data = self.controls_panel.get_report_data()
         
-        filter_settings = self.reportable_widgets['velocidade'].filter_settings
-        metrics_df, variations_df = processing_service.generate_statistics(self.app_state.raw_runs, filter_settings)
-
-        report_service.generate_pdf_report(
+        # A tarefa recebe um instantâneo do estado atual; a análise segue livre na interface
+        self.job_queue.submit(
+            "Relatório PDF", export_job_service.export_pdf_report,
+            runs=list(self.app_state.raw_runs),
             save_path=save_path,
-            setup_info=report_data['setup_info'],
+            setup_info=dict(report_data['setup_info']),
             observations=report_data['observations'],
-            filter_settings=filter_settings,
-            metrics_df=metrics_df,
-            variations_df=variations_df,
-            figures=self._get_all_figures()
+            filter_settings=dict(self.reportable_widgets['velocidade'].filter_settings),
+            figure_settings=self._figure_settings(),
         )
+        self.app_state.status_message_changed.emit("Relatório PDF adicionado à fila de exportação.", 3000)
 
     def export_to_excel(self):
         if not self.app_state.raw_runs:
@@ -276,35 +398,165 @@ class MainWindow(QMainWindow):
         if not save_path:
             return
 
-        self.app_state.status_message_changed.emit("Gerando Dashboard Excel...", 0)
-        QApplication.processEvents()
+        report_data = self.controls_panel.get_report_data()
+        self.job_queue.submit(
+            "Dashboard Excel", export_job_service.export_excel_dashboard,
+            runs=list(self.app_state.raw_runs),
+            save_path=save_path,
+            setup_info=dict(report_data.get('setup_info', {})),
+            filter_settings=dict(self.reportable_widgets['velocidade'].filter_settings),
+            expression_channels=dict(self.app_state.expression_channels),
+        )
+        self.app_state.status_message_changed.emit("Dashboard Excel adicionado à fila de exportação.", 3000)
+
+    def _on_job_finished(self, job_id: int, message: str):
+        self._job_titles.pop(job_id, None)
+        self.app_state.status_message_changed.emit(message, 8000)
+        self._refresh_catalog_after(job_id)
+
+    def index_catalog(self, db_path: str, directories: list):
+        """Indexa os diretórios no catálogo em segundo plano, com o filtro padrão."""
+        job_id = self.job_queue.submit("Indexação do Catálogo", export_job_service.index_catalog, db_path, directories)
+        self._catalog_jobs.add(job_id)
+
+    def _refresh_catalog_after(self, job_id: int):
+        """Atualiza o painel do catálogo ao fim de uma indexação (concluída, com falha ou cancelada)."""
+        if job_id in self._catalog_jobs:
+            self._catalog_jobs.discard(job_id)
+            self.catalog_panel.refresh_summary()
+            self.catalog_panel.run_query()
+
+    def _on_job_failed(self, job_id: int, error: str):
+        title = self._job_titles.pop(job_id, "Tarefa")
+        self.app_state.status_message_changed.emit(f"Falha na tarefa: {title}.", 8000)
+        self._refresh_catalog_after(job_id)
+        # Não modal: a análise continua enquanto o erro é exibido
+        box = QMessageBox(QMessageBox.Icon.Critical, f"Erro: {title}", f"A tarefa \"{title}\" falhou.\n\n{error}",
+                          QMessageBox.StandardButton.Ok, self)
+        box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        box.open()
+
+    def _on_job_cancelled(self, job_id: int):
+        title = self._job_titles.pop(job_id, "Tarefa")
+        self.app_state.status_message_changed.emit(f"Tarefa cancelada: {title}.", 5000)
+        self._refresh_catalog_after(job_id)
+
+    def closeEvent(self, event):
+        # Tarefas pendentes são canceladas; a atual termina na próxima verificação
+        self.live_view.stop()
+        self.job_queue.cancel_all()
+        self.job_queue.wait()
+        super().closeEvent(event)
+
+    def export_columnar_data(self):
+        """Exporta os canais de todas as runs para .npz/.h5/.arrow, conforme os pacotes instalados."""
+        if not self.app_state.raw_runs:
+            QMessageBox.warning(self, "Aviso", "Execute uma análise primeiro.")
+            return
 
-        try:
-            # Coleta todos os dados necessários para o relatório
-            report_data = self.controls_panel.get_report_data()
-            setup_info = report_data.get('setup_info', {})
-            observations = report_data.get('observations', '')
+        extensions = {columnar_service.FORMAT_NPZ: "NumPy (*.npz)", columnar_service.FORMAT_HDF5: "HDF5 (*.h5)",
+                      columnar_service.FORMAT_ARROW: "Arrow IPC (*.arrow)"}
+        file_filter = ";;".join(extensions[fmt] for fmt in columnar_service.available_formats())
+        save_path, _ = QFileDialog.getSaveFileName(self, "Exportar Dados Colunares", "", file_filter)
+        if not save_path:
+            return
 
-            filter_settings = self.reportable_widgets['velocidade'].filter_settings
-            metrics_df, variations_df = processing_service.generate_statistics(
-                self.app_state.raw_runs, filter_settings
-            )
+        self.job_queue.submit(
+            "Dados Colunares", export_job_service.export_columnar,
+            runs=list(self.app_state.raw_runs),
+            save_path=save_path,
+            filter_settings=dict(self.reportable_widgets['velocidade'].filter_settings),
+            setup_info=dict(self.controls_panel.get_report_data().get('setup_info', {})),
+        )
+        self.app_state.status_message_changed.emit("Dados colunares adicionados à fila de exportação.", 3000)
+
+    # --- Sessão ---
+    def _session_ui_state(self) -> dict:
+        runs = self.app_state.raw_runs
+        alignment = None
+        if self.app_state.alignment_key is not None:
+            reference_path, method = self.app_state.alignment_key
+            reference_index = next((i for i, run in enumerate(runs) if run.file_path == reference_path), 0)
+            alignment = {'reference_index': reference_index, 'method': method}
+        return {
+            'view_index': self.view_stack.currentIndex(),
+            'filters': {key: widget.filter_controls.get_settings()
+                        for key, widget in self.views.items() if hasattr(widget, 'filter_controls')},
+            'custom_plot': self.custom_plot_widget.get_session_state(),
+            'expression_channels': dict(self.app_state.expression_channels),
+            'alignment': alignment,
+            'report': self.controls_panel.get_report_data(),
+        }
+
+    def _restore_filter_panels(self, ui_state: dict):
+        # Feito antes de carregar as runs, para que as abas já desenhem com os filtros em cache
+        for key, settings in ui_state.get('filters', {}).items():
+            widget = self.views.get(key)
+            if widget is not None and hasattr(widget, 'filter_controls'):
+                widget.filter_controls.set_settings(settings)
+
+    def _restore_session_ui_state(self, ui_state: dict):
+        runs = self.app_state.raw_runs
+        for name, expression in ui_state.get('expression_channels', {}).items():
+            self.app_state.set_expression_channel(name, expression)
+        alignment = ui_state.get('alignment')
+        if alignment and 0 <= alignment['reference_index'] < len(runs):
+            # Os deslocamentos vieram com as runs; só registra o alinhamento no estado
+            offsets = {run.file_path: run.time_offset_s for run in runs}
+            self.app_state.set_alignment((runs[alignment['reference_index']].file_path, alignment['method']), offsets)
+            self.controls_panel.set_alignment_selection(alignment['method'], alignment['reference_index'])
+        self.custom_plot_widget.restore_session_state(ui_state.get('custom_plot', {}))
+        self.controls_panel.set_report_data(ui_state.get('report', {}))
+        self.view_stack.setCurrentIndex(ui_state.get('view_index', 1))
+
+    def save_session(self):
+        """Salva runs, caches de filtro e o estado das abas num único arquivo."""
+        if not self.app_state.raw_runs:
+            QMessageBox.warning(self, "Aviso", "Execute uma análise primeiro.")
+            return
+        save_path, _ = QFileDialog.getSaveFileName(self, "Salvar Sessão", "", f"Sessão iLogger (*{SESSION_FILE_EXTENSION})")
+        if not save_path:
+            return
+        if not save_path.endswith(SESSION_FILE_EXTENSION):
+            save_path += SESSION_FILE_EXTENSION
 
-            # Chama a nova função de exportação para criar o dashboard
-            file_service.export_to_dashboard_excel(
-                runs=self.app_state.raw_runs,
-                save_path=save_path,
-                metrics_df=metrics_df,
-                variations_df=variations_df,
-                filter_settings=filter_settings,
-                setup_info=setup_info,
-                observations=observations
-            )
+        self.app_state.status_message_changed.emit("Salvando sessão...", 0)
+        QApplication.processEvents()
+        if session_service.is_mapped_session(save_path):
+            # Por cima da sessão aberta: as runs passam a usar cópias e todas as abas são
+            # redesenhadas a partir delas, soltando as visões do arquivo mapeado
+            session_service.release_session_file(save_path, self.app_state.raw_runs)
+            self.app_state.alignment_changed.emit()
+            for index in range(self.view_stack.count()):
+                self.update_scheduler.flush(self.view_stack.widget(index))
+            self.custom_plot_widget.update_plot()
+        try:
+            session_service.save_session(save_path, self.app_state.raw_runs, self._session_ui_state())
+            self.app_state.status_message_changed.emit(f"Sessão salva em {save_path}", 5000)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível salvar a sessão.\nErro: {e}\n\n{traceback.format_exc()}")
+            self.app_state.status_message_changed.emit("Falha ao salvar a sessão.", 5000)
 
+    def open_session(self):
+        """Reabre uma sessão salva: restaura as runs e as abas sem reler os CSVs nem refiltrar."""
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir Sessão", "", f"Sessão iLogger (*{SESSION_FILE_EXTENSION})")
+        if not path:
+            return
+        try:
+            runs, ui_state, warnings = session_service.load_session(path)
         except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Não foi possível gerar o Dashboard Excel.\nErro: {e}\n\n{traceback.format_exc()}")
-            self.app_state.status_message_changed.emit("Falha ao gerar Dashboard.", 5000)
+            QMessageBox.critical(self, "Erro", f"Não foi possível abrir a sessão.\nErro: {e}")
+            return
+        if not runs:
+            QMessageBox.warning(self, "Aviso", "A sessão não contém runs.")
+            return
 
+        self._restore_filter_panels(ui_state)
+        self.app_state.update_analysis_results(runs)
+        self._restore_session_ui_state(ui_state)
+        if warnings:
+            QMessageBox.warning(self, "Avisos da Sessão", "\n".join(warnings))
+        self.app_state.status_message_changed.emit(f"Sessão aberta: {len(runs)} runs.", 5000)
 
     def toggle_theme(self):
         new_theme = LIGHT_THEME if self.current_theme == DEFAULT_THEME else DEFAULT_THEME
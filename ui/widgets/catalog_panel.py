@@ -0,0 +1,145 @@
+# iLogger/ui/widgets/catalog_panel.py
+
+import os
+import pandas as pd
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit, QPushButton,
+    QTableView, QHeaderView, QFileDialog, QMessageBox, QAbstractItemView
+)
+from PyQt6.QtCore import QSettings, pyqtSignal
+from services import catalog_service
+from .dataframe_model import DataFrameTableModel
+
+
+class CatalogPanel(QWidget):
+    """
+    Aba do catálogo de RUNs: indexa diretórios no banco SQLite, busca runs por setup e
+    métricas (ex: "peso_cvt = 180 e t_0_30_s < 4") e carrega apenas as encontradas.
+    """
+    index_requested = pyqtSignal(str, list)   # banco, diretórios
+    load_requested = pyqtSignal(list)         # caminhos dos CSVs
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.settings = QSettings("MangueBaja", "iLogger")
+        # Caminhos das runs da última busca, na ordem das linhas do DataFrame exibido
+        self.result_paths = []
+
+        main_layout = QVBoxLayout(self)
+
+        db_group = QGroupBox("Banco do Catálogo")
+        db_layout = QHBoxLayout(db_group)
+        self.txt_db_path = QLineEdit(self.settings.value("catalog_db_path", catalog_service.default_db_path()))
+        self.btn_choose_db = QPushButton("...")
+        self.btn_index = QPushButton("Indexar Diretório...")
+        self.lbl_summary = QLabel()
+        db_layout.addWidget(self.txt_db_path, stretch=1)
+        db_layout.addWidget(self.btn_choose_db)
+        db_layout.addWidget(self.btn_index)
+        db_layout.addWidget(self.lbl_summary)
+        main_layout.addWidget(db_group)
+
+        query_group = QGroupBox("Busca")
+        query_layout = QHBoxLayout(query_group)
+        self.txt_query = QLineEdit()
+        self.txt_query.setPlaceholderText("ex: peso_cvt = 180 e t_0_30_s < 4   (vazio = todas)")
+        self.btn_search = QPushButton("Buscar")
+        query_layout.addWidget(self.txt_query, stretch=1)
+        query_layout.addWidget(self.btn_search)
+        main_layout.addWidget(query_group)
+
+        self.table = QTableView()
+        self.table.setModel(DataFrameTableModel(self.table))
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        main_layout.addWidget(self.table, stretch=1)
+
+        buttons_layout = QHBoxLayout()
+        self.lbl_results = QLabel("Nenhuma busca realizada.")
+        self.btn_load_selected = QPushButton("Carregar Selecionadas")
+        self.btn_load_all = QPushButton("Carregar Todas")
+        buttons_layout.addWidget(self.lbl_results, stretch=1)
+        buttons_layout.addWidget(self.btn_load_selected)
+        buttons_layout.addWidget(self.btn_load_all)
+        main_layout.addLayout(buttons_layout)
+
+        self.btn_choose_db.clicked.connect(self._choose_db)
+        self.btn_index.clicked.connect(self._on_index_clicked)
+        self.btn_search.clicked.connect(self.run_query)
+        self.txt_query.returnPressed.connect(self.run_query)
+        self.btn_load_selected.clicked.connect(self._on_load_selected)
+        self.btn_load_all.clicked.connect(lambda: self._emit_load(self.result_paths))
+        self.refresh_summary()
+
+    @property
+    def db_path(self) -> str:
+        return self.txt_db_path.text().strip() or catalog_service.default_db_path()
+
+    def _choose_db(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Banco do Catálogo", self.db_path, "SQLite (*.sqlite *.db)",
+                                              options=QFileDialog.Option.DontConfirmOverwrite)
+        if path:
+            self.txt_db_path.setText(path)
+            self.settings.setValue("catalog_db_path", path)
+            self.refresh_summary()
+
+    def _on_index_clicked(self):
+        last_dir = self.settings.value("catalog_last_directory", os.path.expanduser("~"))
+        directory = QFileDialog.getExistingDirectory(self, "Diretório com os CSVs (inclui subdiretórios)", last_dir)
+        if directory:
+            self.settings.setValue("catalog_last_directory", directory)
+            self.settings.setValue("catalog_db_path", self.db_path)
+            self.index_requested.emit(self.db_path, [directory])
+
+    def refresh_summary(self):
+        """Atualiza o total de runs e a lista de campos de busca (dica do campo de busca)."""
+        if not os.path.exists(self.db_path):
+            self.lbl_summary.setText("Catálogo vazio")
+            return
+        try:
+            summary = catalog_service.catalog_summary(self.db_path)
+        except Exception as e:
+            self.lbl_summary.setText(f"Catálogo inválido: {e}")
+            return
+        self.lbl_summary.setText(f"{summary['runs']} runs ({summary['errors']} com erro)")
+        self.txt_query.setToolTip(
+            "Campos numéricos: " + ", ".join(catalog_service.METRIC_COLUMNS) +
+            "\nTexto: " + ", ".join(catalog_service.TEXT_COLUMNS) +
+            "\nSetup: " + (", ".join(summary['setup_keys']) or "nenhum setup.json indexado") +
+            "\nOperadores: = != < <= > >= ~ (contém); condições unidas por 'e'."
+        )
+
+    def run_query(self):
+        try:
+            conditions = catalog_service.parse_query(self.txt_query.text())
+            results = catalog_service.query_runs(self.db_path, conditions)
+        except Exception as e:
+            QMessageBox.warning(self, "Busca Inválida", str(e))
+            return
+
+        self.result_paths = [result['path'] for result in results]
+        setup_keys = sorted({key for result in results for key in result['setup']})
+        rows = {}
+        # Rótulos relativos à pasta comum, para distinguir RUNs homônimas de dias e temporadas diferentes
+        common = os.path.dirname(os.path.commonpath(self.result_paths)) if self.result_paths else ''
+        for result in results:
+            label = os.path.relpath(result['path'], common) if common else result['file_name']
+            row = {column: result[column] for column in catalog_service.METRIC_COLUMNS}
+            # O modelo da tabela é numérico: valores de setup não numéricos aparecem como "-"
+            row.update({key: pd.to_numeric(result['setup'].get(key), errors='coerce') for key in setup_keys})
+            rows[f"{len(rows) + 1}. {label}"] = row
+        df = pd.DataFrame.from_dict(rows, orient='index', dtype=float)
+        self.table.model().set_dataframe(df)
+        self.lbl_results.setText(f"{len(results)} runs encontradas.")
+
+    def _on_load_selected(self):
+        model = self.table.model()
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        self._emit_load([self.result_paths[model.source_row(row)] for row in rows])
+
+    def _emit_load(self, paths: list):
+        if not paths:
+            QMessageBox.information(self, "Catálogo", "Nenhuma run para carregar.")
+            return
+        self.load_requested.emit(paths)
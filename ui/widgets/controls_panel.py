@@ -3,9 +3,11 @@
 import os
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QFileDialog, QListWidget, QTextEdit, QGroupBox, QGridLayout, QMessageBox
+    QPushButton, QFileDialog, QListWidget, QTextEdit, QGroupBox, QGridLayout, QMessageBox,
+    QComboBox
 )
 from PyQt6.QtCore import QSettings, pyqtSignal
+from services.alignment_service import ALIGNMENT_METHODS
 
 class ControlsPanel(QWidget):
     """
@@ -14,6 +16,7 @@ class ControlsPanel(QWidget):
     """
     analysis_requested = pyqtSignal(dict)
     csv_generation_requested = pyqtSignal(dict)
+    alignment_requested = pyqtSignal(dict)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -30,6 +33,7 @@ class ControlsPanel(QWidget):
         # Layout inferior 
         bottom_layout = QHBoxLayout()
         bottom_layout.addWidget(self._create_file_management_group())
+        bottom_layout.addWidget(self._create_alignment_group())
         bottom_layout.addWidget(self._create_observations_group(), stretch=1)
         
         main_layout.addLayout(bottom_layout)
@@ -75,6 +79,29 @@ class ControlsPanel(QWidget):
         layout.addWidget(self.btn_generate_csv, 3, 0, 1, 3)
         return group
 
+    def _create_alignment_group(self):
+        group = QGroupBox("Alinhamento de RUNs")
+        layout = QGridLayout(group)
+
+        self.combo_align_method = QComboBox()
+        for method, label in ALIGNMENT_METHODS.items():
+            self.combo_align_method.addItem(label, method)
+        self.combo_align_reference = QComboBox()
+        self.btn_apply_alignment = QPushButton("Aplicar Alinhamento")
+        self.btn_apply_alignment.clicked.connect(self._on_apply_alignment_clicked)
+
+        layout.addWidget(QLabel("Método:"), 0, 0)
+        layout.addWidget(self.combo_align_method, 0, 1)
+        layout.addWidget(QLabel("RUN de Referência:"), 1, 0)
+        layout.addWidget(self.combo_align_reference, 1, 1)
+        layout.addWidget(self.btn_apply_alignment, 2, 0, 1, 2)
+        return group
+
+    def set_available_runs(self, run_names: list):
+        """Atualiza a lista de runs que podem servir de referência para o alinhamento."""
+        self.combo_align_reference.clear()
+        self.combo_align_reference.addItems(run_names)
+
     def _create_analysis_files_group(self):
         group = QGroupBox("Arquivos para Análise")
         layout = QVBoxLayout(group)
@@ -113,7 +140,8 @@ class ControlsPanel(QWidget):
     def _select_analysis_files(self):
         settings = QSettings("MangueBaja", "iLogger")
         last_dir = settings.value("last_plot_directory", os.path.expanduser("~"))
-        filenames, _ = QFileDialog.getOpenFileNames(self, "Selecione os arquivos de RUN para análise", last_dir, "CSV files (*.csv)")
+        filenames, _ = QFileDialog.getOpenFileNames(self, "Selecione os arquivos de RUN para análise", last_dir,
+                                                    "CSV files (*.csv);;Exportações colunares (*.npz *.h5 *.hdf5 *.arrow)")
         if filenames:
             self.list_files.clear()
             self.list_files.addItems(filenames)
@@ -126,6 +154,12 @@ class ControlsPanel(QWidget):
             "save_dir": self.txt_save_dir.text()
         })
 
+    def _on_apply_alignment_clicked(self):
+        self.alignment_requested.emit({
+            "method": self.combo_align_method.currentData(),
+            "reference_index": self.combo_align_reference.currentIndex()
+        })
+
     def _on_run_analysis_clicked(self):
         file_paths = [self.list_files.item(i).text() for i in range(self.list_files.count())]
         
@@ -136,6 +170,20 @@ class ControlsPanel(QWidget):
         analysis_data = { "file_paths": file_paths }
         self.analysis_requested.emit(analysis_data)
         
+    def set_report_data(self, report_data: dict):
+        """Restaura o setup e as observações (ex: ao abrir uma sessão salva)."""
+        for key, value in report_data.get("setup_info", {}).items():
+            if key in self.setup_inputs:
+                self.setup_inputs[key].setText(value)
+        self.txt_observation.setPlainText(report_data.get("observations", ""))
+
+    def set_alignment_selection(self, method: str, reference_index: int):
+        method_index = self.combo_align_method.findData(method)
+        if method_index != -1:
+            self.combo_align_method.setCurrentIndex(method_index)
+        if 0 <= reference_index < self.combo_align_reference.count():
+            self.combo_align_reference.setCurrentIndex(reference_index)
+
     def get_report_data(self):
         return {
             "setup_info": {key: widget.text() for key, widget in self.setup_inputs.items()},
@@ -0,0 +1,107 @@
+# iLogger/ui/widgets/crosshair.py
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QCheckBox, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+from config import CROSSHAIR_RATE_LIMIT_HZ
+
+
+class Crosshair(QObject):
+    """
+    Linha vertical de cursor de um gráfico com eixo de tempo. Emite `moved` com o instante
+    sob o mouse (limitado a CROSSHAIR_RATE_LIMIT_HZ) e acompanha o cursor sincronizado via `set_time`.
+    """
+    moved = pyqtSignal(float)
+
+    def __init__(self, plot_item, scene, parent=None):
+        super().__init__(parent)
+        self.plot_item = plot_item
+        self.enabled = True
+        self.line = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen('#888888', style=Qt.PenStyle.DashLine))
+        self.line.setZValue(20)
+        self.line.hide()
+        plot_item.addItem(self.line, ignoreBounds=True)
+        # Agrupa os eventos do mouse para no máximo uma atualização por quadro da tela
+        self._proxy = pg.SignalProxy(scene.sigMouseMoved, rateLimit=CROSSHAIR_RATE_LIMIT_HZ, slot=self._on_mouse_moved)
+
+    def _on_mouse_moved(self, event):
+        if not self.enabled:
+            return
+        pos = event[0]
+        view_box = self.plot_item.getViewBox()
+        if view_box.sceneBoundingRect().contains(pos):
+            self.moved.emit(view_box.mapSceneToView(pos).x())
+
+    def set_time(self, time_s: float):
+        self.line.setPos(time_s)
+        self.line.setVisible(self.enabled)
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        if not enabled:
+            self.line.hide()
+
+    def detach(self):
+        """Desconecta do mouse e remove a linha do gráfico."""
+        self._proxy.disconnect()
+        self.plot_item.removeItem(self.line)
+
+
+class CursorReadoutPanel(QGroupBox):
+    """
+    Painel com os valores de cada run no instante do cursor sincronizado.
+    Apenas apresenta os valores; a busca fica a cargo do cursor_service.
+    """
+    enabled_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__("Cursor Sincronizado", parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.chk_enabled = QCheckBox("Ativar cursor")
+        self.chk_enabled.setChecked(True)
+        self.lbl_time = QLabel("Tempo: -")
+        self.table = QTableWidget()
+        self.table.setMinimumHeight(120)
+        self._run_names = []
+
+        layout.addWidget(self.chk_enabled)
+        layout.addWidget(self.lbl_time)
+        layout.addWidget(self.table)
+
+        self.chk_enabled.toggled.connect(self._on_toggled)
+
+    def is_enabled(self) -> bool:
+        return self.chk_enabled.isChecked()
+
+    def _on_toggled(self, checked: bool):
+        self.table.setVisible(checked)
+        if not checked:
+            self.lbl_time.setText("Tempo: -")
+        self.enabled_changed.emit(checked)
+
+    def set_values(self, time_s: float, run_names: list, labels: list, values: np.ndarray):
+        """Atualiza a tabela (runs x canais) reaproveitando os itens existentes."""
+        self.lbl_time.setText(f"Tempo: {time_s:.3f} s")
+        if self.table.rowCount() != len(run_names) or self.table.columnCount() != len(labels):
+            self.table.setRowCount(len(run_names))
+            self.table.setColumnCount(len(labels))
+            self.table.setHorizontalHeaderLabels(labels)
+            self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        if run_names != self._run_names:
+            self._run_names = list(run_names)
+            self.table.setVerticalHeaderLabels(run_names)
+
+        for row in range(values.shape[0]):
+            for col in range(values.shape[1]):
+                value = values[row, col]
+                text = "-" if np.isnan(value) else f"{value:.2f}"
+                item = self.table.item(row, col)
+                if item is None:
+                    self.table.setItem(row, col, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
@@ -1,14 +1,19 @@
 # iLogger/ui/widgets/custom_plot_widget.py
 
 import pyqtgraph as pg
-from pyqtgraph import exporters
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QComboBox, QPushButton, QLabel, QGridLayout, QLineEdit
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QComboBox, QPushButton, QLabel, QGridLayout, QLineEdit, QMessageBox
 from PyQt6.QtCore import Qt
 from .filter_control_panel import FilterControlPanel
-from config import CUSTOM_PLOT_AXES_OPTIONS
+from .crosshair import Crosshair
+from config import CUSTOM_PLOT_AXES_OPTIONS, KEY_DELTA_T, KEY_DIST_M, KEY_TEMPO_S
+from services import resampling_service, expression_service
+from data.run_data import GROUP_MEAN, GROUP_SUM
 import numpy as np
 from scipy import signal
 
+# Colunas do CSV exibidas na taxa completa, com eixo de tempo próprio
+RAW_FULL_RATE = 'completa'
+
 class CustomPlotWidget(QWidget):
     """
     Widget para a aba de Gráfico Personalizado, usando pyqtgraph
@@ -45,6 +50,11 @@ class CustomPlotWidget(QWidget):
         # Combo para escolher onde aplicar o filtro
         self.combo_filter_target = QComboBox()
         self.combo_filter_target.addItems(["Nenhum", "Eixo Y (Primário)", "Eixo Y (Secundário)", "Ambos"]) 
+        # Como as colunas do CSV (taxa completa) entram no gráfico
+        self.combo_raw_mode = QComboBox()
+        self.combo_raw_mode.addItem("Agrupada na base de tempo (média)", GROUP_MEAN)
+        self.combo_raw_mode.addItem("Agrupada na base de tempo (soma)", GROUP_SUM)
+        self.combo_raw_mode.addItem("Taxa completa (eixo de tempo próprio)", RAW_FULL_RATE)
 
         # --- Layout dos Controles ---
         controls_layout.addWidget(QLabel("Eixo X:"), 0, 0)
@@ -79,6 +89,25 @@ class CustomPlotWidget(QWidget):
         controls_layout.addWidget(self.line_tgt_min, 11, 1)
         controls_layout.addWidget(QLabel("Target Max:"), 12, 0)
         controls_layout.addWidget(self.line_tgt_max, 12, 1)
+        controls_layout.addWidget(QLabel("Colunas do CSV:"), 13, 0)
+        controls_layout.addWidget(self.combo_raw_mode, 13, 1)
+
+        # Canais calculados a partir de expressões (ex: rpm / vel * 0.1)
+        self.line_expr_name = QLineEdit()
+        self.line_expr_name.setPlaceholderText("Nome do canal (ex: Relação CVT)")
+        self.line_expr = QLineEdit()
+        self.line_expr.setPlaceholderText("Expressão (ex: rpm / vel * 0.1 ou {RPM (Filtrado)} * 2)")
+        self.line_expr.setToolTip(
+            "Apelidos: " + ", ".join(expression_service.EXPRESSION_ALIASES) +
+            ". Colunas do CSV pelo nome; outros canais entre chaves.\nFunções: " +
+            ", ".join(expression_service.EXPRESSION_FUNCTIONS)
+        )
+        self.btn_add_expression = QPushButton("Adicionar Canal Calculado")
+        controls_layout.addWidget(QLabel("Canal Calculado:"), 14, 0)
+        controls_layout.addWidget(self.line_expr_name, 14, 1)
+        controls_layout.addWidget(QLabel("Expressão:"), 15, 0)
+        controls_layout.addWidget(self.line_expr, 15, 1)
+        controls_layout.addWidget(self.btn_add_expression, 16, 0, 1, 2)
         
         # --- Widget de Gráfico (pyqtgraph) ---
         self.plot_widget = pg.PlotWidget()
@@ -97,14 +126,19 @@ class CustomPlotWidget(QWidget):
         self.p1.scene().addItem(self.p2)
         self.p1.getAxis('right').linkToView(self.p2)
         self.p2.setXLink(self.p1)
+
+        # Cursor sincronizado com os demais gráficos (apenas quando o eixo X é o tempo)
+        self.crosshair = Crosshair(self.p1, self.plot_widget.scene(), self)
         
         main_layout.addLayout(controls_layout)
         main_layout.addWidget(self.plot_widget)
         
         self.btn_update.clicked.connect(self.update_plot)
         self.btn_add_mapping.clicked.connect(self.add_mapping)
+        self.btn_add_expression.clicked.connect(self.add_expression_channel)
         self.filter_controls.filter_changed.connect(self._on_filter_changed)
         self.p1.vb.sigResized.connect(self._update_views)
+        self.crosshair.moved.connect(self._on_crosshair_moved)
 
     def link_state(self, app_state):
         """
@@ -117,9 +151,22 @@ class CustomPlotWidget(QWidget):
             self.app_state.data_loaded.connect(self._refresh_available_columns)
         except Exception:
             pass
+        self.app_state.cursor_time_changed.connect(self._on_cursor_time_changed)
+        self.app_state.expression_channels_changed.connect(self._refresh_expression_channels)
         # Inicializa lista de colunas caso já haja dados
         self._refresh_available_columns()
 
+    def _x_is_time(self) -> bool:
+        return self.custom_mappings.get(self.combo_x.currentText(), self.combo_x.currentText()) == KEY_TEMPO_S
+
+    def _on_crosshair_moved(self, time_s: float):
+        if self.app_state and self._x_is_time():
+            self.app_state.set_cursor_time(time_s)
+
+    def _on_cursor_time_changed(self, time_s: float):
+        if self._x_is_time():
+            self.crosshair.set_time(time_s)
+
     def _refresh_available_columns(self):
         """Preenche `self.combo_columns` com os nomes de colunas do primeiro run (se houver)."""
         self.combo_columns.clear()
@@ -139,6 +186,11 @@ class CustomPlotWidget(QWidget):
         col = self.combo_columns.currentText().strip()
         if not name or not col:
             return
+        self._set_mapping(name, col)
+        # limpa o campo de texto
+        self.line_name.clear()
+
+    def _set_mapping(self, name: str, col: str):
         # armazena mapeamento
         self.custom_mappings[name] = col
         # adiciona o nome personalizado aos combos de seleção do gráfico, se ainda não existir
@@ -148,8 +200,56 @@ class CustomPlotWidget(QWidget):
         # atualiza label com os mapeamentos atuais
         mappings_text = ", ".join([f"{k} -> {v}" for k, v in self.custom_mappings.items()])
         self.lbl_mappings.setText(f"Mapeamentos: {mappings_text}")
-        # limpa o campo de texto
-        self.line_name.clear()
+
+    # --- Estado da Sessão ---
+    def get_session_state(self) -> dict:
+        """Mapeamentos, eixos e opções atuais (o filtro é salvo com os demais painéis)."""
+        return {
+            'mappings': dict(self.custom_mappings),
+            'axes': [self.combo_x.currentText(), self.combo_y1.currentText(), self.combo_y2.currentText()],
+            'filter_target': self.combo_filter_target.currentText(),
+            'raw_mode': self.combo_raw_mode.currentData(),
+            'rescale': [line.text() for line in (self.line_src_min, self.line_src_max, self.line_tgt_min, self.line_tgt_max)],
+        }
+
+    def restore_session_state(self, state: dict):
+        """Inverso de get_session_state; redesenha o gráfico se havia eixos escolhidos."""
+        for name, col in state.get('mappings', {}).items():
+            self._set_mapping(name, col)
+        for combo, text in zip((self.combo_x, self.combo_y1, self.combo_y2), state.get('axes', [])):
+            if combo.findText(text) != -1:
+                combo.setCurrentText(text)
+        if self.combo_filter_target.findText(state.get('filter_target', '')) != -1:
+            self.combo_filter_target.setCurrentText(state['filter_target'])
+        raw_mode_index = self.combo_raw_mode.findData(state.get('raw_mode'))
+        if raw_mode_index != -1:
+            self.combo_raw_mode.setCurrentIndex(raw_mode_index)
+        for line, text in zip((self.line_src_min, self.line_src_max, self.line_tgt_min, self.line_tgt_max),
+                              state.get('rescale', [])):
+            line.setText(text)
+        if self.app_state and self.app_state.raw_runs:
+            self.update_plot()
+
+    def add_expression_channel(self):
+        """Valida a expressão e a registra como canal calculado disponível em todos os eixos."""
+        name = self.line_expr_name.text().strip()
+        text = self.line_expr.text().strip()
+        if not name or not text or not self.app_state:
+            return
+        try:
+            expression_service.compile_expression(text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Expressão Inválida", str(e))
+            return
+        self.app_state.set_expression_channel(name, text)
+        self.line_expr_name.clear()
+        self.line_expr.clear()
+
+    def _refresh_expression_channels(self):
+        for name in self.app_state.expression_channels:
+            for combo in (self.combo_x, self.combo_y1, self.combo_y2):
+                if combo.findText(name) == -1:
+                    combo.addItem(name)
 
     def _apply_filter_to_array(self, arr: np.ndarray, settings: dict) -> np.ndarray:
         """Aplica um filtro simples ao array com base nas configurações fornecidas.
@@ -207,6 +307,28 @@ class CustomPlotWidget(QWidget):
         scaled = (arr - src_min) / (src_max - src_min)
         return scaled * (tgt_max - tgt_min) + tgt_min
 
+    def _resample_on_distance_grid(self, keys: list, filter_settings: dict) -> dict:
+        """
+        Reamostra os canais pedidos na grade de distância comum. Retorna {chave: matriz},
+        com uma linha por run, para que Delta-T e os demais eixos fiquem ponto a ponto alinhados.
+        """
+        runs = self.app_state.raw_runs
+        series = {}
+        for key in set(k for k in keys if k):
+            if key == KEY_DELTA_T:
+                _, series[key] = resampling_service.compute_delta_t(runs, self.app_state.reference_run(), filter_settings)
+            else:
+                try:
+                    grid, matrix = resampling_service.resample_runs(
+                        runs, key, filter_settings, axis=resampling_service.AXIS_DISTANCE,
+                        expressions=self.app_state.expression_channels,
+                    )
+                except ValueError as e:
+                    self.app_state.status_message_changed.emit(str(e), 5000)
+                    grid, matrix = np.array([]), np.full((len(runs), 0), np.nan)
+                series[key] = np.tile(grid, (len(runs), 1)) if key == KEY_DIST_M else matrix
+        return series
+
     def _update_views(self):
         """Sincroniza a geometria da ViewBox secundária com a primária."""
         self.p2.setGeometry(self.p1.vb.sceneBoundingRect())
@@ -247,8 +369,44 @@ class CustomPlotWidget(QWidget):
         tgt_min = self.line_tgt_min.text().strip()
         tgt_max = self.line_tgt_max.text().strip()
 
+        # Delta-T só existe sobre a grade de distância comum: nesse caso todos os eixos são reamostrados nela
+        distance_series = None
+        if KEY_DELTA_T in (x_key_resolved, y1_key_resolved, y2_key_resolved):
+            distance_series = self._resample_on_distance_grid(
+                [x_key_resolved, y1_key_resolved, y2_key_resolved], fs or self.filter_controls.get_settings()
+            )
+
+        raw_mode = self.combo_raw_mode.currentData()
+        expressions = self.app_state.expression_channels
+        expression_settings = fs or self.filter_controls.get_settings()
+
+        def get_series(run_idx, run, key, full_rate):
+            if distance_series is not None:
+                return distance_series[key][run_idx]
+            if key in expressions:
+                try:
+                    return expression_service.evaluate_channel(run, key, expressions, expression_settings)
+                except ValueError as e:
+                    self.app_state.status_message_changed.emit(str(e), 5000)
+                    return np.array([])
+            if run.is_raw_column(key):
+                if full_rate:
+                    return run.get_raw_column(key)
+                return run.get_grouped_column(key, GROUP_MEAN if raw_mode == RAW_FULL_RATE else raw_mode)
+            if full_rate and key == KEY_TEMPO_S:
+                return run.raw_time_s
+            return run.get_data_for_custom_plot(key)
+
+        def get_pair(run_idx, run, x_key, y_key):
+            # A taxa completa só vale para curvas de colunas do CSV contra o tempo (ou entre si);
+            # combinadas a canais calculados, as colunas são agregadas na base de tempo `time_s`
+            full_rate = raw_mode == RAW_FULL_RATE and all(
+                key == KEY_TEMPO_S or run.is_raw_column(key) for key in (x_key, y_key)
+            )
+            return get_series(run_idx, run, x_key, full_rate), get_series(run_idx, run, y_key, full_rate)
+
         for i, run in enumerate(self.app_state.raw_runs):
-            x_data, y_data = run.get_data_for_custom_plot(x_key_resolved), run.get_data_for_custom_plot(y1_key_resolved)
+            x_data, y_data = get_pair(i, run, x_key_resolved, y1_key_resolved)
             # Aplica filtro se for o alvo
             if filter_target in ("Eixo Y (Primário)", "Ambos") and fs:
                 y_data = self._apply_filter_to_array(y_data, fs)
@@ -265,7 +423,7 @@ class CustomPlotWidget(QWidget):
             self.p2.setVisible(True)
 
             for i, run in enumerate(self.app_state.raw_runs):
-                x_data, y_data = run.get_data_for_custom_plot(x_key_resolved), run.get_data_for_custom_plot(y2_key_resolved)
+                x_data, y_data = get_pair(i, run, x_key_resolved, y2_key_resolved)
                 # filtro para eixo secundário
                 if filter_target in ("Eixo Y (Secundário)", "Ambos") and fs:
                     y_data = self._apply_filter_to_array(y_data, fs)
@@ -286,8 +444,6 @@ class CustomPlotWidget(QWidget):
         self.p2.clear()
         if self.legend:
             self.legend.clear()
-
-    def get_figure_for_report(self):
-        """Exporta o layout gráfico atual como uma imagem."""
-        exporter = exporters.ImageExporter(self.plot_widget.scene())
-        return exporter.export(toBytes=True)
\ No newline at end of file
+        # O cursor sobrevive ao redesenho, mas só é exibido com o tempo no eixo X
+        self.crosshair.line.hide()
+        self.p1.addItem(self.crosshair.line, ignoreBounds=True)
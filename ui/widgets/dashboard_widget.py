@@ -2,13 +2,29 @@
 
 import math
 import pyqtgraph as pg
-from pyqtgraph import exporters
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QCheckBox, QPushButton, QGroupBox, QHBoxLayout
 )
 
 from config import *
+from services import region_stats_service, resampling_service, cursor_service
 from .filter_control_panel import FilterControlPanel
+from .region_stats_panel import RegionStatsPanel
+from .envelope_view import EnvelopeControls, plot_envelope
+from .plot_data_provider import PlotDataProvider, PersistentCurves
+from .crosshair import Crosshair, CursorReadoutPanel
+
+
+class DashboardCell:
+    """Célula persistente do dashboard: gráfico, provedor LOD, curvas e região de seleção."""
+    def __init__(self, key: str, plot_item, parent=None):
+        self.key = key
+        self.plot_item = plot_item
+        self.data_provider = PlotDataProvider(plot_item, parent)
+        self.curves = PersistentCurves(plot_item, self.data_provider)
+        self.region_item = None
+        self.crosshair = None
+
 
 class DashboardWidget(QWidget):
     """
@@ -19,6 +35,14 @@ class DashboardWidget(QWidget):
         super().__init__(parent)
         self.app_state = None
         self.filter_settings = {}
+        # Regiões de seleção (uma por célula, mantidas sincronizadas)
+        self.region_items = []
+        self.region_bounds = None
+        # Células persistentes da grade, por tipo de gráfico (ver plot_keys_map)
+        self.cells = {}
+        self.empty_label = None
+        self.pens = [pg.mkPen(color=c, width=2) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
+        self.highlight_pen = pg.mkPen(color='#d62728', width=2)
         
         # --- Layout Principal ---
         main_layout = QHBoxLayout(self)
@@ -37,15 +61,18 @@ class DashboardWidget(QWidget):
             'velocidade': ("Velocidade", KEY_VEL_KMH_FILT, "Km/h"),
             'aceleracao': ("Aceleração", KEY_ACEL_MS2_FILT, "m/s²"),
             'distancia': ("Distância", KEY_DIST_M, "m"),
+            'delta_t': ("Delta-T vs Referência", KEY_DELTA_T, "s"),
         }
+        # Células cujo eixo X é a distância (grade comum) em vez do tempo
+        self.distance_axis_keys = {'delta_t'}
         
         for key, (name, _, _) in self.plot_keys_map.items():
             cb = QCheckBox(name)
-            cb.setChecked(True)
+            cb.setChecked(key not in self.distance_axis_keys)
             self.checkboxes[key] = cb
             selection_layout.addWidget(cb)
         
-        # Botão para forçar a atualização, embora também atualize com o filtro
+        # Botão para forçar a atualização (checkboxes e filtro já atualizam a grade)
         self.btn_update = QPushButton("Atualizar Dashboard")
         
         content_layout.addWidget(selection_group)
@@ -55,72 +82,264 @@ class DashboardWidget(QWidget):
         self.graphics_layout = pg.GraphicsLayoutWidget()
         content_layout.addWidget(self.graphics_layout)
         
-        # --- Painel de Filtro ---
+        # --- Painel de Filtro e Seleção de Região ---
+        side_panel = QWidget()
+        side_panel.setFixedWidth(250)
+        side_layout = QVBoxLayout(side_panel)
+        side_layout.setContentsMargins(0, 0, 0, 0)
         self.filter_controls = FilterControlPanel()
-        self.filter_controls.setFixedWidth(250)
+        self.region_panel = RegionStatsPanel()
+        self.envelope_controls = EnvelopeControls()
+        self.cursor_panel = CursorReadoutPanel()
+        side_layout.addWidget(self.filter_controls)
+        side_layout.addWidget(self.region_panel)
+        side_layout.addWidget(self.envelope_controls)
+        side_layout.addWidget(self.cursor_panel)
         
         main_layout.addWidget(content_widget)
-        main_layout.addWidget(self.filter_controls)
+        main_layout.addWidget(side_panel)
 
         # --- Conexões ---
         self.btn_update.clicked.connect(self.update_plot)
         self.filter_controls.filter_changed.connect(self._on_filter_changed)
+        self.region_panel.enabled_changed.connect(self._on_region_toggled)
+        self.envelope_controls.changed.connect(self.update_plot)
+        self.cursor_panel.enabled_changed.connect(self._on_cursor_toggled)
+        for key, cb in self.checkboxes.items():
+            cb.toggled.connect(lambda checked, k=key: self._on_cell_toggled(k, checked))
 
-    def link_state(self, app_state):
+    def link_state(self, app_state, update_scheduler=None):
         """Recebe o AppState da MainWindow."""
         self.app_state = app_state
-        self.app_state.data_loaded.connect(self.update_plot)
+        # Com agendador, a aba só é redesenhada quando estiver visível
+        request_update = update_scheduler.slot_for(self, self.update_plot) if update_scheduler else self.update_plot
+        self.app_state.data_loaded.connect(request_update)
+        self.app_state.alignment_changed.connect(request_update)
+        self.app_state.cursor_time_changed.connect(self._on_cursor_time_changed)
         self.filter_settings = self.filter_controls.get_settings()
-        self.update_plot()
+        request_update()
 
     def _on_filter_changed(self, settings: dict):
         self.filter_settings = settings
         self.update_plot()
+        self._update_cursor_readout()
 
-    def update_plot(self):
-        """Redesenha a grade do dashboard com os gráficos selecionados."""
-        self.graphics_layout.clear()
-        
-        selected_keys = [key for key, cb in self.checkboxes.items() if cb.isChecked()]
-        
-        if not self.app_state or not self.app_state.raw_runs or not selected_keys:
-            self.graphics_layout.addLabel("Sem dados para exibir.", row=0, col=0)
+    def _selected_keys(self) -> list:
+        return [key for key, cb in self.checkboxes.items() if cb.isChecked()]
+
+    def _has_data(self) -> bool:
+        return bool(self.app_state and self.app_state.raw_runs)
+
+    # --- Células Persistentes ---
+    def _create_cell(self, key: str) -> DashboardCell:
+        title, _, y_label = self.plot_keys_map[key]
+        plot_item = pg.PlotItem(title=title)
+        plot_item.setLabel('left', y_label)
+        plot_item.setLabel('bottom', 'Distância (m)' if key in self.distance_axis_keys else 'Tempo (s)')
+        plot_item.showGrid(x=True, y=True, alpha=0.3)
+        cell = DashboardCell(key, plot_item, self)
+        self.cells[key] = cell
+        if key not in self.distance_axis_keys:
+            if self.region_panel.is_enabled():
+                self._add_region_item(cell)
+            cell.crosshair = Crosshair(plot_item, self.graphics_layout.scene(), self)
+            cell.crosshair.set_enabled(self.cursor_panel.is_enabled())
+            cell.crosshair.moved.connect(self._on_crosshair_moved)
+            if self.app_state and self.app_state.cursor_time is not None:
+                cell.crosshair.set_time(self.app_state.cursor_time)
+        return cell
+
+    def _remove_cell(self, key: str):
+        cell = self.cells.pop(key, None)
+        if cell is None:
+            return
+        if cell.region_item is not None:
+            self.region_items.remove(cell.region_item)
+        if cell.crosshair is not None:
+            cell.crosshair.detach()
+        cell.curves.clear()
+        cell.data_provider.release()
+        if cell.plot_item.scene() is not None:
+            self.graphics_layout.removeItem(cell.plot_item)
+
+    def _relayout(self):
+        """
+        Reposiciona as células existentes na grade (sem recriá-las) na ordem dos checkboxes.
+        Sem dados ou sem células, exibe apenas a mensagem de vazio.
+        """
+        for cell in self.cells.values():
+            if cell.plot_item.scene() is not None:
+                self.graphics_layout.removeItem(cell.plot_item)
+        if self.empty_label is not None:
+            self.graphics_layout.removeItem(self.empty_label)
+            self.empty_label = None
+
+        keys = [key for key in self.plot_keys_map if key in self.cells]
+        if not self._has_data() or not keys:
+            self.empty_label = self.graphics_layout.addLabel("Sem dados para exibir.", row=0, col=0)
             return
-            
-        n = len(selected_keys)
-        cols = int(math.ceil(math.sqrt(n))) if n > 0 else 1
-        
-        current_row, current_col = 0, 0
-        pens = [pg.mkPen(color=c, width=2) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
 
-        for run_idx, run in enumerate(self.app_state.raw_runs):
-            # Aplica o filtro do dashboard na run
-            run.apply_filters_and_recalculate(self.filter_settings)
+        cols = int(math.ceil(math.sqrt(len(keys))))
+        for i, key in enumerate(keys):
+            self.graphics_layout.addItem(self.cells[key].plot_item, row=i // cols, col=i % cols)
 
+    def _on_cell_toggled(self, key: str, checked: bool):
+        """Adiciona ou remove apenas a célula correspondente ao checkbox."""
+        if checked:
+            if key not in self.cells:
+                self._update_cell(self._create_cell(key))
+        else:
+            self._remove_cell(key)
+        self._relayout()
+        self._update_region_stats()
+
+    # --- Atualização dos Dados ---
+    def update_plot(self):
+        """
+        Atualiza os dados das células selecionadas. As células e suas curvas são mantidas
+        entre atualizações: mudanças de filtro, dados ou alinhamento só trocam os dados no lugar.
+        """
+        selected_keys = self._selected_keys()
+        for key in list(self.cells):
+            if key not in selected_keys:
+                self._remove_cell(key)
         for key in selected_keys:
-            if key in self.plot_keys_map:
-                title, data_key, y_label = self.plot_keys_map[key]
-                
-                # Adiciona um novo plot na grade do dashboard
-                p_new = self.graphics_layout.addPlot(row=current_row, col=current_col, title=title)
-                p_new.setLabel('left', y_label)
-                p_new.setLabel('bottom', 'Tempo (s)')
-                p_new.showGrid(x=True, y=True, alpha=0.3)
-
-                # Plota os dados de cada run neste mini-gráfico
-                for run_idx, run in enumerate(self.app_state.raw_runs):
-                    y_data = run.get_data_for_custom_plot(data_key)
-                    if run.time_s.size > 0 and y_data.size > 0:
-                        p_new.plot(run.time_s, y_data, pen=pens[run_idx % len(pens)])
-                
-                current_col += 1
-                if current_col >= cols:
-                    current_col = 0
-                    current_row += 1
-
-    def get_figure_for_report(self):
-        """Exporta o layout gráfico atual como uma imagem."""
-        if not self.graphics_layout.items():
-            return None
-        exporter = exporters.ImageExporter(self.graphics_layout.scene())
-        return exporter.export(toBytes=True)
\ No newline at end of file
+            if key not in self.cells:
+                self._create_cell(key)
+
+        if self._has_data():
+            self.envelope_controls.set_runs([run.file_name for run in self.app_state.raw_runs])
+        for cell in self.cells.values():
+            self._update_cell(cell)
+
+        self._relayout()
+        self._update_region_stats()
+
+    def _update_cell(self, cell: DashboardCell):
+        """Sincroniza as curvas de uma célula com as runs, o filtro e o modo envelope atuais."""
+        cell.curves.clear_transient()
+        if not self._has_data():
+            cell.curves.sync([])
+            return
+
+        runs = self.app_state.raw_runs
+        _, data_key, _ = self.plot_keys_map[cell.key]
+        envelope_mode = self.envelope_controls.is_enabled()
+        highlighted = self.envelope_controls.highlighted_index()
+
+        if cell.key in self.distance_axis_keys:
+            grid, delta_t = resampling_service.compute_delta_t(
+                runs, self.app_state.reference_run(), self.filter_settings
+            )
+            if envelope_mode:
+                cell.curves.sync([])
+                for item in plot_envelope(cell.plot_item, grid, resampling_service.compute_percentile_envelope(delta_t)):
+                    cell.curves.add_transient(item)
+                if 0 <= highlighted < delta_t.shape[0]:
+                    cell.curves.add_transient(cell.plot_item.plot(grid, delta_t[highlighted], pen=self.highlight_pen))
+            else:
+                cell.curves.sync([
+                    (run.file_path, (grid, delta_t[run_idx]), 0.0, self.pens[run_idx % len(self.pens)], None)
+                    for run_idx, run in enumerate(runs)
+                ])
+            return
+
+        if envelope_mode:
+            cell.curves.sync([])
+            grid, bands = resampling_service.resample_envelope(runs, data_key, self.filter_settings)
+            for item in plot_envelope(cell.plot_item, grid, bands):
+                cell.curves.add_transient(item)
+            if 0 <= highlighted < len(runs):
+                run = runs[highlighted]
+                run.apply_filters_and_recalculate(self.filter_settings)
+                cell.curves.add_transient(cell.plot_item.plot(
+                    run.aligned_time_s, run.get_data_for_custom_plot(data_key), pen=self.highlight_pen
+                ))
+        else:
+            # Os dados de cada run são servidos pela pirâmide LOD da célula
+            cell.curves.sync([
+                (run.file_path, run.get_lod_pyramid(data_key, self.filter_settings), run.time_offset_s,
+                 self.pens[run_idx % len(self.pens)], None)
+                for run_idx, run in enumerate(runs) if run.time_s.size > 0
+            ])
+
+    # --- Seleção de Região ---
+    def _on_region_toggled(self, checked: bool):
+        """Adiciona ou remove as regiões das células de tempo, sem redesenhar as curvas."""
+        for cell in self.cells.values():
+            if cell.key in self.distance_axis_keys:
+                continue
+            if checked and cell.region_item is None:
+                self._add_region_item(cell)
+            elif not checked and cell.region_item is not None:
+                cell.plot_item.removeItem(cell.region_item)
+                self.region_items.remove(cell.region_item)
+                cell.region_item = None
+        self._update_region_stats()
+
+    def _add_region_item(self, cell: DashboardCell):
+        """Adiciona à célula uma região ligada às demais células do dashboard."""
+        if self.region_bounds is None:
+            x_min, x_max = cell.plot_item.viewRange()[0]
+            span = x_max - x_min
+            self.region_bounds = (x_min + span / 3, x_max - span / 3)
+        region = pg.LinearRegionItem(values=self.region_bounds)
+        region.setZValue(10)
+        region.sigRegionChanged.connect(self._on_region_changed)
+        cell.plot_item.addItem(region, ignoreBounds=True)
+        cell.region_item = region
+        self.region_items.append(region)
+
+    def _on_region_changed(self, source):
+        self.region_bounds = source.getRegion()
+        for region in self.region_items:
+            if region is not source:
+                region.blockSignals(True)
+                region.setRegion(self.region_bounds)
+                region.blockSignals(False)
+        self._update_region_stats()
+
+    def _update_region_stats(self):
+        if not self.region_items or not self._has_data():
+            return
+        channels = {
+            self.plot_keys_map[key][0]: self.plot_keys_map[key][1]
+            for key in self.cells if key not in self.distance_axis_keys
+        }
+        t_start, t_end = self.region_bounds
+        stats_df = region_stats_service.compute_region_stats(
+            self.app_state.raw_runs, channels, self.filter_settings, t_start, t_end
+        )
+        self.region_panel.set_stats(t_start, t_end, stats_df)
+
+    # --- Cursor Sincronizado ---
+    def _on_crosshair_moved(self, time_s: float):
+        if self.app_state:
+            self.app_state.set_cursor_time(time_s)
+
+    def _on_cursor_time_changed(self, time_s: float):
+        for cell in self.cells.values():
+            if cell.crosshair is not None:
+                cell.crosshair.set_time(time_s)
+        # A leitura só é atualizada com a aba visível; ao ser exibida ela é atualizada
+        if self.isVisible():
+            self._update_cursor_readout()
+
+    def _on_cursor_toggled(self, checked: bool):
+        for cell in self.cells.values():
+            if cell.crosshair is not None:
+                cell.crosshair.set_enabled(checked)
+        self._update_cursor_readout()
+
+    def _update_cursor_readout(self):
+        if not self.cursor_panel.is_enabled() or not self._has_data() or self.app_state.cursor_time is None:
+            return
+        t = self.app_state.cursor_time
+        values = cursor_service.values_at_time(self.app_state.raw_runs, t, self.filter_settings)
+        self.cursor_panel.set_values(
+            t, [run.file_name for run in self.app_state.raw_runs], list(cursor_service.CURSOR_CHANNELS), values
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_cursor_readout()
@@ -0,0 +1,91 @@
+# iLogger/ui/widgets/dataframe_model.py
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Modelo de tabela sobre um DataFrame numérico. Nenhum item é criado por célula: os
+    valores são formatados sob demanda em `data()` (apenas as células visíveis) e a
+    ordenação permuta índices calculados sobre o array subjacente.
+    """
+    def __init__(self, parent=None, decimals: int = 2):
+        super().__init__(parent)
+        self.decimals = decimals
+        self._values = np.empty((0, 0))
+        self._columns = []
+        self._index = []
+        # Permutação das linhas exibidas (ordenação) sobre as linhas do DataFrame
+        self._order = np.arange(0)
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_dataframe(self, df: pd.DataFrame):
+        """
+        Troca os dados exibidos. Com o mesmo formato e cabeçalhos, apenas sinaliza a mudança
+        dos valores; o reset completo do modelo só ocorre quando o formato muda.
+        """
+        values = df.to_numpy(dtype=float, na_value=np.nan) if not df.empty else np.empty((0, 0))
+        columns = [str(c) for c in df.columns]
+        index = [str(i) for i in df.index]
+        same_shape = values.shape == self._values.shape and columns == self._columns
+
+        if not same_shape:
+            self.beginResetModel()
+        self._values, self._columns, self._index = values, columns, index
+        self._order = np.arange(values.shape[0])
+        if not same_shape:
+            self._sort_column = -1
+            self.endResetModel()
+            return
+
+        if self._sort_column >= 0:
+            self.layoutAboutToBeChanged.emit()
+            self._apply_sort()
+            self.layoutChanged.emit()
+        if values.size:
+            self.dataChanged.emit(self.index(0, 0), self.index(values.shape[0] - 1, values.shape[1] - 1))
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, values.shape[0] - 1)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._values.shape[0]
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._values.shape[1] if self._values.ndim == 2 else 0
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._values[self._order[index.row()], index.column()]
+            return "-" if np.isnan(value) else f"{value:.{self.decimals}f}"
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._columns[section] if section < len(self._columns) else None
+        return self._index[self._order[section]] if section < len(self._order) else None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < self.columnCount():
+            return
+        self._sort_column, self._sort_order = column, order
+        self.layoutAboutToBeChanged.emit()
+        self._apply_sort()
+        self.layoutChanged.emit()
+
+    def source_row(self, row: int) -> int:
+        """Linha do DataFrame exibida na posição `row` (considera a ordenação atual)."""
+        return int(self._order[row])
+
+    def _apply_sort(self):
+        # Ordenação estável sobre a coluna do array; NaN sempre ao final
+        column = self._values[:, self._sort_column]
+        keys = -column if self._sort_order == Qt.SortOrder.DescendingOrder else column
+        self._order = np.argsort(keys, kind='stable')
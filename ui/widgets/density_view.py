@@ -0,0 +1,35 @@
+# iLogger/ui/widgets/density_view.py
+
+from PyQt6.QtWidgets import QGroupBox, QVBoxLayout, QCheckBox
+from PyQt6.QtCore import pyqtSignal
+
+
+class DensityControls(QGroupBox):
+    """
+    Controles do modo densidade: substitui as linhas de cada run por um mapa de calor
+    com a contagem de amostras e permite sobrepor a curva mediana de cada run.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__("Modo Densidade", parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.chk_enabled = QCheckBox("Mostrar mapa de densidade")
+        self.chk_median = QCheckBox("Curva mediana por RUN")
+        self.chk_median.setChecked(True)
+        self.chk_median.setEnabled(False)
+
+        layout.addWidget(self.chk_enabled)
+        layout.addWidget(self.chk_median)
+
+        self.chk_enabled.toggled.connect(self.chk_median.setEnabled)
+        self.chk_enabled.toggled.connect(self.changed.emit)
+        self.chk_median.toggled.connect(self.changed.emit)
+
+    def is_enabled(self) -> bool:
+        return self.chk_enabled.isChecked()
+
+    def show_median_curves(self) -> bool:
+        return self.chk_median.isChecked()
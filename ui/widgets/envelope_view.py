@@ -0,0 +1,68 @@
+# iLogger/ui/widgets/envelope_view.py
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtWidgets import QGroupBox, QGridLayout, QCheckBox, QComboBox, QLabel
+from PyQt6.QtCore import pyqtSignal
+
+
+class EnvelopeControls(QGroupBox):
+    """
+    Controles do modo envelope: substitui as N curvas por mediana + banda p10–p90
+    e permite destacar uma run específica sob demanda.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__("Modo Envelope", parent)
+        layout = QGridLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.chk_enabled = QCheckBox("Mostrar mediana e banda p10–p90")
+        self.combo_highlight = QComboBox()
+        self.combo_highlight.addItem("Nenhuma")
+
+        layout.addWidget(self.chk_enabled, 0, 0, 1, 2)
+        layout.addWidget(QLabel("Destacar RUN:"), 1, 0)
+        layout.addWidget(self.combo_highlight, 1, 1)
+
+        self.chk_enabled.toggled.connect(self.changed.emit)
+        self.combo_highlight.currentIndexChanged.connect(self.changed.emit)
+
+    def is_enabled(self) -> bool:
+        return self.chk_enabled.isChecked()
+
+    def highlighted_index(self) -> int:
+        """Índice da run destacada ou -1 se nenhuma."""
+        return self.combo_highlight.currentIndex() - 1
+
+    def set_runs(self, run_names: list):
+        """Sincroniza a lista de runs disponíveis para destaque, preservando a seleção se possível."""
+        current = [self.combo_highlight.itemText(i) for i in range(1, self.combo_highlight.count())]
+        if current == run_names:
+            return
+        self.combo_highlight.blockSignals(True)
+        self.combo_highlight.clear()
+        self.combo_highlight.addItem("Nenhuma")
+        self.combo_highlight.addItems(run_names)
+        self.combo_highlight.blockSignals(False)
+
+
+def plot_envelope(plot_item, grid: np.ndarray, bands: np.ndarray, color='#1f77b4', name: str = None):
+    """
+    Desenha a banda (primeira e última linhas de `bands`) como FillBetweenItem e a mediana
+    (linha central) como curva. O custo de renderização é de 3 curvas, independente do número de runs.
+    Retorna os itens criados para que o chamador possa removê-los no próximo redesenho.
+    """
+    if grid.size == 0 or bands.shape[-1] != grid.size:
+        return []
+    lower = pg.PlotDataItem(grid, bands[0], pen=pg.mkPen(color=color, width=1))
+    upper = pg.PlotDataItem(grid, bands[-1], pen=pg.mkPen(color=color, width=1))
+    fill_color = pg.mkColor(color)
+    fill_color.setAlpha(60)
+    fill = pg.FillBetweenItem(lower, upper, brush=pg.mkBrush(fill_color))
+    plot_item.addItem(lower)
+    plot_item.addItem(upper)
+    plot_item.addItem(fill)
+    median = plot_item.plot(grid, bands[len(bands) // 2], pen=pg.mkPen(color=color, width=2), name=name)
+    return [lower, upper, fill, median]
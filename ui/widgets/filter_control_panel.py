@@ -5,8 +5,19 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from functools import partial
+import json
 from config import *
 
+# Chave das configurações -> (slider, escala do valor no slider); inverso de get_settings
+_SETTING_SLIDERS = {
+    'butter_order': ('butter_order_slider', 1), 'butter_cutoff': ('butter_cutoff_slider', 100),
+    'savgol_window': ('savgol_window_slider', 1), 'savgol_polyorder': ('savgol_poly_slider', 1),
+    'cheby1_order': ('cheby1_order_slider', 1), 'cheby1_rp': ('cheby1_rp_slider', 1),
+    'cheby1_cutoff': ('cheby1_cutoff_slider', 100),
+    'bessel_order': ('bessel_order_slider', 1), 'bessel_cutoff': ('bessel_cutoff_slider', 100),
+    'median_kernel': ('median_kernel_slider', 1), 'moving_avg_window': ('ma_window_slider', 1),
+}
+
 class FilterControlPanel(QWidget):
     """
     Painel de controle de filtros.
@@ -32,6 +43,10 @@ class FilterControlPanel(QWidget):
         
         self.filter_widgets = {}
         self.value_labels = {}
+        # Nomes dos sliders de cada filtro (usados para montar configurações vizinhas)
+        self.filter_sliders = {}
+        # Suprime as emissões intermediárias enquanto set_settings move vários controles
+        self._restoring = False
 
         self._create_butterworth_controls()
         self._create_savgol_controls()
@@ -89,6 +104,7 @@ class FilterControlPanel(QWidget):
     def _add_filter_controls(self, filter_name, controls_to_add, start_row):
         """Adiciona um grupo de widgets de filtro ao layout e ao dicionário."""
         self.filter_widgets[filter_name] = []
+        self.filter_sliders[filter_name] = list(controls_to_add)
         row = start_row
         for (name, params) in controls_to_add.items():
             label, slider, value_label = self._add_slider_control(row, name, **params)
@@ -148,32 +164,76 @@ class FilterControlPanel(QWidget):
             for widget in widgets:
                 widget.setVisible(is_visible)
 
-    def get_settings(self) -> dict:
+    def get_settings(self, overrides: dict = None) -> dict:
+        """
+        Retorna as configurações do filtro atual. `overrides` (nome do slider -> valor)
+        permite montar as configurações de posições hipotéticas dos sliders.
+        """
+        overrides = overrides or {}
+        value = lambda name: overrides.get(name, getattr(self, name).value())
         filter_type = self.filter_type_combo.currentText()
         settings = {'type': filter_type}
 
         if filter_type == 'butterworth':
-            settings['butter_order'] = self.butter_order_slider.value()
-            settings['butter_cutoff'] = self.butter_cutoff_slider.value() / 100.0
+            settings['butter_order'] = value('butter_order_slider')
+            settings['butter_cutoff'] = value('butter_cutoff_slider') / 100.0
         elif filter_type == 'savitzky_gola_y':
-            win = self.savgol_window_slider.value()
+            win = value('savgol_window_slider')
             settings['savgol_window'] = win + 1 if win % 2 == 0 else win
-            poly = self.savgol_poly_slider.value()
+            poly = value('savgol_poly_slider')
             settings['savgol_polyorder'] = min(poly, settings['savgol_window'] - 2)
         elif filter_type == 'chebyshev_type_i':
-            settings['cheby1_order'] = self.cheby1_order_slider.value()
-            settings['cheby1_rp'] = self.cheby1_rp_slider.value()
-            settings['cheby1_cutoff'] = self.cheby1_cutoff_slider.value() / 100.0
+            settings['cheby1_order'] = value('cheby1_order_slider')
+            settings['cheby1_rp'] = value('cheby1_rp_slider')
+            settings['cheby1_cutoff'] = value('cheby1_cutoff_slider') / 100.0
         elif filter_type == 'bessel':
-            settings['bessel_order'] = self.bessel_order_slider.value()
-            settings['bessel_cutoff'] = self.bessel_cutoff_slider.value() / 100.0
+            settings['bessel_order'] = value('bessel_order_slider')
+            settings['bessel_cutoff'] = value('bessel_cutoff_slider') / 100.0
         elif filter_type == 'median':
-            k = self.median_kernel_slider.value()
+            k = value('median_kernel_slider')
             settings['median_kernel'] = k + 1 if k % 2 == 0 else k
         elif filter_type == 'moving_average':
-            settings['moving_avg_window'] = self.ma_window_slider.value()
+            settings['moving_avg_window'] = value('ma_window_slider')
 
         return settings
 
+    def neighbouring_settings(self, max_step: int = 1) -> list:
+        """
+        Configurações vizinhas da atual: cada slider do filtro ativo deslocado de ±1 a
+        ±max_step posições (dentro do intervalo), sem repetições nem a própria configuração atual.
+        """
+        current = self.get_settings()
+        seen = {json.dumps(current, sort_keys=True)}
+        neighbours = []
+        for step in range(1, max_step + 1):
+            for name in self.filter_sliders.get(current['type'], []):
+                widget = getattr(self, name)
+                for candidate in (widget.value() - step, widget.value() + step):
+                    if not widget.minimum() <= candidate <= widget.maximum():
+                        continue
+                    settings = self.get_settings({name: candidate})
+                    key = json.dumps(settings, sort_keys=True)
+                    if key not in seen:
+                        seen.add(key)
+                        neighbours.append(settings)
+        return neighbours
+
+    def set_settings(self, settings: dict):
+        """Posiciona o tipo e os sliders conforme `settings` (ex: de uma sessão salva) e emite uma única mudança."""
+        self._restoring = True
+        try:
+            if self.filter_type_combo.findText(settings.get('type', '')) != -1:
+                self.filter_type_combo.setCurrentText(settings['type'])
+            for key, value in settings.items():
+                if key in _SETTING_SLIDERS:
+                    name, scale = _SETTING_SLIDERS[key]
+                    getattr(self, name).setValue(int(round(value * scale)))
+        finally:
+            self._restoring = False
+        self._update_controls_visibility()
+        self.emit_filter_change()
+
     def emit_filter_change(self):
+        if self._restoring:
+            return
         self.filter_changed.emit(self.get_settings())
\ No newline at end of file
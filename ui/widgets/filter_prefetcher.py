@@ -0,0 +1,74 @@
+# iLogger/ui/widgets/filter_prefetcher.py
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal
+from config import PREFETCH_STEPS, PREFETCH_IDLE_DELAY_MS, PREFETCH_MAX_THREADS
+from data.run_data import filter_cache_stats
+
+
+class _PrefetchTask(QRunnable):
+    """Calcula, em segundo plano, as configurações vizinhas para todas as runs."""
+    def __init__(self, prefetcher, generation: int, runs: list, settings_list: list):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.generation = generation
+        self.runs = runs
+        self.settings_list = settings_list
+
+    def run(self):
+        added = 0
+        # A ordem (passo ±1 antes de ±2) prioriza as configurações mais prováveis
+        for settings in self.settings_list:
+            for run in self.runs:
+                # Uma nova mudança de filtro torna este lote obsoleto
+                if self.generation != self.prefetcher.generation:
+                    return
+                added += run.prefetch_filters(settings)
+        self.prefetcher.batch_finished.emit(added)
+
+
+class FilterPrefetcher(QObject):
+    """
+    Pré-calcula em tempo ocioso os resultados de filtro das posições vizinhas dos sliders
+    (±1..PREFETCH_STEPS) do painel de filtros visível, num pool de threads de baixa
+    prioridade. O próximo passo do slider costuma então ser um acerto no cache da run.
+    """
+    # Emitido ao fim de cada lote com o número de entradas adicionadas aos caches
+    batch_finished = pyqtSignal(int)
+
+    def __init__(self, app_state, parent=None):
+        super().__init__(parent)
+        self.app_state = app_state
+        self.generation = 0
+        self._filter_panel = None
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(PREFETCH_MAX_THREADS)
+        self.pool.setThreadPriority(QThread.Priority.LowestPriority)
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(PREFETCH_IDLE_DELAY_MS)
+        self._idle_timer.timeout.connect(self._start_batch)
+
+    def schedule(self, filter_panel):
+        """Agenda o pré-cálculo em torno da configuração atual de `filter_panel`."""
+        # Invalida o lote em andamento: só interessa a vizinhança da configuração mais recente
+        self.generation += 1
+        self._filter_panel = filter_panel
+        self._idle_timer.start()
+
+    def cancel(self):
+        self.generation += 1
+        self._idle_timer.stop()
+
+    def stats(self) -> dict:
+        """Contadores do cache de filtro (acertos, faltas, pré-calculados e taxa de acerto)."""
+        return filter_cache_stats()
+
+    def _start_batch(self):
+        runs = list(self.app_state.raw_runs) if self.app_state else []
+        if not runs or self._filter_panel is None:
+            return
+        settings_list = self._filter_panel.neighbouring_settings(PREFETCH_STEPS)
+        if settings_list:
+            self.pool.start(_PrefetchTask(self, self.generation, runs, settings_list), priority=-1)
@@ -0,0 +1,154 @@
+# iLogger/ui/widgets/job_queue.py
+
+import itertools
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+
+from services.export_job_service import JobContext, JobCancelled
+
+
+class _JobTask(QRunnable):
+    """Executa uma tarefa de exportação na thread do pool e repassa o resultado à fila."""
+    def __init__(self, queue, job_id: int, context: JobContext, func, args, kwargs):
+        super().__init__()
+        self.queue = queue
+        self.job_id = job_id
+        self.context = context
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            # Tarefas canceladas enquanto aguardavam na fila nem começam
+            self.context.check()
+            self.queue.job_started.emit(self.job_id)
+            message = self.func(self.context, *self.args, **self.kwargs)
+        except JobCancelled:
+            self.queue.job_cancelled.emit(self.job_id)
+        except Exception as e:
+            self.queue.job_failed.emit(self.job_id, f"{e}\n\n{traceback.format_exc()}")
+        else:
+            self.queue.job_finished.emit(self.job_id, message or "")
+
+
+class JobQueue(QObject):
+    """
+    Fila de tarefas de exportação em segundo plano. As tarefas rodam uma de cada vez, na
+    ordem de envio, numa thread própria; a interface continua livre enquanto isso. Cada
+    tarefa recebe um JobContext para informar o progresso por etapa e verificar o cancelamento.
+    Os sinais são entregues na thread da interface.
+    """
+    job_queued = pyqtSignal(int, str)
+    job_started = pyqtSignal(int)
+    job_progress = pyqtSignal(int, str, float)
+    job_finished = pyqtSignal(int, str)
+    job_failed = pyqtSignal(int, str)
+    job_cancelled = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._ids = itertools.count(1)
+        # id -> (título, contexto) das tarefas ainda não concluídas, em ordem de envio
+        self._jobs = {}
+        for signal in (self.job_finished, self.job_failed):
+            signal.connect(lambda job_id, _: self._jobs.pop(job_id, None))
+        self.job_cancelled.connect(lambda job_id: self._jobs.pop(job_id, None))
+
+    def submit(self, title: str, func, *args, **kwargs) -> int:
+        """
+        Enfileira `func(context, *args, **kwargs)`, que deve retornar uma mensagem de conclusão.
+        Os argumentos devem ser instantâneos do estado atual (a tarefa roda depois, em outra thread).
+        """
+        job_id = next(self._ids)
+        context = JobContext(on_progress=lambda stage, fraction: self.job_progress.emit(job_id, stage, fraction))
+        self._jobs[job_id] = (title, context)
+        self.job_queued.emit(job_id, title)
+        self.pool.start(_JobTask(self, job_id, context, func, args, kwargs))
+        return job_id
+
+    def cancel(self, job_id: int):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job[1].cancel()
+
+    def cancel_all(self):
+        for _, context in self._jobs.values():
+            context.cancel()
+
+    def title(self, job_id: int) -> str:
+        job = self._jobs.get(job_id)
+        return job[0] if job else ""
+
+    def pending_count(self) -> int:
+        return len(self._jobs)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """Aguarda o fim de todas as tarefas (ex: ao fechar a janela)."""
+        return self.pool.waitForDone(timeout_ms)
+
+
+class JobQueuePanel(QWidget):
+    """Indicador compacto da fila (para a barra de status): tarefa atual, etapa, progresso e cancelamento."""
+    def __init__(self, job_queue: JobQueue, parent=None):
+        super().__init__(parent)
+        self.job_queue = job_queue
+        self.current_job = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedWidth(160)
+        self.btn_cancel = QPushButton("Cancelar")
+        layout.addWidget(self.label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.btn_cancel)
+        self.hide()
+
+        self.btn_cancel.clicked.connect(self._cancel_current)
+        job_queue.job_queued.connect(self._refresh)
+        job_queue.job_started.connect(self._on_started)
+        job_queue.job_progress.connect(self._on_progress)
+        job_queue.job_finished.connect(self._on_done)
+        job_queue.job_failed.connect(self._on_done)
+        job_queue.job_cancelled.connect(self._on_done)
+
+    def _on_started(self, job_id: int):
+        self.current_job = job_id
+        self.progress_bar.setValue(0)
+        self._refresh()
+
+    def _on_progress(self, job_id: int, stage: str, fraction: float):
+        if job_id != self.current_job:
+            return
+        self.progress_bar.setValue(int(fraction * 100))
+        self._refresh(stage)
+
+    def _on_done(self, job_id: int, *_):
+        if job_id == self.current_job:
+            self.current_job = None
+        self._refresh()
+
+    def _refresh(self, *args):
+        pending = self.job_queue.pending_count()
+        if pending == 0:
+            self.hide()
+            return
+        stage = args[0] if args and isinstance(args[0], str) else None
+        text = self.job_queue.title(self.current_job) if self.current_job else "Aguardando"
+        if stage:
+            text += f" — {stage}"
+        waiting = pending - (1 if self.current_job else 0)
+        if waiting > 0:
+            text += f" (+{waiting} na fila)"
+        self.label.setText(text)
+        self.show()
+
+    def _cancel_current(self):
+        if self.current_job is not None:
+            self.job_queue.cancel(self.current_job)
@@ -0,0 +1,206 @@
+# iLogger/ui/widgets/live_view.py
+
+import os
+import time
+import pyqtgraph as pg
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QLineEdit, QPushButton, QFileDialog, QMessageBox,
+    QComboBox
+)
+from PyQt6.QtCore import Qt, QTimer, QSettings, pyqtSignal
+from config import *
+from services import telemetry_service
+from services.live_service import LiveRun, CsvTailSource
+from .filter_control_panel import FilterControlPanel
+
+
+class LiveView(QWidget):
+    """
+    Aba "Ao Vivo": acompanha uma RUN enquanto ela é gravada (CSV do logger) ou recebida
+    por telemetria (UDP ou serial, guardando os últimos TELEMETRY_HISTORY_S). A cada atualização
+    (LIVE_REFRESH_HZ) lê só as amostras novas da origem e redesenha os últimos
+    LIVE_PLOT_WINDOW_S segundos: canal bruto, filtro causal e refinamento de fase zero.
+    A origem é qualquer objeto com `name` e `read_new() -> (f1, f2, reiniciado)`.
+    """
+    publish_requested = pyqtSignal(object)  # RunData com as amostras recebidas até aqui
+
+    SOURCE_CSV = "CSV em Gravação"
+    SOURCE_UDP = "Telemetria UDP"
+    SOURCE_SERIAL = "Telemetria Serial"
+    # Tipo de origem -> (chave do último endereço no QSettings, valor padrão, dica do campo)
+    SOURCE_FIELDS = {
+        SOURCE_CSV: ("live_last_file", "", "CSV sendo gravado pelo logger"),
+        SOURCE_UDP: ("live_udp_address", f"{TELEMETRY_UDP_HOST}:{TELEMETRY_UDP_PORT}", "porta ou endereço:porta de escuta"),
+        SOURCE_SERIAL: ("live_serial_port", "", f"porta serial, ex: COM3 ou /dev/ttyUSB0@{TELEMETRY_SERIAL_BAUDRATE}"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.settings = QSettings("MangueBaja", "iLogger")
+        self.source = None
+        self.live_run = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / LIVE_REFRESH_HZ))
+        self.timer.timeout.connect(self._poll)
+
+        main_layout = QHBoxLayout(self)
+        content_layout = QVBoxLayout()
+
+        source_group = QGroupBox("Origem")
+        source_layout = QHBoxLayout(source_group)
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(list(self.SOURCE_FIELDS))
+        self.txt_path = QLineEdit()
+        self.btn_choose = QPushButton("...")
+        self.btn_start = QPushButton("Iniciar")
+        self.btn_stop = QPushButton("Parar")
+        self.btn_publish = QPushButton("Enviar para Análise")
+        self.btn_stop.setEnabled(False)
+        self.btn_publish.setEnabled(False)
+        source_layout.addWidget(self.source_combo)
+        source_layout.addWidget(self.txt_path, stretch=1)
+        source_layout.addWidget(self.btn_choose)
+        source_layout.addWidget(self.btn_start)
+        source_layout.addWidget(self.btn_stop)
+        source_layout.addWidget(self.btn_publish)
+        content_layout.addWidget(source_group)
+
+        self.plot_layout = pg.GraphicsLayoutWidget()
+        self.curves = {}
+        for row, (title, unit, raw_field, causal_field, refined_field) in enumerate((
+            ("Rotação", "RPM", 'rpm_raw', 'rpm_causal', 'rpm_filtered'),
+            ("Velocidade", "Km/h", 'velocity_raw_kmh', 'velocity_causal_kmh', 'velocity_filtered_kmh'),
+        )):
+            plot_item = self.plot_layout.addPlot(row=row, col=0, title=title)
+            plot_item.setLabel('left', unit)
+            plot_item.setLabel('bottom', "Tempo (s)")
+            plot_item.showGrid(x=True, y=True, alpha=0.3)
+            plot_item.addLegend(offset=(10, 10))
+            self.curves[raw_field] = plot_item.plot(
+                pen=pg.mkPen(color='#7f7f7f', style=Qt.PenStyle.DotLine), name="Bruto")
+            self.curves[causal_field] = plot_item.plot(pen=pg.mkPen(color='#ff7f0e', width=2), name="Causal")
+            self.curves[refined_field] = plot_item.plot(pen=pg.mkPen(color='#1f77b4', width=2), name="Refinado")
+        content_layout.addWidget(self.plot_layout, stretch=1)
+
+        self.lbl_status = QLabel("Parado.")
+        content_layout.addWidget(self.lbl_status)
+        main_layout.addLayout(content_layout, stretch=1)
+
+        side_panel = QWidget()
+        side_panel.setFixedWidth(250)
+        side_layout = QVBoxLayout(side_panel)
+        side_layout.setContentsMargins(0, 0, 0, 0)
+        self.filter_controls = FilterControlPanel()
+        side_layout.addWidget(self.filter_controls)
+        main_layout.addWidget(side_panel)
+        self.filter_settings = self.filter_controls.get_settings()
+
+        self._on_source_type_changed(self.source_combo.currentText())
+        self.source_combo.currentTextChanged.connect(self._on_source_type_changed)
+        self.btn_choose.clicked.connect(self._choose_file)
+        self.btn_start.clicked.connect(self._on_start_clicked)
+        self.btn_stop.clicked.connect(self.stop)
+        self.btn_publish.clicked.connect(self._on_publish_clicked)
+        self.filter_controls.filter_changed.connect(self._on_filter_changed)
+
+    def _choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "CSV em Gravação", os.path.dirname(self.txt_path.text()),
+                                              "Arquivos CSV (*.csv)")
+        if path:
+            self.txt_path.setText(path)
+
+    def _on_source_type_changed(self, source_type: str):
+        settings_key, default, hint = self.SOURCE_FIELDS[source_type]
+        self.txt_path.setText(self.settings.value(settings_key, default))
+        self.txt_path.setPlaceholderText(hint)
+        self.btn_choose.setVisible(source_type == self.SOURCE_CSV)
+
+    def _on_start_clicked(self):
+        source_type = self.source_combo.currentText()
+        address = self.txt_path.text().strip()
+        if source_type == self.SOURCE_CSV and not os.path.isfile(address):
+            QMessageBox.warning(self, "Ao Vivo", "Escolha um arquivo CSV existente.")
+            return
+        try:
+            if source_type == self.SOURCE_CSV:
+                source, max_samples = CsvTailSource(address), None
+            else:
+                source = self._create_telemetry_source(source_type, address)
+                # Recepção contínua: só o histórico recente fica guardado (anel de tamanho fixo)
+                max_samples = int(TELEMETRY_HISTORY_S / (RAW_SAMPLE_PERIOD_S * RAW_SAMPLES_PER_GROUP))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Ao Vivo", f"Não foi possível abrir a origem.\nErro: {e}")
+            return
+        self.settings.setValue(self.SOURCE_FIELDS[source_type][0], address)
+        self.start(source, address if source_type == self.SOURCE_CSV else source.name, max_samples)
+
+    def _create_telemetry_source(self, source_type: str, address: str):
+        if source_type == self.SOURCE_UDP:
+            host, _, port = address.rpartition(':')
+            return telemetry_service.UdpTelemetrySource(int(port), host or TELEMETRY_UDP_HOST).start()
+        port, _, baudrate = address.partition('@')
+        if not port:
+            raise ValueError("Informe a porta serial.")
+        return telemetry_service.SerialTelemetrySource(port, int(baudrate or TELEMETRY_SERIAL_BAUDRATE)).start()
+
+    def start(self, source, file_path: str = None, max_samples: int = None):
+        """Começa a acompanhar `source` (as amostras anteriores da aba são descartadas)."""
+        self.stop()
+        self.source = source
+        self.live_run = LiveRun(source.name, self.filter_settings, file_path, max_samples)
+        self.btn_start.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.btn_publish.setEnabled(True)
+        self.lbl_status.setText(f"Aguardando amostras de {source.name}...")
+        self._poll()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        if self.source is not None and hasattr(self.source, 'close'):
+            self.source.close()
+        self.source = None
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        if self.live_run is not None:
+            self.lbl_status.setText(f"Parado. {self._summary()}")
+
+    def _summary(self) -> str:
+        return f"{self.live_run.name}: {self.live_run.size} amostras ({self.live_run.duration_s:.1f} s)"
+
+    def _poll(self):
+        if self.source is None:
+            return
+        started = time.perf_counter()
+        try:
+            f1, f2, restarted = self.source.read_new()
+        except Exception as e:
+            self.stop()
+            QMessageBox.warning(self, "Ao Vivo", f"Falha ao ler a origem.\nErro: {e}")
+            return
+        if restarted:
+            self.live_run.reset()
+        if not self.live_run.append_samples(f1, f2) and not restarted:
+            return
+        self._redraw()
+        status = f"{self._summary()} — atualização em {(time.perf_counter() - started) * 1000:.1f} ms"
+        if hasattr(self.source, 'status_text'):
+            status += f" — {self.source.status_text()}"
+        self.lbl_status.setText(status)
+
+    def _redraw(self):
+        window = self.live_run.window(LIVE_PLOT_WINDOW_S)
+        for field, curve in self.curves.items():
+            curve.setData(window['time_s'], window[field])
+
+    def _on_filter_changed(self, settings: dict):
+        self.filter_settings = settings
+        if self.live_run is not None:
+            self.live_run.set_filter_settings(settings)
+            self._redraw()
+
+    def _on_publish_clicked(self):
+        if self.live_run is None or self.live_run.size == 0:
+            QMessageBox.information(self, "Ao Vivo", "Nenhuma amostra recebida ainda.")
+            return
+        self.publish_requested.emit(self.live_run.to_run_data())
@@ -0,0 +1,149 @@
+# iLogger/ui/widgets/plot_data_provider.py
+
+import pyqtgraph as pg
+from PyQt6.QtCore import QObject, QTimer
+from config import LOD_POINTS_PER_PIXEL, LOD_UPDATE_DELAY_MS
+
+
+class PlotDataProvider(QObject):
+    """
+    Serve aos gráficos o nível da pirâmide LOD adequado ao intervalo visível.
+
+    Cada curva registrada guarda sua pirâmide e o deslocamento de alinhamento da run.
+    Ao mudar o intervalo do eixo X ou o tamanho do gráfico, as curvas recebem apenas os
+    pontos visíveis, no máximo LOD_POINTS_PER_PIXEL por pixel, em vez dos dados completos.
+    """
+    DEFAULT_WIDTH_PX = 1000
+
+    def __init__(self, plot_item, parent=None):
+        super().__init__(parent)
+        self.plot_item = plot_item
+        self.view_box = plot_item.getViewBox()
+        # curva -> [pirâmide, deslocamento_x]
+        self._curves = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(LOD_UPDATE_DELAY_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.view_box.sigXRangeChanged.connect(self._timer.start)
+        self.view_box.sigResized.connect(self._timer.start)
+
+    def clear(self):
+        """Esquece as curvas registradas (os itens em si são removidos pelo dono do gráfico)."""
+        self._curves = {}
+
+    def release(self):
+        """Desconecta o provedor do gráfico e o agenda para destruição (o gráfico vai ser descartado)."""
+        self._timer.stop()
+        self.view_box.sigXRangeChanged.disconnect(self._timer.start)
+        self.view_box.sigResized.disconnect(self._timer.start)
+        self.clear()
+        self.deleteLater()
+
+    def add_curve(self, pyramid, x_offset: float = 0.0, **plot_kwargs):
+        """Cria uma curva no gráfico alimentada pela pirâmide e a registra para atualizações."""
+        curve = self.plot_item.plot(**plot_kwargs)
+        self.register(curve, pyramid, x_offset)
+        return curve
+
+    def register(self, curve, pyramid, x_offset: float = 0.0):
+        """
+        Associa uma curva (nova ou já existente) a uma pirâmide e carrega o nível adequado.
+        A curva é atualizada no lugar com setData, sem recriar o item.
+        """
+        self._curves[curve] = [pyramid, x_offset]
+        self._serve(curve, pyramid, x_offset, *self._visible_request())
+
+    def unregister(self, curve):
+        self._curves.pop(curve, None)
+
+    def _visible_request(self):
+        width = self.view_box.width()
+        max_points = int((width if width > 1 else self.DEFAULT_WIDTH_PX) * LOD_POINTS_PER_PIXEL)
+        # Com auto-range ativo o intervalo visível depende dos próprios dados: serve tudo
+        if self.view_box.autoRangeEnabled()[0]:
+            return None, None, max_points
+        x_min, x_max = self.view_box.viewRange()[0]
+        return x_min, x_max, max_points
+
+    def _serve(self, curve, pyramid, x_offset, x_min, x_max, max_points):
+        if pyramid is None:
+            curve.setData([], [])
+            return
+        if x_min is not None:
+            x_min, x_max = x_min + x_offset, x_max + x_offset
+        x, y = pyramid.serve(x_min, x_max, max_points)
+        curve.setData(x - x_offset if x_offset else x, y, skipFiniteCheck=pyramid.is_finite)
+
+    def refresh(self):
+        request = self._visible_request()
+        for curve, (pyramid, x_offset) in self._curves.items():
+            self._serve(curve, pyramid, x_offset, *request)
+
+
+def _pen_changed(current, pen) -> bool:
+    """Compara as canetas pelos atributos (cor, largura, estilo...), não pela identidade do objeto."""
+    return current is not pen and pg.mkPen(current) != pg.mkPen(pen)
+
+
+class PersistentCurves:
+    """
+    Conjunto de curvas persistentes de um gráfico, uma por chave (ex: (run, canal)).
+
+    Curvas só são criadas ou removidas quando o conjunto de chaves muda; nas demais
+    atualizações os dados são trocados no lugar via setData. Também controla os itens
+    temporários (textos, envelopes) descartados a cada redesenho.
+    """
+    def __init__(self, plot_item, data_provider: PlotDataProvider):
+        self.plot_item = plot_item
+        self.data_provider = data_provider
+        self._curves = {}
+        self._transient_items = []
+
+    def __len__(self):
+        return len(self._curves)
+
+    def values(self):
+        return self._curves.values()
+
+    def sync(self, specs: list):
+        """
+        `specs` é uma lista de (chave, fonte, deslocamento_x, pen, nome), onde a fonte é uma
+        LODPyramid (servida pelo provedor conforme a visão) ou uma tupla (x, y) já pronta.
+        """
+        curves = {}
+        for key, source, x_offset, pen, name in specs:
+            curve = self._curves.pop(key, None)
+            if curve is None:
+                curve = self.plot_item.plot(pen=pen, name=name)
+            elif _pen_changed(curve.opts['pen'], pen):
+                curve.setPen(pen)
+            if isinstance(source, tuple):
+                self.data_provider.unregister(curve)
+                curve.setData(*source)
+            else:
+                self.data_provider.register(curve, source, x_offset)
+            curves[key] = curve
+
+        # Restam apenas as curvas cujas chaves saíram do conjunto
+        for curve in self._curves.values():
+            self.data_provider.unregister(curve)
+            self.plot_item.removeItem(curve)
+        self._curves = curves
+
+    def clear(self):
+        """Remove do gráfico todas as curvas e itens temporários."""
+        self.sync([])
+        self.clear_transient()
+
+    def add_transient(self, item):
+        """Adiciona um item que será descartado no próximo redesenho."""
+        if item.scene() is None:
+            self.plot_item.addItem(item)
+        self._transient_items.append(item)
+
+    def clear_transient(self):
+        for item in self._transient_items:
+            self.plot_item.removeItem(item)
+        self._transient_items = []
@@ -1,13 +1,21 @@
 # iLogger/ui/widgets/plot_widgets.py
 
+import numpy as np
 import pyqtgraph as pg
-from pyqtgraph import exporters
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QScrollArea
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QRectF
 from config import *
+from services import region_stats_service, resampling_service, density_service, cursor_service
 from .filter_control_panel import FilterControlPanel
+from .region_stats_panel import RegionStatsPanel
+from .envelope_view import EnvelopeControls, plot_envelope
+from .density_view import DensityControls
+from .crosshair import Crosshair, CursorReadoutPanel
+from .plot_data_provider import PlotDataProvider, PersistentCurves
 import math
 
+PLOT_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
 class BasePlotWidget(QWidget):
     """
     Classe base para widgets de plotagem. Gerencia seu próprio estado de filtro
@@ -18,37 +26,124 @@ class BasePlotWidget(QWidget):
         self.app_state = None
         self.plot_item = None
         self.filter_settings = {}
+        # Seleção de região (habilitada pelas subclasses com eixo de tempo)
+        self.region_panel = None
+        self.region_item = None
+        self.region_channels = {}
+        # Cursor sincronizado (habilitado pelas subclasses com eixo de tempo)
+        self.crosshair = None
+        self.cursor_panel = None
+        self.pens = [pg.mkPen(color=c, width=2) for c in PLOT_COLORS]
+        self.pens_raw = [pg.mkPen(color=c, style=Qt.PenStyle.DotLine) for c in PLOT_COLORS]
         
         layout = QHBoxLayout(self)
+        side_panel = QWidget()
+        side_panel.setFixedWidth(250)
+        self.side_layout = QVBoxLayout(side_panel)
+        self.side_layout.setContentsMargins(0, 0, 0, 0)
         self.filter_controls = FilterControlPanel()
-        self.filter_controls.setFixedWidth(250)
+        self.side_layout.addWidget(self.filter_controls)
         
         self.plot_widget = pg.PlotWidget()
+        # Serve os níveis da pirâmide LOD conforme o intervalo visível
+        self.data_provider = PlotDataProvider(self.plot_widget.getPlotItem(), self)
+        # Curvas persistentes por (run, canal) e itens temporários do último redesenho
+        self.curves = PersistentCurves(self.plot_widget.getPlotItem(), self.data_provider)
         
         layout.addWidget(self.plot_widget)
-        layout.addWidget(self.filter_controls)
+        layout.addWidget(side_panel)
         
         self.filter_controls.filter_changed.connect(self._on_filter_changed)
 
-    def link_state(self, app_state):
+    def link_state(self, app_state, update_scheduler=None):
         self.app_state = app_state
-        self.app_state.data_loaded.connect(self.update_plot)
+        # Com agendador, a aba só é redesenhada quando estiver visível
+        request_update = update_scheduler.slot_for(self, self.update_plot) if update_scheduler else self.update_plot
+        self.app_state.data_loaded.connect(request_update)
+        self.app_state.alignment_changed.connect(request_update)
+        if self.crosshair is not None:
+            self.app_state.cursor_time_changed.connect(self._on_cursor_time_changed)
         self.filter_settings = self.filter_controls.get_settings()
-        self.update_plot()
+        request_update()
 
     def _on_filter_changed(self, settings: dict):
         self.filter_settings = settings
         self.update_plot()
+        self._update_cursor_readout()
 
     def update_plot(self):
         # Este método DEVE ser implementado pelas subclasses
         raise NotImplementedError("Subclasses devem implementar 'update_plot'")
+
+    # --- Seleção de Região ---
+    def _enable_region_stats(self, channels: dict):
+        """Adiciona o painel de seleção de região para os canais informados (rótulo -> chave)."""
+        self.region_channels = channels
+        self.region_panel = RegionStatsPanel()
+        self.side_layout.addWidget(self.region_panel)
+        self.region_panel.enabled_changed.connect(self._on_region_toggled)
+
+    def _on_region_toggled(self, checked: bool):
+        if checked:
+            if self.region_item is None:
+                x_min, x_max = self.plot_item.viewRange()[0]
+                span = x_max - x_min
+                self.region_item = pg.LinearRegionItem(values=(x_min + span / 3, x_max - span / 3))
+                self.region_item.setZValue(10)
+                self.region_item.sigRegionChanged.connect(self._update_region_stats)
+            self._restore_region_item()
+        elif self.region_item is not None:
+            self.plot_item.removeItem(self.region_item)
+
+    def _restore_region_item(self):
+        """Recoloca a região no gráfico após um redesenho e atualiza as estatísticas."""
+        if self.region_item is None or not self.region_panel.is_enabled():
+            return
+        if self.region_item.scene() is None:
+            self.plot_item.addItem(self.region_item, ignoreBounds=True)
+        self._update_region_stats()
+
+    def _update_region_stats(self):
+        if not self.app_state or not self.app_state.raw_runs or self.region_item is None:
+            return
+        t_start, t_end = self.region_item.getRegion()
+        stats_df = region_stats_service.compute_region_stats(
+            self.app_state.raw_runs, self.region_channels, self.filter_settings, t_start, t_end
+        )
+        self.region_panel.set_stats(t_start, t_end, stats_df)
         
-    def get_figure_for_report(self):
-        if self.plot_item:
-            exporter = exporters.ImageExporter(self.plot_item.scene())
-            return exporter.export(toBytes=True)
-        return None
+    # --- Cursor Sincronizado ---
+    def _enable_crosshair(self):
+        """Adiciona o cursor vertical ligado aos demais gráficos de tempo e o painel de leitura."""
+        self.crosshair = Crosshair(self.plot_item, self.plot_widget.scene(), self)
+        self.cursor_panel = CursorReadoutPanel()
+        self.side_layout.addWidget(self.cursor_panel)
+        self.crosshair.moved.connect(self._on_crosshair_moved)
+        self.cursor_panel.enabled_changed.connect(self.crosshair.set_enabled)
+
+    def _on_crosshair_moved(self, time_s: float):
+        if self.app_state:
+            self.app_state.set_cursor_time(time_s)
+
+    def _on_cursor_time_changed(self, time_s: float):
+        self.crosshair.set_time(time_s)
+        # A leitura só é atualizada na aba visível; as demais atualizam ao serem exibidas
+        if self.isVisible():
+            self._update_cursor_readout()
+
+    def _update_cursor_readout(self):
+        if (self.cursor_panel is None or not self.cursor_panel.is_enabled() or not self.app_state
+                or not self.app_state.raw_runs or self.app_state.cursor_time is None):
+            return
+        t = self.app_state.cursor_time
+        values = cursor_service.values_at_time(self.app_state.raw_runs, t, self.filter_settings)
+        self.cursor_panel.set_values(
+            t, [run.file_name for run in self.app_state.raw_runs], list(cursor_service.CURSOR_CHANNELS), values
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_cursor_readout()
 
 
 class TimeSeriesPlotWidget(BasePlotWidget):
@@ -66,27 +161,58 @@ class TimeSeriesPlotWidget(BasePlotWidget):
         self.plot_item.setLabel('left', y_label)
         self.plot_item.showGrid(x=True, y=True, alpha=0.3)
         self.legend = self.plot_item.addLegend()
+        self._enable_region_stats({title: filt_key})
+        self._enable_crosshair()
+
+        self.envelope_controls = EnvelopeControls()
+        self.side_layout.addWidget(self.envelope_controls)
+        self.envelope_controls.changed.connect(self.update_plot)
 
     def update_plot(self):
-        self.plot_item.clear()
+        self.curves.clear_transient()
         if not self.app_state or not self.app_state.raw_runs:
-            self.plot_item.addItem(pg.TextItem("Sem dados para exibir", anchor=(0.5, 0.5)))
+            self.curves.sync([])
+            self.curves.add_transient(pg.TextItem("Sem dados para exibir", anchor=(0.5, 0.5)))
+            return
+
+        self.envelope_controls.set_runs([run.file_name for run in self.app_state.raw_runs])
+        if self.envelope_controls.is_enabled():
+            self.curves.sync([])
+            self._plot_envelope()
+            self._restore_region_item()
             return
-            
-        pens = [pg.mkPen(color=c, width=2) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
-        pens_raw = [pg.mkPen(color=c, style=Qt.PenStyle.DotLine) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
 
+        specs = []
         for i, run in enumerate(self.app_state.raw_runs):
-            run.apply_filters_and_recalculate(self.filter_settings)
+            if run.time_s.size > 0:
+                specs.append((
+                    (run.file_path, self.filt_key), run.get_lod_pyramid(self.filt_key, self.filter_settings),
+                    run.time_offset_s, self.pens[i % len(self.pens)], f"Filt - {run.file_name}"
+                ))
+                if self.raw_key != self.filt_key:
+                    specs.append((
+                        (run.file_path, self.raw_key), run.get_lod_pyramid(self.raw_key, self.filter_settings),
+                        run.time_offset_s, self.pens_raw[i % len(self.pens_raw)], f"Raw - {run.file_name}"
+                    ))
+        self.curves.sync(specs)
 
-            time_data = run.time_s
-            raw_data = run.get_data_for_custom_plot(self.raw_key)
-            filt_data = run.get_data_for_custom_plot(self.filt_key)
+        self._restore_region_item()
 
-            if time_data.size > 0:
-                self.plot_item.plot(time_data, filt_data, pen=pens[i % len(pens)], name=f"Filt - {run.file_name}")
-                if self.raw_key != self.filt_key:
-                    self.plot_item.plot(time_data, raw_data, pen=pens_raw[i % len(pens_raw)], name=f"Raw - {run.file_name}")
+    def _plot_envelope(self):
+        """Modo envelope: mediana e banda p10–p90 de todas as runs, com destaque opcional de uma run."""
+        runs = self.app_state.raw_runs
+        grid, bands = resampling_service.resample_envelope(runs, self.filt_key, self.filter_settings)
+        for item in plot_envelope(self.plot_item, grid, bands, name=f"Mediana ({len(runs)} runs)"):
+            self.curves.add_transient(item)
+
+        highlighted = self.envelope_controls.highlighted_index()
+        if 0 <= highlighted < len(runs):
+            run = runs[highlighted]
+            run.apply_filters_and_recalculate(self.filter_settings)
+            self.curves.add_transient(self.plot_item.plot(
+                run.aligned_time_s, run.get_data_for_custom_plot(self.filt_key),
+                pen=pg.mkPen(color='#d62728', width=2), name=run.file_name
+            ))
 
 
 class AccelerationPlotWidget(BasePlotWidget):
@@ -99,16 +225,18 @@ class AccelerationPlotWidget(BasePlotWidget):
         self.plot_item.setLabel('left', 'Aceleração (m/s²)')
         self.plot_item.showGrid(x=True, y=True, alpha=0.3)
         self.legend = self.plot_item.addLegend()
+        self._enable_region_stats({"Aceleração": KEY_ACEL_MS2_FILT})
+        self._enable_crosshair()
 
     def update_plot(self):
-        self.plot_item.clear()
-        if not self.app_state or not self.app_state.raw_runs: return
-        
-        pens = [pg.mkPen(color=c, width=2) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
-        for i, run in enumerate(self.app_state.raw_runs):
-            run.apply_filters_and_recalculate(self.filter_settings)
-            if run.time_s.size > 0 and run.acceleration_filtered_ms2.size > 0:
-                self.plot_item.plot(run.time_s, run.acceleration_filtered_ms2, pen=pens[i % len(pens)], name=run.file_name)
+        runs = self.app_state.raw_runs if self.app_state else []
+        self.curves.sync([
+            ((run.file_path, KEY_ACEL_MS2_FILT), run.get_lod_pyramid(KEY_ACEL_MS2_FILT, self.filter_settings),
+             run.time_offset_s, self.pens[i % len(self.pens)], run.file_name)
+            for i, run in enumerate(runs) if run.time_s.size > 0
+        ])
+
+        self._restore_region_item()
 
 
 class RelationPlotWidget(BasePlotWidget):
@@ -122,15 +250,55 @@ class RelationPlotWidget(BasePlotWidget):
         self.plot_item.showGrid(x=True, y=True, alpha=0.3)
         self.legend = self.plot_item.addLegend()
 
+        # Mapa de densidade persistente (oculto fora do modo densidade)
+        self.density_image = pg.ImageItem()
+        self.density_image.setColorMap(pg.colormap.get('inferno'))
+        self.density_image.setZValue(-10)
+        self.density_image.hide()
+        self.plot_item.addItem(self.density_image)
+
+        self.density_controls = DensityControls()
+        self.side_layout.addWidget(self.density_controls)
+        self.density_controls.changed.connect(self.update_plot)
+
     def update_plot(self):
-        self.plot_item.clear()
-        if not self.app_state or not self.app_state.raw_runs: return
+        runs = self.app_state.raw_runs if self.app_state else []
+        if self.density_controls.is_enabled():
+            self._plot_density(runs)
+            return
 
-        pens = [pg.mkPen(color=c, width=2) for c in ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']]
-        for i, run in enumerate(self.app_state.raw_runs):
-            run.apply_filters_and_recalculate(self.filter_settings)
-            if run.velocity_filtered_kmh.size > 0 and run.rpm_filtered.size > 0:
-                self.plot_item.plot(run.velocity_filtered_kmh, run.rpm_filtered, pen=pens[i % len(pens)], name=run.file_name)
+        self.density_image.hide()
+        self.curves.sync([
+            ((run.file_path, 'relacao'), run.get_lod_pyramid(KEY_RPM_FILT, self.filter_settings, x_key=KEY_VEL_KMH_FILT),
+             0.0, self.pens[i % len(self.pens)], run.file_name)
+            for i, run in enumerate(runs) if run.time_s.size > 0
+        ])
+
+    def _plot_density(self, runs: list):
+        """Modo densidade: contagem de amostras de todas as runs numa grade 2D e curvas medianas opcionais."""
+        density = density_service.compute_density(runs, KEY_VEL_KMH_FILT, KEY_RPM_FILT, self.filter_settings)
+        if density is None:
+            self.density_image.hide()
+            self.curves.sync([])
+            return
+
+        # Escala logarítmica para que regiões pouco visitadas continuem visíveis
+        self.density_image.setImage(np.log1p(density['counts']), autoLevels=True)
+        x_edges, y_edges = density['x_edges'], density['y_edges']
+        self.density_image.setRect(QRectF(
+            x_edges[0], y_edges[0], x_edges[-1] - x_edges[0], y_edges[-1] - y_edges[0]
+        ))
+        self.density_image.show()
+
+        specs = []
+        if self.density_controls.show_median_curves():
+            for i, run in enumerate(runs):
+                centers, medians = density_service.median_curve(
+                    run, KEY_VEL_KMH_FILT, KEY_RPM_FILT, self.filter_settings, x_edges
+                )
+                specs.append(((run.file_path, 'mediana'), (centers, medians), 0.0,
+                              self.pens[i % len(self.pens)], f"Mediana - {run.file_name}"))
+        self.curves.sync(specs)
 
 
 class ComparisonPlotWidget(QWidget):
@@ -207,9 +375,3 @@ class ComparisonPlotWidget(QWidget):
             if current_col >= num_cols:
                 current_col = 0
                 current_row += 1
-
-    def get_figure_for_report(self):
-        if self.metrics_df is not None and not self.metrics_df.empty:
-            exporter = exporters.ImageExporter(self.graphics_layout.scene())
-            return exporter.export(toBytes=True)
-        return None
\ No newline at end of file
@@ -0,0 +1,63 @@
+# iLogger/ui/widgets/region_stats_panel.py
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtWidgets import (
+    QGroupBox, QVBoxLayout, QCheckBox, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import pyqtSignal
+
+
+class RegionStatsPanel(QGroupBox):
+    """
+    Painel que exibe as estatísticas da região de tempo selecionada no gráfico.
+    Apenas apresenta os valores; o cálculo fica a cargo do region_stats_service.
+    """
+    enabled_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__("Seleção de Região", parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.chk_enabled = QCheckBox("Ativar seleção de região")
+        self.lbl_range = QLabel("Região: -")
+        self.table = QTableWidget()
+        self.table.setMinimumHeight(160)
+
+        layout.addWidget(self.chk_enabled)
+        layout.addWidget(self.lbl_range)
+        layout.addWidget(self.table)
+
+        self.chk_enabled.toggled.connect(self._on_toggled)
+        self.table.setVisible(False)
+
+    def is_enabled(self) -> bool:
+        return self.chk_enabled.isChecked()
+
+    def _on_toggled(self, checked: bool):
+        self.table.setVisible(checked)
+        if not checked:
+            self.lbl_range.setText("Região: -")
+        self.enabled_changed.emit(checked)
+
+    def set_stats(self, t_start: float, t_end: float, stats_df: pd.DataFrame):
+        """Atualiza o intervalo exibido e a tabela de estatísticas."""
+        self.lbl_range.setText(f"Região: {min(t_start, t_end):.2f} s – {max(t_start, t_end):.2f} s")
+
+        if self.table.rowCount() != stats_df.shape[0] or self.table.columnCount() != stats_df.shape[1]:
+            self.table.setRowCount(stats_df.shape[0])
+            self.table.setColumnCount(stats_df.shape[1])
+            self.table.setHorizontalHeaderLabels(stats_df.columns)
+            self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setVerticalHeaderLabels(stats_df.index.astype(str))
+
+        for row in range(stats_df.shape[0]):
+            for col in range(stats_df.shape[1]):
+                value = stats_df.iat[row, col]
+                text = "-" if np.isnan(value) else f"{value:.2f}"
+                item = self.table.item(row, col)
+                if item is None:
+                    self.table.setItem(row, col, QTableWidgetItem(text))
+                else:
+                    item.setText(text)
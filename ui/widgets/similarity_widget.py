@@ -0,0 +1,143 @@
+# iLogger/ui/widgets/similarity_widget.py
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton, QGridLayout
+
+from config import *
+from services import similarity_service
+from .filter_control_panel import FilterControlPanel
+
+
+class SimilarityWidget(QWidget):
+    """
+    Aba de similaridade entre runs: heatmap agrupado da matriz N×N (diferença RMS ou
+    correlação) de um canal. Clicar numa célula sobrepõe o par de runs correspondente.
+    """
+    CHANNEL_OPTIONS = {
+        "Velocidade": KEY_VEL_KMH_FILT,
+        "RPM": KEY_RPM_FILT,
+        "Aceleração": KEY_ACEL_MS2_FILT,
+    }
+    MAX_TICK_LABELS = 40
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app_state = None
+        self.filter_settings = {}
+        self.result = None
+
+        main_layout = QHBoxLayout(self)
+        content_layout = QVBoxLayout()
+
+        # --- Controles ---
+        controls_layout = QGridLayout()
+        self.combo_channel = QComboBox()
+        self.combo_channel.addItems(self.CHANNEL_OPTIONS.keys())
+        self.combo_metric = QComboBox()
+        for metric, label in similarity_service.SIMILARITY_METRICS.items():
+            self.combo_metric.addItem(label, metric)
+        self.btn_update = QPushButton("Calcular Similaridade")
+        self.lbl_pair = QLabel("Clique numa célula do mapa para comparar o par de RUNs.")
+        controls_layout.addWidget(QLabel("Canal:"), 0, 0)
+        controls_layout.addWidget(self.combo_channel, 0, 1)
+        controls_layout.addWidget(QLabel("Métrica:"), 0, 2)
+        controls_layout.addWidget(self.combo_metric, 0, 3)
+        controls_layout.addWidget(self.btn_update, 0, 4)
+        content_layout.addLayout(controls_layout)
+        content_layout.addWidget(self.lbl_pair)
+
+        # --- Heatmap e gráfico do par selecionado ---
+        self.graphics_layout = pg.GraphicsLayoutWidget()
+        self.heatmap_plot = self.graphics_layout.addPlot(row=0, col=0, title="Matriz de Similaridade")
+        self.heatmap_plot.setAspectLocked(True)
+        self.heatmap_plot.invertY(True)
+        self.image_item = pg.ImageItem()
+        self.image_item.setColorMap(pg.colormap.get('viridis'))
+        self.heatmap_plot.addItem(self.image_item)
+        self.color_bar = pg.ColorBarItem(colorMap=pg.colormap.get('viridis'), interactive=False)
+        self.color_bar.setImageItem(self.image_item, insert_in=self.heatmap_plot)
+
+        self.pair_plot = self.graphics_layout.addPlot(row=1, col=0, title="Par Selecionado")
+        self.pair_plot.setLabel('bottom', 'Tempo (s)')
+        self.pair_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.pair_plot.addLegend()
+        content_layout.addWidget(self.graphics_layout)
+
+        # --- Painel de Filtro ---
+        self.filter_controls = FilterControlPanel()
+        self.filter_controls.setFixedWidth(250)
+
+        main_layout.addLayout(content_layout)
+        main_layout.addWidget(self.filter_controls)
+
+        # --- Conexões ---
+        self.btn_update.clicked.connect(self.update_plot)
+        self.combo_channel.currentIndexChanged.connect(self.update_plot)
+        self.combo_metric.currentIndexChanged.connect(self.update_plot)
+        self.filter_controls.filter_changed.connect(self._on_filter_changed)
+        self.image_item.mouseClickEvent = self._on_heatmap_clicked
+
+    def link_state(self, app_state, update_scheduler=None):
+        self.app_state = app_state
+        # Com agendador, a aba só é redesenhada quando estiver visível
+        request_update = update_scheduler.slot_for(self, self.update_plot) if update_scheduler else self.update_plot
+        self.app_state.data_loaded.connect(request_update)
+        self.app_state.alignment_changed.connect(request_update)
+        self.filter_settings = self.filter_controls.get_settings()
+        request_update()
+
+    def _on_filter_changed(self, settings: dict):
+        self.filter_settings = settings
+        self.update_plot()
+
+    def _channel_key(self) -> str:
+        return self.CHANNEL_OPTIONS[self.combo_channel.currentText()]
+
+    def update_plot(self):
+        """Recalcula a matriz e redesenha o heatmap na ordem do agrupamento."""
+        self.pair_plot.clear()
+        if not self.app_state or len(self.app_state.raw_runs) < 2:
+            self.result = None
+            self.image_item.clear()
+            return
+
+        self.result = similarity_service.compute_similarity(
+            self.app_state.raw_runs, self._channel_key(), self.filter_settings, self.combo_metric.currentData()
+        )
+        order = self.result['order']
+        ordered = self.result['matrix'][np.ix_(order, order)]
+        self.image_item.setImage(ordered, autoLevels=False)
+        self.color_bar.setLevels((float(ordered.min()), float(ordered.max())))
+
+        names = self.result['names']
+        ticks = [(i + 0.5, names[idx]) for i, idx in enumerate(order)] if len(order) <= self.MAX_TICK_LABELS else []
+        for axis_name in ('bottom', 'left'):
+            self.heatmap_plot.getAxis(axis_name).setTicks([ticks])
+        self.heatmap_plot.autoRange()
+
+    def _on_heatmap_clicked(self, event):
+        if self.result is None:
+            return
+        pos = event.pos()
+        order = self.result['order']
+        i, j = int(pos.x()), int(pos.y())
+        if not (0 <= i < len(order) and 0 <= j < len(order)):
+            return
+        event.accept()
+        self._plot_pair(order[i], order[j])
+
+    def _plot_pair(self, idx_a: int, idx_b: int):
+        """Sobrepõe o canal selecionado das duas runs da célula clicada."""
+        self.pair_plot.clear()
+        runs = self.app_state.raw_runs
+        data_key = self._channel_key()
+        for idx, color in ((idx_a, '#1f77b4'), (idx_b, '#ff7f0e')):
+            run = runs[idx]
+            run.apply_filters_and_recalculate(self.filter_settings)
+            self.pair_plot.plot(run.aligned_time_s, run.get_data_for_custom_plot(data_key),
+                                pen=pg.mkPen(color=color, width=2), name=run.file_name)
+        self.pair_plot.setLabel('left', self.combo_channel.currentText())
+        value = self.result['matrix'][idx_a, idx_b]
+        metric_label = self.combo_metric.currentText()
+        self.lbl_pair.setText(f"{runs[idx_a].file_name} × {runs[idx_b].file_name} — {metric_label}: {value:.3f}")
@@ -0,0 +1,70 @@
+# iLogger/ui/widgets/update_scheduler.py
+
+from functools import partial
+from PyQt6.QtCore import QObject, QTimer
+from config import VIEW_PREWARM_ENABLED, VIEW_PREWARM_DELAY_MS
+
+
+class UpdateScheduler(QObject):
+    """
+    Agenda as atualizações das abas conforme a visibilidade.
+
+    Uma atualização pedida para um widget visível é executada na hora; para um widget
+    oculto, apenas o marca como pendente (pedidos repetidos são agrupados). As pendências
+    de uma aba são executadas quando ela passa a ser exibida no QStackedWidget e,
+    opcionalmente, pré-renderizadas uma a uma quando a interface fica ociosa.
+    """
+    def __init__(self, view_stack, prewarm: bool = VIEW_PREWARM_ENABLED, parent=None):
+        super().__init__(parent)
+        self.view_stack = view_stack
+        # widget -> callbacks pendentes (em ordem, sem repetição)
+        self._pending = {}
+
+        self._prewarm_timer = QTimer(self)
+        self._prewarm_timer.setSingleShot(True)
+        self._prewarm_timer.setInterval(VIEW_PREWARM_DELAY_MS)
+        self._prewarm_timer.timeout.connect(self._prewarm_next)
+        self.prewarm = prewarm
+
+        self.view_stack.currentChanged.connect(self._on_view_changed)
+
+    def slot_for(self, widget, callback):
+        """Retorna um slot que pede, via agendador, a execução de `callback` para `widget`."""
+        return partial(self.request, widget, callback)
+
+    def request(self, widget, callback, *args):
+        """
+        Executa `callback` agora se `widget` estiver visível; caso contrário, adia.
+        Argumentos extras (vindos do sinal conectado) são ignorados.
+        """
+        if widget.isVisible():
+            callback()
+            return
+        callbacks = self._pending.setdefault(widget, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+        if self.prewarm:
+            self._prewarm_timer.start()
+
+    def flush(self, page):
+        """Executa as pendências da aba `page` e dos widgets contidos nela."""
+        for widget in [w for w in self._pending if w is page or page.isAncestorOf(w)]:
+            for callback in self._pending.pop(widget, []):
+                callback()
+
+    def _on_view_changed(self, index: int):
+        page = self.view_stack.widget(index)
+        if page is not None:
+            self.flush(page)
+        if self.prewarm and self._pending:
+            self._prewarm_timer.start()
+
+    def _prewarm_next(self):
+        """Pré-renderiza uma aba pendente por vez, na ordem de navegação, para não travar a interface."""
+        for index in range(self.view_stack.count()):
+            page = self.view_stack.widget(index)
+            if any(w is page or page.isAncestorOf(w) for w in self._pending):
+                self.flush(page)
+                break
+        if self._pending:
+            self._prewarm_timer.start()